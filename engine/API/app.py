@@ -3,6 +3,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from .routes import listing_routes
 from .routes import health_routes
 from .routes import deeplink_routes
+from .routes import saved_search_routes
 from .routes import health_routes
 import os
 
@@ -26,6 +27,7 @@ app.add_middleware(
 app.include_router(listing_routes.router)
 app.include_router(health_routes.router)
 app.include_router(deeplink_routes.router)
+app.include_router(saved_search_routes.router)
 
 @app.get("/")
 def read_root():
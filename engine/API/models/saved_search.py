@@ -0,0 +1,17 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+
+
+class SavedSearchIn(BaseModel):
+    name: Optional[str] = None
+    make: Optional[str] = None
+    model: Optional[str] = None
+    state: Optional[str] = None
+    price_min: Optional[int] = Field(None, ge=0)
+    price_max: Optional[int] = Field(None, ge=0)
+    year_min: Optional[int] = Field(None, ge=1900)
+    year_max: Optional[int] = Field(None, ge=1900)
+
+    # Delivery: Discord webhook if set, otherwise email (stubbed)
+    webhook_url: Optional[str] = None
+    email: Optional[str] = None
@@ -0,0 +1,36 @@
+"""
+JSON response for row-heavy endpoints.
+
+Endpoints return ``FastJSONResponse(rows)`` directly, which skips FastAPI's
+``jsonable_encoder`` pass over every row. Rows are serialized with orjson when
+it is installed (UUID and datetime natively, Decimal via ``_default``);
+otherwise the stdlib encoder is used.
+"""
+
+from __future__ import annotations
+
+import json
+from decimal import Decimal
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:  # optional: much faster serialization for large row lists
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if hasattr(obj, "isoformat"):
+        return obj.isoformat()
+    return str(obj)
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+        return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
@@ -1,89 +1,320 @@
-from fastapi import APIRouter, Query, HTTPException
-from typing import Optional
+from fastapi import APIRouter, Depends, Query, HTTPException
+from typing import Any, Dict, List, Optional, Tuple
 from uuid import UUID
 import os
 
+from engine.API.responses import FastJSONResponse
+
 DB_BACKEND = os.getenv("DB_BACKEND", "postgres").lower()
+# Read deal_score from the listing_deals view (needs listing_price_stats; see RUNBOOK)
+DEAL_SCORE = os.getenv("LISTINGS_ENABLE_DEAL_SCORE", "").lower() in ("1", "true", "yes")
+# Raw payloads live in listing_raw, keyed by listings.raw_hash (see RUNBOOK)
+RAW_TABLE = os.getenv("LISTINGS_ENABLE_RAW_TABLE", "").lower() in ("1", "true", "yes")
 
-router = APIRouter(prefix="/listings", tags=["Listings"])
+_FULL_FIELDS = (
+    "id", "source", "source_id", "source_url", "fingerprint", "make", "model", "variant", "year", "price", "odometer",
+    "body", "trans", "fuel", "engine", "drive", "state", "postcode", "suburb", "lat", "lng", "media", "seller",
+    "status", "last_seen",
+)
+# Default projection for list views: no JSON columns, first photo only
+_SLIM_FIELDS = (
+    "id", "source", "source_url", "make", "model", "variant", "year", "price", "odometer",
+    "state", "suburb", "thumbnail", "last_seen",
+)
+_DEAL_FIELDS = ("deal_score", "market_median")
+# field -> (Postgres select expression, PostgREST select item)
+_FIELD_SQL: Dict[str, Tuple[str, str]] = {f: (f, f) for f in _FULL_FIELDS + _DEAL_FIELDS + ("raw",)}
+_FIELD_SQL["thumbnail"] = ("media->>0 as thumbnail", "thumbnail:media->>0")
+# /listings/search reads listings directly (its search columns are not in the view); same expressions as listing_deals
+_SEARCH_DEAL_SQL = {
+    "deal_score": (
+        "(select case when s.n >= 5 and listings.price > 0 then round(((s.median - listings.price) / s.median)::numeric, 3) end"
+        " from listing_price_stats s where s.market_key = listings.market_key) as deal_score"
+    ),
+    "market_median": "(select s.median from listing_price_stats s where s.market_key = listings.market_key) as market_median",
+}
+if RAW_TABLE:
+    # Only the detail route offers raw, so the blob is read for one row at a time; legacy rows keep listings.raw
+    _FIELD_SQL["raw"] = (
+        "coalesce(raw, (select r.raw from listing_raw r where r.hash = listings.raw_hash)) as raw",
+        "raw, raw_hash",
+    )
 
-@router.get("")
-@router.get("/")
-async def get_listings(
+router = APIRouter(prefix="/listings", tags=["Listings"], default_response_class=FastJSONResponse)
+
+
+def _projection(fields: Optional[str], default: Tuple[str, ...], detail: bool = False) -> List[str]:
+    """Validated field list for ``fields=`` (comma-separated, or "all")."""
+    full = _FULL_FIELDS + (("raw",) if detail else ())
+    extra = _DEAL_FIELDS if DEAL_SCORE and not detail else ()
+    if not fields:
+        return list(default + extra)
+    if fields.strip() == "all":
+        return list(full + extra)
+    allowed = set(full + extra) | {"thumbnail"}
+    names = list(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip()))
+    unknown = [f for f in names if f not in allowed]
+    if unknown or not names:
+        raise HTTPException(
+            status_code=400,
+            detail=f"unknown fields: {', '.join(unknown) or '(none)'}; allowed: {', '.join(sorted(allowed))}",
+        )
+    return names
+
+
+def _pg_cols(names: List[str]) -> str:
+    return ", ".join(_FIELD_SQL[n][0] for n in names)
+
+
+def _rest_cols(names: List[str]) -> str:
+    return ", ".join(_FIELD_SQL[n][1] for n in names)
+
+
+def _with_coords(names: List[str], f: Dict[str, Any]) -> List[str]:
+    # The REST radius trim needs coordinates even when they were not requested
+    if f["near"] and DB_BACKEND == "supabase_api":
+        return names + [c for c in ("lat", "lng") if c not in names]
+    return names
+
+
+def listing_filters(
     make: Optional[str] = Query(None),
     model: Optional[str] = Query(None),
     state: Optional[str] = Query(None),
     price_min: Optional[int] = Query(None, ge=0),
     price_max: Optional[int] = Query(None, ge=0),
+    near: Optional[str] = Query(None, description="lat,lng"),
+    km: float = Query(50, gt=0, le=2000),
+    bbox: Optional[str] = Query(None, description="min_lat,min_lng,max_lat,max_lng"),
+) -> Dict[str, Any]:
+    """Filter params shared by the listing endpoints."""
+    return {
+        "make": make,
+        "model": model,
+        "state": state,
+        "price_min": price_min,
+        "price_max": price_max,
+        "near": _parse_coords("near", near, 2) if near else None,
+        "km": km,
+        "bbox": _parse_coords("bbox", bbox, 4) if bbox else None,
+    }
+
+
+def _parse_coords(name: str, text: str, n: int) -> Tuple[float, ...]:
+    try:
+        vals = tuple(float(p) for p in text.split(","))
+    except ValueError:
+        vals = ()
+    if len(vals) != n or any(abs(v) > 90 for v in vals[0::2]) or any(abs(v) > 180 for v in vals[1::2]):
+        raise HTTPException(status_code=400, detail=f"{name} must be {n} comma-separated lat/lng values")
+    return vals
+
+
+def _rest_filter(q: Any, f: Dict[str, Any]) -> Any:
+    if f["make"]:
+        q = q.eq("make", f["make"])
+    if f["model"]:
+        q = q.eq("model", f["model"])
+    if f["state"]:
+        q = q.eq("state", f["state"])
+    if f["price_min"] is not None:
+        q = q.gte("price", f["price_min"])
+    if f["price_max"] is not None:
+        q = q.lte("price", f["price_max"])
+    # No earthdistance over REST: filter on the enclosing box, _rest_geo trims to the radius
+    from engine.scraper.geo import bounding_box
+
+    box = bounding_box(f["near"], f["km"]) if f["near"] else f["bbox"]
+    if box:
+        q = q.gte("lat", box[0]).gte("lng", box[1]).lte("lat", box[2]).lte("lng", box[3])
+    return q
+
+
+def _rest_geo(rows: List[Dict[str, Any]], f: Dict[str, Any], by_distance: bool) -> List[Dict[str, Any]]:
+    if not f["near"]:
+        return rows
+    from engine.scraper.geo import haversine_km
+
+    out = []
+    for r in rows:
+        d = haversine_km(f["near"], (r["lat"], r["lng"]))
+        if d <= f["km"]:
+            out.append({**r, "distance_km": round(d, 1)})
+    if by_distance:
+        out.sort(key=lambda r: r["distance_km"])
+    return out
+
+
+def _pg_where(f: Dict[str, Any]) -> Tuple[List[str], List[Any]]:
+    where: List[str] = []
+    params: List[Any] = []
+    if f["make"]:
+        where.append("lower(make) = lower(%s)")
+        params.append(f["make"])
+    if f["model"]:
+        where.append("lower(model) = lower(%s)")
+        params.append(f["model"])
+    if f["state"]:
+        where.append("upper(state) = upper(%s)")
+        params.append(f["state"])
+    if f["price_min"] is not None:
+        where.append("price >= %s")
+        params.append(f["price_min"])
+    if f["price_max"] is not None:
+        where.append("price <= %s")
+        params.append(f["price_max"])
+    if f["near"]:
+        # earth_box is the GiST-indexable prefilter; earth_distance trims the box corners
+        lat, lng = f["near"]
+        meters = f["km"] * 1000
+        where.append(
+            "earth_box(ll_to_earth(%s, %s), %s) @> ll_to_earth(lat, lng)"
+            " and earth_distance(ll_to_earth(%s, %s), ll_to_earth(lat, lng)) <= %s"
+        )
+        params.extend([lat, lng, meters, lat, lng, meters])
+    if f["bbox"]:
+        where.append("lat between %s and %s and lng between %s and %s")
+        params.extend([f["bbox"][0], f["bbox"][2], f["bbox"][1], f["bbox"][3]])
+    return where, params
+
+
+def _pg_distance(f: Dict[str, Any]) -> Tuple[str, List[Any]]:
+    if not f["near"]:
+        return "", []
+    return (
+        ", round((earth_distance(ll_to_earth(%s, %s), ll_to_earth(lat, lng)) / 1000)::numeric, 1) as distance_km",
+        list(f["near"]),
+    )
+
+
+def _like_escape(s: str) -> str:
+    return s.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+@router.get("")
+@router.get("/")
+async def get_listings(
+    filters: Dict[str, Any] = Depends(listing_filters),
     limit: int = Query(20, ge=1, le=200),
+    sort: str = Query("last_seen", pattern="^(last_seen|price|deal_score|distance)$"),
+    fields: Optional[str] = Query(None, description="Comma-separated columns, or 'all' (default: slim list view)"),
 ):
+    if sort == "deal_score" and not DEAL_SCORE:
+        raise HTTPException(status_code=400, detail="deal_score is not enabled")
+    if sort == "distance" and not filters["near"]:
+        raise HTTPException(status_code=400, detail="sort=distance needs near=lat,lng")
+    table = "listing_deals" if DEAL_SCORE else "listings"
+    names = _projection(fields, _SLIM_FIELDS)
+
     if DB_BACKEND == "supabase_api":
         # Supabase REST path
         from engine.db import supabase_api as sb
-        q = sb._sb.table("listings").select(
-            "id, source, source_id, source_url, fingerprint, make, model, variant, year, price, odometer, body, trans, fuel, engine, drive, state, postcode, suburb, lat, lng, media, seller, status, last_seen"
-        )
-        if make:
-            q = q.eq("make", make)
-        if model:
-            q = q.eq("model", model)
-        if state:
-            q = q.eq("state", state)
-        if price_min is not None:
-            q = q.gte("price", price_min)
-        if price_max is not None:
-            q = q.lte("price", price_max)
-        q = q.order("last_seen", desc=True).limit(limit)
+        q = _rest_filter(sb._sb.table(table).select(_rest_cols(_with_coords(names, filters))), filters)
+        if sort == "deal_score":
+            # Best deals first; unscored listings are left out
+            q = q.not_.is_("deal_score", "null").order("deal_score", desc=True)
+        elif sort == "price":
+            q = q.order("price")
+        else:
+            q = q.order("last_seen", desc=True)
+        q = q.limit(limit)
         res = q.execute()
-        return res.data or []
+        return FastJSONResponse(_rest_geo(res.data or [], filters, by_distance=sort == "distance"))
 
     # Default Postgres path via psycopg
     import psycopg
     from engine.db.supabase_client import get_conn
-    where = []
-    params = []
-    if make:
-        where.append("lower(make) = lower(%s)")
-        params.append(make)
-    if model:
-        where.append("lower(model) = lower(%s)")
-        params.append(model)
-    if state:
-        where.append("upper(state) = upper(%s)")
-        params.append(state)
-    if price_min is not None:
-        where.append("price >= %s")
-        params.append(price_min)
-    if price_max is not None:
-        where.append("price <= %s")
-        params.append(price_max)
+    where, params = _pg_where(filters)
+    dist_sql, dist_params = _pg_distance(filters)
+    if sort == "deal_score":
+        where.append("deal_score is not null")
+    order_sql = {
+        "deal_score": "deal_score desc",
+        "price": "price asc nulls last",
+        "last_seen": "last_seen desc",
+        "distance": "distance_km asc",
+    }[sort]
 
     where_sql = " where " + " and ".join(where) if where else ""
     sql = f"""
-      select id, source, source_id, source_url, fingerprint,
-             make, model, variant, year, price, odometer,
-             body, trans, fuel, engine, drive,
-             state, postcode, suburb, lat, lng,
-             media, seller, status, last_seen
-      from listings
+      select {_pg_cols(names)}{dist_sql}
+      from {table}
       {where_sql}
-      order by last_seen desc
+      order by {order_sql}
       limit %s
     """
     with get_conn() as conn, conn.cursor(row_factory=psycopg.rows.dict_row) as cur:
-        cur.execute(sql, (*params, limit))
+        cur.execute(sql, (*dist_params, *params, limit))
         rows = cur.fetchall()
-        return rows
+        return FastJSONResponse(rows)
+
+@router.get("/search")
+async def search_listings(
+    q: str = Query(..., min_length=2, max_length=200),
+    filters: Dict[str, Any] = Depends(listing_filters),
+    limit: int = Query(20, ge=1, le=200),
+    fields: Optional[str] = Query(None, description="Comma-separated columns, or 'all' (default: slim list view)"),
+):
+    """Free-text search over title, make, model and variant (search_tsv / search_text indexes; see RUNBOOK)."""
+    q = q.strip()
+    names = _projection(fields, _SLIM_FIELDS)
+
+    if DB_BACKEND == "supabase_api":
+        # The REST path can only query the listings table, which has no deal columns
+        requested = [n for n in names if n in _DEAL_FIELDS]
+        if fields and requested:
+            raise HTTPException(
+                status_code=422,
+                detail=f"fields not available on /listings/search with DB_BACKEND=supabase_api: {', '.join(requested)}",
+            )
+        names = [n for n in names if n not in _DEAL_FIELDS]
+        # PostgREST full-text filter; results are newest first (no rank over REST)
+        from engine.db import supabase_api as sb
+        rq = sb._sb.table("listings").select(_rest_cols(_with_coords(names, filters)))
+        rq = rq.text_search("search_tsv", q, options={"type": "websearch", "config": "simple"})
+        res = _rest_filter(rq, filters).order("last_seen", desc=True).limit(limit).execute()
+        return FastJSONResponse(_rest_geo(res.data or [], filters, by_distance=False))
+
+    import psycopg
+    from engine.db.supabase_client import get_conn
+    where, params = _pg_where(filters)
+    # Whole words via the tsvector, partial words ("hilu") via the trigram index
+    where.insert(0, "(search_tsv @@ websearch_to_tsquery('simple', %s) or search_text ilike %s)")
+    params[:0] = [q, f"%{_like_escape(q)}%"]
+    dist_sql, dist_params = _pg_distance(filters)
+    sql = f"""
+      select {", ".join(_SEARCH_DEAL_SQL.get(n) or _FIELD_SQL[n][0] for n in names)}{dist_sql},
+             ts_rank_cd(search_tsv, websearch_to_tsquery('simple', %s)) + similarity(search_text, %s) as rank
+      from listings
+      where {" and ".join(where)}
+      order by rank desc, last_seen desc
+      limit %s
+    """
+    with get_conn() as conn, conn.cursor(row_factory=psycopg.rows.dict_row) as cur:
+        cur.execute(sql, (*dist_params, q, q, *params, limit))
+        return FastJSONResponse(cur.fetchall())
+
+@router.get("/facets")
+async def get_listing_facets(filters: Dict[str, Any] = Depends(listing_filters)):
+    """Counts by make, state, body and price bucket for the current filters (cached; see RUNBOOK)."""
+    if DB_BACKEND == "supabase_api":
+        raise HTTPException(status_code=501, detail="facets need DB_BACKEND=postgres")
+    from engine.db.facets import facet_counts
+
+    where, params = _pg_where(filters)
+    return facet_counts(where, params, filters)
 
 @router.get("/{listing_id}")
-async def get_listing_by_id(listing_id: UUID):
+async def get_listing_by_id(
+    listing_id: UUID,
+    fields: Optional[str] = Query(None, description="Comma-separated columns, or 'all' (default: every column incl. raw)"),
+):
+    names = _projection(fields, _FULL_FIELDS + ("raw",), detail=True)
     if DB_BACKEND == "supabase_api":
         from engine.db import supabase_api as sb
         res = (
             sb._sb.table("listings")
-            .select(
-                "id, source, source_id, source_url, fingerprint, make, model, variant, year, price, odometer, body, trans, fuel, engine, drive, state, postcode, suburb, lat, lng, media, seller, raw, status, last_seen"
-            )
+            .select(_rest_cols(names))
             .eq("id", str(listing_id))
             .limit(1)
             .execute()
@@ -91,16 +322,18 @@ async def get_listing_by_id(listing_id: UUID):
         data = res.data or []
         if not data:
             raise HTTPException(status_code=404, detail="Listing not found")
-        return data[0]
+        row = data[0]
+        if RAW_TABLE and "raw" in names:
+            raw_hash = row.pop("raw_hash", None)
+            if row.get("raw") is None and raw_hash:
+                blob = sb._sb.table("listing_raw").select("raw").eq("hash", raw_hash).limit(1).execute()
+                row["raw"] = (blob.data or [{}])[0].get("raw")
+        return FastJSONResponse(row)
 
     import psycopg
     from engine.db.supabase_client import get_conn
-    sql = """
-      select id, source, source_id, source_url, fingerprint,
-             make, model, variant, year, price, odometer,
-             body, trans, fuel, engine, drive,
-             state, postcode, suburb, lat, lng,
-             media, seller, raw, status, last_seen
+    sql = f"""
+      select {_pg_cols(names)}
       from listings
       where id = %s
     """
@@ -109,4 +342,22 @@ async def get_listing_by_id(listing_id: UUID):
         row = cur.fetchone()
         if not row:
             raise HTTPException(status_code=404, detail="Listing not found")
-        return row
+        return FastJSONResponse(row)
+
+@router.get("/{listing_id}/history")
+async def get_listing_history(listing_id: UUID, limit: int = Query(200, ge=1, le=1000)):
+    """Price/status change events for a listing, oldest first."""
+    if DB_BACKEND == "supabase_api":
+        from engine.db import supabase_api as sb
+        res = (
+            sb._sb.table("listing_events")
+            .select("kind, old_price, new_price, old_status, new_status, created_at")
+            .eq("listing_id", str(listing_id))
+            .order("created_at")
+            .limit(limit)
+            .execute()
+        )
+        return {"listing_id": str(listing_id), "events": res.data or []}
+
+    from engine.db.supabase_client import fetch_listing_events
+    return {"listing_id": str(listing_id), "events": fetch_listing_events(listing_id, limit)}
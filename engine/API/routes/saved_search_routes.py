@@ -0,0 +1,31 @@
+from fastapi import APIRouter, HTTPException
+
+from engine.API.models.saved_search import SavedSearchIn
+from engine.alerts import evaluator, store
+
+router = APIRouter(prefix="/saved-searches", tags=["Saved searches"])
+
+
+@router.get("")
+@router.get("/")
+async def list_saved_searches():
+    return [s.to_dict() for s in store.list_searches()]
+
+
+@router.post("", status_code=201)
+@router.post("/", status_code=201)
+async def create_saved_search(body: SavedSearchIn):
+    text_filters = [body.make, body.model, body.state]
+    range_filters = [body.price_min, body.price_max, body.year_min, body.year_max]
+    if not any(v and v.strip() for v in text_filters) and all(v is None for v in range_filters):
+        raise HTTPException(status_code=422, detail="At least one filter is required")
+    search = store.create_search(body.model_dump())
+    evaluator.invalidate()
+    return search.to_dict()
+
+
+@router.delete("/{search_id}", status_code=204)
+async def delete_saved_search(search_id: str):
+    if not store.deactivate_search(search_id):
+        raise HTTPException(status_code=404, detail="Saved search not found")
+    evaluator.invalidate()
@@ -0,0 +1 @@
+"""Saved searches and the ingest-driven alert evaluator."""
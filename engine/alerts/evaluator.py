@@ -0,0 +1,178 @@
+"""
+Saved-search alert evaluator, driven by committed ingest batches.
+
+``pipeline.save_many`` hands each saved batch to ``evaluate_batch`` when
+ALERTS_ON_INGEST=true. Listings are matched against the active saved searches
+through ``PredicateIndex`` (make/model/state buckets + price/year interval
+trees), so each listing only touches the searches that can match. Alerts are
+deduplicated per (search, listing, price) in a SQLite seen-set, so
+re-ingesting an unchanged listing does not alert again but a price change
+does.
+
+Delivery: searches with ``webhook_url`` get Discord embeds (batched via
+WebhookDispatcher); the rest use the email stub (printed).
+
+Env:
+- ALERTS_ON_INGEST: enable evaluation from the pipeline
+- ALERTS_SEARCH_TTL: seconds to cache the saved-search index (default 60)
+- ALERTS_SEEN_DB: SQLite path for sent alerts (default ``alerts_seen.sqlite3``)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from engine.alerts.predicate_index import PredicateIndex
+from engine.alerts.saved_search import SavedSearch
+
+_cache: Dict[str, Any] = {"index": None, "loaded_at": 0.0}
+_cache_lock = threading.Lock()
+
+
+def load_index(max_age: Optional[float] = None) -> PredicateIndex:
+    """Cached index over active saved searches, reloaded after ALERTS_SEARCH_TTL seconds."""
+    if max_age is None:
+        max_age = float(os.getenv("ALERTS_SEARCH_TTL", "60"))
+    with _cache_lock:
+        index = _cache["index"]
+        if index is not None and time.monotonic() - _cache["loaded_at"] < max_age:
+            return index
+    from engine.alerts.store import list_searches
+
+    index = PredicateIndex(list_searches())
+    with _cache_lock:
+        _cache.update({"index": index, "loaded_at": time.monotonic()})
+    return index
+
+
+def invalidate() -> None:
+    with _cache_lock:
+        _cache.update({"index": None, "loaded_at": 0.0})
+
+
+def match_batch(listings: Iterable[Mapping[str, Any]], index: PredicateIndex) -> Dict[str, List[Mapping[str, Any]]]:
+    """search id -> matching listings from the batch."""
+    out: Dict[str, List[Mapping[str, Any]]] = {}
+    for listing in listings:
+        for sid in index.match(listing):
+            out.setdefault(sid, []).append(listing)
+    return out
+
+
+def _alert_key(search_id: str, listing: Mapping[str, Any]) -> str:
+    return f"{search_id}|{listing.get('source')}:{listing.get('source_id')}|{listing.get('price')}"
+
+
+def _embed(search: SavedSearch, listing: Mapping[str, Any]) -> Dict[str, Any]:
+    title = " ".join(str(p) for p in (listing.get("year"), listing.get("make"), listing.get("model")) if p)
+    price = listing.get("price")
+    odo = listing.get("odometer")
+    embed: Dict[str, Any] = {
+        "title": title or listing.get("source_url"),
+        "url": listing.get("source_url"),
+        "description": f"Matches saved search **{search.name or search.id}**",
+        "color": 0x00FF00,
+        "fields": [
+            {"name": "🏷️ Price", "value": f"${price:,}" if price is not None else "—", "inline": True},
+            {"name": "⏱️ Odometer", "value": f"{odo:,} km" if odo is not None else "—", "inline": True},
+            {"name": "📍 State", "value": listing.get("state") or "—", "inline": True},
+            {"name": "💼 Vendor", "value": str(listing.get("source") or "—"), "inline": True},
+        ],
+    }
+    media = listing.get("media") or []
+    if media:
+        embed["image"] = {"url": media[0]}
+    return embed
+
+
+async def _send_webhooks(jobs: List[Tuple[SavedSearch, List[Mapping[str, Any]]]]) -> List[str]:
+    import aiohttp
+    from engine.integrations.notify_dispatcher import WebhookDispatcher
+
+    by_url: Dict[str, List[Tuple[SavedSearch, Mapping[str, Any]]]] = {}
+    for search, listings in jobs:
+        for listing in listings:
+            by_url.setdefault(search.webhook_url, []).append((search, listing))
+    delivered: List[str] = []
+    async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=30)) as session:
+        for url, items in by_url.items():
+            async with WebhookDispatcher(url, username="RideRadar Alerts", session=session) as dispatcher:
+                for search, listing in items:
+                    dispatcher.enqueue(_embed(search, listing), item=_alert_key(search.id, listing))
+            delivered.extend(dispatcher.delivered)
+    return delivered
+
+
+def _run(coro: Any) -> Any:
+    # The pipeline is synchronous, but may be called from inside a running loop
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    result: Dict[str, Any] = {}
+    t = threading.Thread(target=lambda: result.update(value=asyncio.run(coro)))
+    t.start()
+    t.join()
+    return result.get("value")
+
+
+def deliver(alerts: Dict[str, List[Mapping[str, Any]]], index: PredicateIndex) -> List[str]:
+    """Send alerts; returns the alert keys that were delivered."""
+    webhook_jobs: List[Tuple[SavedSearch, List[Mapping[str, Any]]]] = []
+    delivered: List[str] = []
+    for sid, listings in alerts.items():
+        search = index.get(sid)
+        if search is None:
+            continue
+        if search.webhook_url:
+            webhook_jobs.append((search, listings))
+            continue
+        # Email transport is a stub for now
+        for listing in listings:
+            print(
+                f"alert search={sid} to={search.email or '-'} {listing.get('source')}:{listing.get('source_id')} "
+                f"price={listing.get('price')} url={listing.get('source_url')}"
+            )
+            delivered.append(_alert_key(sid, listing))
+    if webhook_jobs:
+        delivered.extend(_run(_send_webhooks(webhook_jobs)) or [])
+    return delivered
+
+
+def evaluate_batch(
+    listings: Iterable[Mapping[str, Any]],
+    index: Optional[PredicateIndex] = None,
+    seen: Any = None,
+) -> Dict[str, int]:
+    """Match a saved batch against saved searches and send alerts not already sent."""
+    from engine.integrations.seen_store import SeenStore
+
+    rows = list(listings)
+    index = load_index() if index is None else index
+    stats = {"listings": len(rows), "searches": len(index), "matches": 0, "alerts": 0}
+    if not rows or not len(index):
+        return stats
+    matched = match_batch(rows, index)
+    stats["matches"] = sum(len(v) for v in matched.values())
+    if not matched:
+        return stats
+
+    store = seen if seen is not None else SeenStore(os.getenv("ALERTS_SEEN_DB", "alerts_seen.sqlite3"))
+    try:
+        fresh = set(store.new_keys(_alert_key(sid, l) for sid, ls in matched.items() for l in ls))
+        alerts = {
+            sid: [l for l in ls if _alert_key(sid, l) in fresh] for sid, ls in matched.items()
+        }
+        alerts = {sid: ls for sid, ls in alerts.items() if ls}
+        if alerts:
+            sent = deliver(alerts, index)
+            store.mark_keys(sent)
+            stats["alerts"] = len(sent)
+    finally:
+        if seen is None:
+            store.close()
+    return stats
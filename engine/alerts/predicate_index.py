@@ -0,0 +1,168 @@
+"""
+Predicate index: which saved searches does a listing satisfy?
+
+Searches are bucketed by their (make, model, state) equality filters, with ""
+standing for "any", so a listing only visits the 8 buckets its own values
+(or wildcards) can reach. Inside a bucket, price and year ranges sit in two
+static centered interval trees. A stabbing query returns the searches whose
+range contains the listing's value in O(log n + k), and the two results are
+intersected. Searches with no bound on a field are kept outside the tree, so
+they also match listings where that field is unknown.
+
+Build once per search-set change; queries are read-only and thread-safe.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+
+from engine.alerts.saved_search import SavedSearch
+from engine.db.dedup import match_token
+
+_NEG_INF = float("-inf")
+_POS_INF = float("inf")
+
+_Interval = Tuple[float, float, int]  # (lo, hi, search position)
+
+
+class IntervalTree:
+    """Static centered interval tree over closed intervals; ``stab(x)`` yields payloads containing x."""
+
+    __slots__ = ("_nodes", "_root")
+
+    def __init__(self, intervals: Sequence[_Interval]) -> None:
+        # Node: [center, by_lo (ascending lo), by_hi (descending hi), left, right]
+        self._nodes: List[list] = []
+        self._root = self._build(list(intervals))
+
+    def _build(self, intervals: List[_Interval]) -> int:
+        if not intervals:
+            return -1
+        ends = sorted(v for lo, hi, _ in intervals for v in (lo, hi) if v not in (_NEG_INF, _POS_INF))
+        center = ends[len(ends) // 2] if ends else 0.0
+        here: List[_Interval] = []
+        left: List[_Interval] = []
+        right: List[_Interval] = []
+        for iv in intervals:
+            if iv[1] < center:
+                left.append(iv)
+            elif iv[0] > center:
+                right.append(iv)
+            else:
+                here.append(iv)
+        idx = len(self._nodes)
+        self._nodes.append(
+            [
+                center,
+                [(lo, p) for lo, _, p in sorted(here, key=lambda iv: iv[0])],
+                [(hi, p) for _, hi, p in sorted(here, key=lambda iv: -iv[1])],
+                -1,
+                -1,
+            ]
+        )
+        self._nodes[idx][3] = self._build(left)
+        self._nodes[idx][4] = self._build(right)
+        return idx
+
+    def stab(self, x: float) -> List[int]:
+        out: List[int] = []
+        node = self._root
+        nodes = self._nodes
+        while node != -1:
+            center, by_lo, by_hi, left, right = nodes[node]
+            if x < center:
+                for lo, p in by_lo:
+                    if lo > x:
+                        break
+                    out.append(p)
+                node = left
+            elif x > center:
+                for hi, p in by_hi:
+                    if hi < x:
+                        break
+                    out.append(p)
+                node = right
+            else:
+                out.extend(p for _, p in by_lo)
+                break
+        return out
+
+
+class _Bucket:
+    __slots__ = ("ids", "price_tree", "price_any", "year_tree", "year_any", "unbounded")
+
+    def __init__(self, positions: List[int], searches: Sequence[SavedSearch]) -> None:
+        price_iv: List[_Interval] = []
+        year_iv: List[_Interval] = []
+        self.price_any: Set[int] = set()
+        self.year_any: Set[int] = set()
+        for p in positions:
+            s = searches[p]
+            if s.price_min is None and s.price_max is None:
+                self.price_any.add(p)
+            else:
+                price_iv.append((_lo(s.price_min), _hi(s.price_max), p))
+            if s.year_min is None and s.year_max is None:
+                self.year_any.add(p)
+            else:
+                year_iv.append((_lo(s.year_min), _hi(s.year_max), p))
+        self.price_tree = IntervalTree(price_iv) if price_iv else None
+        self.year_tree = IntervalTree(year_iv) if year_iv else None
+        # Searches with no range filter at all match every listing that reaches the bucket
+        self.unbounded = self.price_any & self.year_any
+
+    def query(self, price: Optional[float], year: Optional[float]) -> Iterable[int]:
+        if self.price_tree is None and self.year_tree is None:
+            return self.unbounded
+        by_price = set(self.price_any)
+        if price is not None and self.price_tree is not None:
+            by_price.update(self.price_tree.stab(price))
+        if not by_price:
+            return ()
+        by_year = set(self.year_any)
+        if year is not None and self.year_tree is not None:
+            by_year.update(self.year_tree.stab(year))
+        return by_price & by_year
+
+
+def _lo(v: Optional[int]) -> float:
+    return _NEG_INF if v is None else v
+
+
+def _hi(v: Optional[int]) -> float:
+    return _POS_INF if v is None else v
+
+
+class PredicateIndex:
+    def __init__(self, searches: Iterable[SavedSearch]) -> None:
+        self.searches: List[SavedSearch] = list(searches)
+        self._by_id: Dict[str, SavedSearch] = {s.id: s for s in self.searches}
+        groups: Dict[Tuple[str, str, str], List[int]] = {}
+        for pos, s in enumerate(self.searches):
+            groups.setdefault((s.make_key, s.model_key, s.state_key), []).append(pos)
+        self._buckets: Dict[Tuple[str, str, str], _Bucket] = {
+            key: _Bucket(positions, self.searches) for key, positions in groups.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self.searches)
+
+    def get(self, search_id: str) -> Optional[SavedSearch]:
+        return self._by_id.get(search_id)
+
+    def match(self, listing: Mapping[str, Any]) -> List[str]:
+        """Ids of saved searches the listing satisfies."""
+        mk = match_token(listing.get("make"))
+        md = match_token(listing.get("model"))
+        st = (listing.get("state") or "").strip().upper()
+        price, year = listing.get("price"), listing.get("year")
+        buckets = self._buckets
+        searches = self.searches
+        out: List[str] = []
+        for make_key in {mk, ""}:
+            for model_key in {md, ""}:
+                for state_key in {st, ""}:
+                    bucket = buckets.get((make_key, model_key, state_key))
+                    if bucket is not None:
+                        out.extend(searches[p].id for p in bucket.query(price, year))
+        return out
@@ -0,0 +1,80 @@
+"""
+Saved-search record and its predicate.
+
+A saved search is a conjunction of optional filters: make/model (compared as
+lowercase alphanumerics, so "CX-5" == "cx5"), state, and inclusive price and
+year ranges. A bound on a field never matches a listing where that field is
+unknown.
+"""
+
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Mapping, Optional
+
+from engine.db.dedup import match_token
+
+
+@dataclass(frozen=True)
+class SavedSearch:
+    id: str
+    make: Optional[str] = None
+    model: Optional[str] = None
+    state: Optional[str] = None
+    price_min: Optional[int] = None
+    price_max: Optional[int] = None
+    year_min: Optional[int] = None
+    year_max: Optional[int] = None
+    name: Optional[str] = None
+    webhook_url: Optional[str] = None
+    email: Optional[str] = None
+    # Comparison keys derived from make/model/state
+    make_key: str = field(init=False, repr=False, compare=False)
+    model_key: str = field(init=False, repr=False, compare=False)
+    state_key: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "make_key", match_token(self.make))
+        object.__setattr__(self, "model_key", match_token(self.model))
+        object.__setattr__(self, "state_key", (self.state or "").strip().upper())
+
+    @classmethod
+    def from_row(cls, row: Mapping[str, Any]) -> "SavedSearch":
+        return cls(
+            id=str(row["id"]),
+            make=row.get("make"),
+            model=row.get("model"),
+            state=row.get("state"),
+            price_min=row.get("price_min"),
+            price_max=row.get("price_max"),
+            year_min=row.get("year_min"),
+            year_max=row.get("year_max"),
+            name=row.get("name"),
+            webhook_url=row.get("webhook_url"),
+            email=row.get("email"),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        out = asdict(self)
+        for k in ("make_key", "model_key", "state_key"):
+            out.pop(k, None)
+        return out
+
+    def matches(self, listing: Mapping[str, Any]) -> bool:
+        if self.make_key and match_token(listing.get("make")) != self.make_key:
+            return False
+        if self.model_key and match_token(listing.get("model")) != self.model_key:
+            return False
+        if self.state_key and (listing.get("state") or "").strip().upper() != self.state_key:
+            return False
+        return _in_range(listing.get("price"), self.price_min, self.price_max) and _in_range(
+            listing.get("year"), self.year_min, self.year_max
+        )
+
+
+def _in_range(value: Optional[int], lo: Optional[int], hi: Optional[int]) -> bool:
+    if lo is None and hi is None:
+        return True
+    if value is None:
+        return False
+    return (lo is None or value >= lo) and (hi is None or value <= hi)
@@ -0,0 +1,79 @@
+"""
+Saved-search persistence (``saved_searches`` table), following DB_BACKEND.
+
+- postgres (default): psycopg via engine.db.supabase_client.get_conn
+- supabase_api: Supabase REST client
+
+Table DDL is in RUNBOOK ("Saved searches & alerts").
+"""
+
+from __future__ import annotations
+
+import os
+import uuid
+from typing import Any, Dict, List
+
+from engine.alerts.saved_search import SavedSearch
+
+_COLUMNS = ["name", "make", "model", "state", "price_min", "price_max", "year_min", "year_max", "webhook_url", "email"]
+
+
+def _backend() -> str:
+    return os.getenv("DB_BACKEND", "postgres").lower()
+
+
+def list_searches() -> List[SavedSearch]:
+    """All active saved searches."""
+    if _backend() == "supabase_api":
+        from engine.db import supabase_api as sb
+
+        res = sb._sb.table("saved_searches").select("id, " + ", ".join(_COLUMNS)).eq("active", True).execute()
+        return [SavedSearch.from_row(r) for r in res.data or []]
+
+    import psycopg
+    from engine.db.supabase_client import get_conn
+
+    sql = f"select id, {', '.join(_COLUMNS)} from saved_searches where active order by created_at"
+    with get_conn() as conn, conn.cursor(row_factory=psycopg.rows.dict_row) as cur:
+        cur.execute(sql)
+        return [SavedSearch.from_row(r) for r in cur.fetchall()]
+
+
+def create_search(fields: Dict[str, Any]) -> SavedSearch:
+    row = {k: fields.get(k) for k in _COLUMNS}
+    if _backend() == "supabase_api":
+        from engine.db import supabase_api as sb
+
+        res = sb._sb.table("saved_searches").insert(row).execute()
+        return SavedSearch.from_row(res.data[0])
+
+    import psycopg
+    from engine.db.supabase_client import get_conn
+
+    sql = f"""
+      insert into saved_searches ({", ".join(_COLUMNS)})
+      values ({", ".join(["%s"] * len(_COLUMNS))})
+      returning id, {", ".join(_COLUMNS)}
+    """
+    with get_conn() as conn, conn.cursor(row_factory=psycopg.rows.dict_row) as cur:
+        cur.execute(sql, [row[k] for k in _COLUMNS])
+        return SavedSearch.from_row(cur.fetchone())
+
+
+def deactivate_search(search_id: str) -> bool:
+    """Mark a saved search inactive; False if the id is malformed or not an active search."""
+    try:
+        search_id = str(uuid.UUID(search_id))
+    except ValueError:
+        return False
+    if _backend() == "supabase_api":
+        from engine.db import supabase_api as sb
+
+        res = sb._sb.table("saved_searches").update({"active": False}).eq("id", search_id).execute()
+        return bool(res.data)
+
+    from engine.db.supabase_client import get_conn
+
+    with get_conn() as conn, conn.cursor() as cur:
+        cur.execute("update saved_searches set active = false where id = %s and active", (search_id,))
+        return cur.rowcount > 0
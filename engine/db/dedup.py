@@ -0,0 +1,383 @@
+"""
+Cross-vendor duplicate detection.
+
+``make_fingerprint`` (the exact-match SHA1 over make/model/year + bands) lives
+here and is re-exported by both DB backends. On top of it, listings are
+grouped into duplicate clusters:
+
+1. Blocking: each listing is indexed under (make, model, year, price band)
+   and (make, model, year, odometer band), with make/model reduced to
+   lowercase alphanumerics ("CX-5" == "cx5"). Probes also check the
+   neighbouring bands, so a car just across a band edge is still a candidate.
+2. Scoring: candidate pairs from different vendors are scored on price and
+   odometer closeness, state and variant tokens (``score_pair``).
+3. Clustering: pairs at or above the threshold are merged with union-find.
+   Clusters keep an existing ``cluster_id`` when a member already has one;
+   when a row bridges two clusters, every row holding the losing id moves
+   to the winning one. A rebuild also clears ids on rows that no longer
+   match anything.
+
+Each listing only probes a handful of buckets, so a batch costs roughly
+O(batch x bucket size) instead of O(n^2).
+
+Usage:
+  python -m engine.db.dedup --rebuild            # full pass over listings
+  python -m engine.db.dedup --rebuild --dry-run  # print cluster counts only
+
+Per-batch runs happen from the ingest pipeline when DEDUP_ON_INGEST=true.
+Requires the ``listings.cluster_id`` column (see RUNBOOK).
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import re
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+
+PRICE_STEP = 2500
+ODOMETER_STEP = 25000
+MATCH_THRESHOLD = 0.8
+
+# Component weights for score_pair (only components present on both sides count)
+_WEIGHTS = {"price": 0.35, "odometer": 0.4, "state": 0.15, "variant": 0.1}
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+
+Identity = Tuple[str, str]
+_BlockKey = Tuple[str, str, str, int, int]
+
+
+def _band(n: Optional[int], step: int) -> str:
+    if n is None:
+        return ""
+    lo = (n // step) * step
+    return f"{lo}-{lo+step}"
+
+
+def normalize_text(s: Optional[str]) -> str:
+    return (s or "").strip().lower()
+
+
+def make_fingerprint(d: Mapping[str, Any]) -> str:
+    parts = [
+        normalize_text(d.get("make")),
+        normalize_text(d.get("model")),
+        str(d.get("year") or ""),
+        _band(d.get("odometer"), 25000),
+        _band(d.get("price"), 2500),
+        normalize_text(d.get("variant")),
+        normalize_text(d.get("suburb") or d.get("postcode")),
+    ]
+    sha = hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()
+    return sha
+
+
+def match_token(s: Optional[str]) -> str:
+    """Make/model comparison token: lowercase alphanumerics only."""
+    return _NON_ALNUM_RE.sub("", normalize_text(s))
+
+
+def _identity(d: Mapping[str, Any]) -> Identity:
+    return str(d.get("source") or ""), str(d.get("source_id") or "")
+
+
+def blocking_keys(d: Mapping[str, Any]) -> List[_BlockKey]:
+    """Buckets a listing is stored under (empty when make/model/year are unknown)."""
+    mk, md, yr = match_token(d.get("make")), match_token(d.get("model")), d.get("year")
+    if not mk or not md or not yr:
+        return []
+    keys: List[_BlockKey] = []
+    price, odo = d.get("price"), d.get("odometer")
+    if price is not None:
+        keys.append(("p", mk, md, int(yr), int(price) // PRICE_STEP))
+    if odo is not None:
+        keys.append(("o", mk, md, int(yr), int(odo) // ODOMETER_STEP))
+    return keys
+
+
+def _probe_keys(d: Mapping[str, Any]) -> List[_BlockKey]:
+    out: List[_BlockKey] = []
+    for kind, mk, md, yr, band in blocking_keys(d):
+        out.extend((kind, mk, md, yr, band + off) for off in (-1, 0, 1))
+    return out
+
+
+def _closeness(a: Optional[float], b: Optional[float], full: float, zero: float) -> Optional[float]:
+    # 1.0 within `full`, falling linearly to 0.0 at `zero`
+    if a is None or b is None:
+        return None
+    diff = abs(a - b)
+    if diff <= full:
+        return 1.0
+    if diff >= zero:
+        return 0.0
+    return 1.0 - (diff - full) / (zero - full)
+
+
+def score_pair(a: Mapping[str, Any], b: Mapping[str, Any]) -> float:
+    """Similarity in [0, 1] for two listings that share a block. Same-vendor pairs score 0."""
+    if normalize_text(a.get("source")) == normalize_text(b.get("source")):
+        return 0.0
+    pa, pb = a.get("price"), b.get("price")
+    ref = max(pa or 0, pb or 0)
+    parts = {
+        "price": _closeness(pa, pb, 0.02 * ref, 0.12 * ref) if ref else None,
+        "odometer": _closeness(a.get("odometer"), b.get("odometer"), 1500, 15000),
+    }
+    if not parts["price"] and not parts["odometer"]:
+        # Nothing numeric to go on, or both far apart: state/variant alone never make a duplicate
+        return 0.0
+    sa, sb = normalize_text(a.get("state")), normalize_text(b.get("state"))
+    parts["state"] = (1.0 if sa == sb else 0.0) if sa and sb else None
+    va = set(normalize_text(a.get("variant")).split())
+    vb = set(normalize_text(b.get("variant")).split())
+    parts["variant"] = len(va & vb) / len(va | vb) if va and vb else None
+
+    total = weight = 0.0
+    for name, value in parts.items():
+        if value is not None:
+            total += _WEIGHTS[name] * value
+            weight += _WEIGHTS[name]
+    return total / weight if weight else 0.0
+
+
+class DedupIndex:
+    """Blocking index + union-find over listings keyed by (source, source_id)."""
+
+    def __init__(self, threshold: float = MATCH_THRESHOLD) -> None:
+        self.threshold = threshold
+        self.rows: List[Mapping[str, Any]] = []
+        self._pos: Dict[Identity, int] = {}
+        self._buckets: Dict[_BlockKey, List[int]] = {}
+        self._parent: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def add(self, row: Mapping[str, Any]) -> int:
+        """Index a listing; a repeated identity replaces the stored row but keeps its cluster_id."""
+        ident = _identity(row)
+        idx = self._pos.get(ident)
+        if idx is not None:
+            prev = self.rows[idx]
+            if prev.get("cluster_id") and not row.get("cluster_id"):
+                row = {**dict(row), "cluster_id": prev.get("cluster_id")}
+            self.rows[idx] = row
+            # Old keys stay behind; they only add candidates that score against the new values
+            for key in set(blocking_keys(row)) - set(blocking_keys(prev)):
+                self._buckets.setdefault(key, []).append(idx)
+            return idx
+        idx = len(self.rows)
+        self.rows.append(row)
+        self._pos[ident] = idx
+        self._parent.append(idx)
+        for key in blocking_keys(row):
+            self._buckets.setdefault(key, []).append(idx)
+        return idx
+
+    def _find(self, i: int) -> int:
+        parent = self._parent
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def _union(self, i: int, j: int) -> None:
+        ri, rj = self._find(i), self._find(j)
+        if ri != rj:
+            self._parent[max(ri, rj)] = min(ri, rj)
+
+    def candidates(self, idx: int) -> Set[int]:
+        out: Set[int] = set()
+        for key in _probe_keys(self.rows[idx]):
+            bucket = self._buckets.get(key)
+            if bucket:
+                out.update(bucket)
+        out.discard(idx)
+        return out
+
+    def link(self, indices: Optional[Iterable[int]] = None) -> int:
+        """Score candidates of `indices` (default: all rows) and merge matches. Returns matched pairs."""
+        full = indices is None
+        seen: Set[Tuple[int, int]] = set()
+        sources = [normalize_text(r.get("source")) for r in self.rows]
+        matched = 0
+        for i in range(len(self.rows)) if full else indices:
+            row, src = self.rows[i], sources[i]
+            for j in self.candidates(i):
+                if sources[j] == src:
+                    continue
+                if full:
+                    # Probe windows are symmetric, so each pair is reached from both ends
+                    if j < i:
+                        continue
+                else:
+                    pair = (i, j) if i < j else (j, i)
+                    if pair in seen:
+                        continue
+                    seen.add(pair)
+                if score_pair(row, self.rows[j]) >= self.threshold:
+                    self._union(i, j)
+                    matched += 1
+        return matched
+
+    def clusters(self) -> List[List[int]]:
+        """Clusters with at least two members, as lists of row indices."""
+        groups: Dict[int, List[int]] = {}
+        for i in range(len(self.rows)):
+            groups.setdefault(self._find(i), []).append(i)
+        return [members for members in groups.values() if len(members) > 1]
+
+    def _cluster_id(self, members: List[int]) -> Tuple[str, List[str]]:
+        """(winning id, other stored ids it replaces). Existing ids win (smallest if several)."""
+        existing = sorted({str(self.rows[i]["cluster_id"]) for i in members if self.rows[i].get("cluster_id")})
+        if existing:
+            return existing[0], existing[1:]
+        seed = min("%s:%s" % _identity(self.rows[i]) for i in members)
+        return "c_" + hashlib.sha1(seed.encode("utf-8")).hexdigest()[:16], []
+
+    def assign_cluster_ids(self) -> Dict[Identity, str]:
+        """Cluster id per member whose stored id differs."""
+        changes: Dict[Identity, str] = {}
+        for members in self.clusters():
+            cid, _ = self._cluster_id(members)
+            for i in members:
+                if self.rows[i].get("cluster_id") != cid:
+                    changes[_identity(self.rows[i])] = cid
+        return changes
+
+    def merged_ids(self) -> Dict[str, List[str]]:
+        """Winning id -> stored ids folded into it, for clusters a new row bridged."""
+        merged: Dict[str, List[str]] = {}
+        for members in self.clusters():
+            cid, losers = self._cluster_id(members)
+            if losers:
+                merged[cid] = losers
+        return merged
+
+    def unclustered(self) -> List[Identity]:
+        """Rows still carrying a cluster_id although they no longer match anything."""
+        clustered = {i for members in self.clusters() for i in members}
+        return [_identity(r) for i, r in enumerate(self.rows) if r.get("cluster_id") and i not in clustered]
+
+
+_SELECT_COLS = "source, source_id, make, model, variant, year, price, odometer, state, cluster_id"
+
+
+def _fetch_candidates(cur: Any, listings: List[Mapping[str, Any]]) -> List[Dict[str, Any]]:
+    # Existing rows sharing (make token, year) with the batch
+    pairs = {(match_token(d.get("make")), int(d["year"])) for d in listings if blocking_keys(d)}
+    if not pairs:
+        return []
+    makes, years = zip(*sorted(pairs))
+    # The join expression must match listings_dedup_block_idx (RUNBOOK) so each pair is an index probe
+    cur.execute(
+        f"""
+        select {_SELECT_COLS}
+        from unnest(%s::text[], %s::int[]) as k(make_token, block_year)
+        join listings l
+          on regexp_replace(lower(l.make), '[^a-z0-9]+', '', 'g') = k.make_token
+         and l.year = k.block_year
+        """,
+        (list(makes), list(years)),
+    )
+    return cur.fetchall()
+
+
+def _write_cluster_ids(
+    cur: Any,
+    changes: Dict[Identity, str],
+    merged: Optional[Dict[str, List[str]]] = None,
+    cleared: Iterable[Identity] = (),
+) -> None:
+    if changes:
+        cur.executemany(
+            "update listings set cluster_id = %s where source = %s and source_id = %s",
+            [(cid, source, source_id) for (source, source_id), cid in changes.items()],
+        )
+    if merged:
+        # Members of a losing cluster outside this pass still carry its id
+        cur.executemany(
+            "update listings set cluster_id = %s where cluster_id = any(%s)",
+            [(cid, losers) for cid, losers in merged.items()],
+        )
+    cleared = list(cleared)
+    if cleared:
+        cur.executemany(
+            "update listings set cluster_id = null where source = %s and source_id = %s",
+            cleared,
+        )
+
+
+def run_batch(listings: Iterable[Mapping[str, Any]], threshold: float = MATCH_THRESHOLD) -> Dict[str, int]:
+    """Cluster a just-ingested batch against existing listings and persist cluster ids (Postgres backend)."""
+    import psycopg
+    from engine.db.supabase_client import get_conn
+
+    batch = [d for d in listings if d.get("source") and d.get("source_id")]
+    index = DedupIndex(threshold)
+    with get_conn() as conn, conn.cursor(row_factory=psycopg.rows.dict_row) as cur:
+        for row in _fetch_candidates(cur, batch):
+            index.add(row)
+        batch_idx = [index.add(d) for d in batch]
+        matched = index.link(batch_idx)
+        changes = index.assign_cluster_ids()
+        merged = index.merged_ids()
+        _write_cluster_ids(cur, changes, merged)
+    return {
+        "batch": len(batch),
+        "candidates": len(index),
+        "pairs": matched,
+        "updated": len(changes),
+        "merged": sum(len(v) for v in merged.values()),
+    }
+
+
+def rebuild(threshold: float = MATCH_THRESHOLD, dry_run: bool = False) -> Dict[str, int]:
+    """Full pass over all listings (same blocking, so still near-linear)."""
+    import psycopg
+    from engine.db.supabase_client import get_conn
+
+    index = DedupIndex(threshold)
+    with get_conn() as conn:
+        # Server-side cursors need a transaction (connections are autocommit)
+        with conn.transaction(), conn.cursor(name="dedup_scan", row_factory=psycopg.rows.dict_row) as cur:
+            cur.itersize = 5000
+            cur.execute(f"select {_SELECT_COLS} from listings")
+            for row in cur:
+                index.add(row)
+        matched = index.link()
+        changes = index.assign_cluster_ids()
+        merged = index.merged_ids()
+        # Ids from earlier passes that this one did not reproduce
+        cleared = index.unclustered()
+        if not dry_run:
+            with conn.cursor() as cur:
+                _write_cluster_ids(cur, changes, merged, cleared)
+    return {
+        "listings": len(index),
+        "pairs": matched,
+        "clusters": len(index.clusters()),
+        "updated": len(changes),
+        "merged": sum(len(v) for v in merged.values()),
+        "cleared": len(cleared),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    p = argparse.ArgumentParser(description="Cross-vendor duplicate clustering")
+    p.add_argument("--rebuild", action="store_true", help="Recluster every listing")
+    p.add_argument("--threshold", type=float, default=MATCH_THRESHOLD, help="Pair score needed to merge (0-1)")
+    p.add_argument("--dry-run", action="store_true", help="Do not write cluster ids")
+    args = p.parse_args(argv)
+    if not args.rebuild:
+        p.print_help()
+        return 2
+    stats = rebuild(threshold=args.threshold, dry_run=args.dry_run)
+    print("dedup " + " ".join(f"{k}={v}" for k, v in stats.items()))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
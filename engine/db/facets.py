@@ -0,0 +1,161 @@
+"""
+Faceted counts for listing filters (make, state, body, price bucket).
+
+All facets come from one scan: ``GROUP BY GROUPING SETS`` over the filtered
+rows, with ``grouping()`` telling the sets apart. Results are cached per
+process by filter signature for FACETS_CACHE_TTL seconds (default 30).
+
+Invalidation: ingest bumps a generation counter (``ingest_state`` table, see
+RUNBOOK) after each saved batch when FACETS_ON_INGEST=true. Cached entries
+from an older generation are dropped. The API re-reads the counter at most
+once every FACETS_GENERATION_POLL seconds (default 1), so a cache hit usually
+costs no query at all.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+FACETS = ("make", "state", "body", "price")
+# Upper edges of the price buckets; the last bucket is open-ended
+PRICE_EDGES = (5000, 10000, 15000, 20000, 30000, 40000, 50000, 75000, 100000)
+MAX_VALUES = 50
+_CACHE_SIZE = 512
+
+_lock = threading.Lock()
+_cache: "OrderedDict[str, Tuple[float, int, Dict[str, Any]]]" = OrderedDict()
+_generation: Dict[str, float] = {"value": 0, "checked_at": 0.0}
+
+
+def signature(filters: Dict[str, Any]) -> str:
+    """Stable cache key for a filter dict."""
+    return json.dumps({k: v for k, v in filters.items() if v is not None}, sort_keys=True, default=str)
+
+
+def price_label(bucket: int) -> str:
+    lo = 0 if bucket <= 0 else PRICE_EDGES[bucket - 1]
+    if bucket >= len(PRICE_EDGES):
+        return f"{lo}+"
+    return f"{lo}-{PRICE_EDGES[bucket]}"
+
+
+def facet_sql(where: Sequence[str]) -> str:
+    where_sql = " where " + " and ".join(where) if where else ""
+    return f"""
+      with f as (
+        select make, state, body, width_bucket(price, %s::int[]) as price_bucket
+        from listings{where_sql}
+      )
+      select grouping(make) as g_make, grouping(state) as g_state,
+             grouping(body) as g_body, grouping(price_bucket) as g_price,
+             make, state, body, price_bucket, count(*) as n
+      from f
+      group by grouping sets ((make), (state), (body), (price_bucket), ())
+    """
+
+
+def shape(rows: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+    """Turn GROUPING SETS rows into {"total": n, facet: [{"value", "count"}...]}."""
+    out: Dict[str, Any] = {"total": 0, **{f: [] for f in FACETS}}
+    for r in rows:
+        if not r["g_make"]:
+            out["make"].append({"value": r["make"], "count": r["n"]})
+        elif not r["g_state"]:
+            out["state"].append({"value": r["state"], "count": r["n"]})
+        elif not r["g_body"]:
+            out["body"].append({"value": r["body"], "count": r["n"]})
+        elif not r["g_price"]:
+            bucket = r["price_bucket"]
+            value = None if bucket is None else price_label(bucket)
+            out["price"].append({"value": value, "count": r["n"], "bucket": bucket})
+        else:
+            out["total"] = r["n"]
+    for f in ("make", "state", "body"):
+        out[f] = sorted(out[f], key=lambda v: (-v["count"], str(v["value"])))[:MAX_VALUES]
+    out["price"].sort(key=lambda v: (v["bucket"] is None, v["bucket"] or 0))
+    for v in out["price"]:
+        v.pop("bucket")
+    return out
+
+
+def _read_generation(cur: Any) -> int:
+    try:
+        cur.execute("select generation from ingest_state where key = 'listings'")
+        row = cur.fetchone()
+        value = int((row["generation"] if isinstance(row, dict) else row[0]) if row else 0)
+    except Exception:
+        # No ingest_state table: fall back to TTL-only expiry
+        value = 0
+    with _lock:
+        _generation.update(value=value, checked_at=time.monotonic())
+    return value
+
+
+def _cached(key: str, gen: float) -> Optional[Dict[str, Any]]:
+    with _lock:
+        hit = _cache.get(key)
+        if hit is None or hit[0] <= time.monotonic() or hit[1] != gen:
+            return None
+        _cache.move_to_end(key)
+        return hit[2]
+
+
+def facet_counts(where: List[str], params: List[Any], filters: Dict[str, Any]) -> Dict[str, Any]:
+    """Cached facet counts for the filtered listings (Postgres backend)."""
+    import psycopg
+    from engine.db.supabase_client import get_conn
+
+    key = signature(filters)
+    poll = float(os.getenv("FACETS_GENERATION_POLL", "1"))
+    with _lock:
+        gen_fresh = time.monotonic() - _generation["checked_at"] < poll
+        gen = _generation["value"]
+    # Fast path: no connection at all while the generation reading is fresh
+    if gen_fresh:
+        hit = _cached(key, gen)
+        if hit is not None:
+            return hit
+
+    with get_conn() as conn, conn.cursor(row_factory=psycopg.rows.dict_row) as cur:
+        gen = _read_generation(cur)
+        hit = _cached(key, gen)
+        if hit is not None:
+            return hit
+        cur.execute(facet_sql(where), (list(PRICE_EDGES), *params))
+        result = shape(cur.fetchall())
+    ttl = float(os.getenv("FACETS_CACHE_TTL", "30"))
+    with _lock:
+        _cache[key] = (time.monotonic() + ttl, gen, result)
+        _cache.move_to_end(key)
+        while len(_cache) > _CACHE_SIZE:
+            _cache.popitem(last=False)
+    return result
+
+
+def invalidate() -> None:
+    """Drop cached facets in this process."""
+    with _lock:
+        _cache.clear()
+        _generation.update(checked_at=0.0)
+
+
+def bump_generation() -> Optional[int]:
+    """Advance the shared ingest generation so every API process drops its facet cache."""
+    from engine.db.supabase_client import get_conn
+
+    invalidate()
+    with get_conn() as conn, conn.cursor() as cur:
+        cur.execute(
+            """
+            insert into ingest_state (key, generation, updated_at) values ('listings', 1, now())
+            on conflict (key) do update set generation = ingest_state.generation + 1, updated_at = now()
+            returning generation
+            """
+        )
+        row = cur.fetchone()
+        return row[0] if row else None
@@ -0,0 +1,125 @@
+"""
+Market price aggregates and deal scores.
+
+Listings are grouped into market segments by ``market_key``: make and model
+tokens (lowercase alphanumerics, as in dedup), a 2-year band and a 25,000 km
+odometer band (300,000 km and above share one band). The same key is a stored
+generated column on ``listings`` (see RUNBOOK), and ``market_key`` below must
+produce exactly the same string.
+
+``listing_price_stats`` holds count, p25, median and p75 of asking prices for
+active listings in each segment. It is refreshed incrementally: a saved batch
+only recomputes the segments it touched, including the ones its rows moved
+out of (``refresh_batch``). The API reads
+``deal_score = (median - price) / median`` through the ``listing_deals`` view,
+so nothing is aggregated per request. Positive scores are below market.
+
+Usage:
+  python -m engine.db.market --rebuild   # recompute every segment
+
+Per-batch refresh happens from the ingest pipeline when PRICE_STATS_ON_INGEST=true.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Set
+
+from engine.db.dedup import match_token
+
+YEAR_STEP = 2
+ODOMETER_STEP = 25000
+ODOMETER_TOP_BAND = 12
+# Segments need this many priced listings before deal_score is exposed (mirrored in the view)
+MIN_SAMPLES = 5
+
+
+def market_key(d: Mapping[str, Any]) -> Optional[str]:
+    """Segment key for a listing, or None when make/model are unknown."""
+    mk, md = match_token(d.get("make")), match_token(d.get("model"))
+    if not mk or not md:
+        return None
+    year, odo = d.get("year"), d.get("odometer")
+    year_band = "" if year is None else str((int(year) // YEAR_STEP) * YEAR_STEP)
+    odo_band = "" if odo is None else str(min(int(odo) // ODOMETER_STEP, ODOMETER_TOP_BAND))
+    return f"{mk}|{md}|{year_band}|{odo_band}"
+
+
+def deal_score(price: Optional[float], median: Optional[float], n: int = MIN_SAMPLES) -> Optional[float]:
+    """Fraction below (positive) or above (negative) the segment median."""
+    if not price or not median or n < MIN_SAMPLES:
+        return None
+    return round((median - price) / median, 3)
+
+
+_AGG_SELECT = """
+  select l.market_key,
+         count(*) as n,
+         percentile_cont(array[0.25, 0.5, 0.75]) within group (order by l.price) as p
+  from listings l
+  where l.market_key is not null and l.price > 0 and l.status = 'active' {extra}
+  group by l.market_key
+"""
+
+_UPSERT_STATS = """
+  insert into listing_price_stats (market_key, n, p25, median, p75, updated_at)
+  select market_key, n, p[1], p[2], p[3], now() from agg
+  on conflict (market_key) do update set
+    n = excluded.n, p25 = excluded.p25, median = excluded.median, p75 = excluded.p75,
+    updated_at = excluded.updated_at
+"""
+
+
+def refresh_batch(listings: Iterable[Mapping[str, Any]], prev_keys: Iterable[str] = ()) -> Dict[str, int]:
+    """
+    Recompute aggregates for the segments a saved batch touched (Postgres backend).
+
+    ``prev_keys`` are the segments the rows were in before the upsert (see
+    ``upsert_many(prev_market_keys=...)``), so a segment a listing left does
+    not keep its count and median.
+    """
+    from engine.db.supabase_client import get_conn
+
+    keys: Set[str] = {k for k in (market_key(d) for d in listings) if k} | {k for k in prev_keys if k}
+    if not keys:
+        return {"segments": 0, "updated": 0}
+    sql = f"""
+      with keys as (select k from jsonb_array_elements_text(%s::jsonb) as k),
+      agg as ({_AGG_SELECT.format(extra="and l.market_key in (select k from keys)")}),
+      gone as (
+        delete from listing_price_stats s
+        where s.market_key in (select k from keys)
+          and not exists (select 1 from agg where agg.market_key = s.market_key)
+      )
+      {_UPSERT_STATS}
+    """
+    with get_conn() as conn, conn.cursor() as cur:
+        cur.execute(sql, (json.dumps(sorted(keys)),))
+        return {"segments": len(keys), "updated": cur.rowcount}
+
+
+def rebuild() -> Dict[str, int]:
+    """Recompute every segment in one transaction."""
+    from engine.db.supabase_client import get_conn
+
+    with get_conn() as conn, conn.transaction(), conn.cursor() as cur:
+        cur.execute("delete from listing_price_stats")
+        cur.execute(f"with agg as ({_AGG_SELECT.format(extra='')}) {_UPSERT_STATS}")
+        return {"segments": cur.rowcount}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    p = argparse.ArgumentParser(description="Market price aggregates for deal scores")
+    p.add_argument("--rebuild", action="store_true", help="Recompute every market segment")
+    args = p.parse_args(argv)
+    if not args.rebuild:
+        p.print_help()
+        return 2
+    stats = rebuild()
+    print("price_stats " + " ".join(f"{k}={v}" for k, v in stats.items()))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,9 +1,9 @@
 import os
-import json
-import hashlib
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Tuple
 from supabase import create_client, Client
 
+from engine.db.dedup import make_fingerprint  # noqa: F401  (re-exported)
+
 
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_SERVICE_KEY = os.getenv("SUPABASE_SERVICE_KEY")
@@ -14,31 +14,6 @@ if not SUPABASE_URL or not SUPABASE_SERVICE_KEY:
 _sb: Client = create_client(SUPABASE_URL, SUPABASE_SERVICE_KEY)
 
 
-def _band(n: Optional[int], step: int) -> str:
-    if n is None:
-        return ""
-    lo = (n // step) * step
-    return f"{lo}-{lo+step}"
-
-
-def _normalize_text(s: Optional[str]) -> str:
-    return (s or "").strip().lower()
-
-
-def make_fingerprint(d: Dict[str, Any]) -> str:
-    parts = [
-        _normalize_text(d.get("make")),
-        _normalize_text(d.get("model")),
-        str(d.get("year") or ""),
-        _band(d.get("odometer"), 25000),
-        _band(d.get("price"), 2500),
-        _normalize_text(d.get("variant")),
-        _normalize_text(d.get("suburb") or d.get("postcode")),
-    ]
-    sha = hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()
-    return sha
-
-
 def upsert_listing(listing: Dict[str, Any]) -> None:
     if not listing.get("fingerprint"):
         listing["fingerprint"] = make_fingerprint(listing)
@@ -47,6 +22,19 @@ def upsert_listing(listing: Dict[str, Any]) -> None:
     _sb.table("listings").upsert(listing, on_conflict="source,source_id").execute()
 
 
+def upsert_many(listings: List[Dict[str, Any]]) -> Tuple[int, int]:
+    """Bulk upsert in one request. Returns (upserted, events); events are Postgres-backend only."""
+    batch: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    for listing in listings:
+        if not listing.get("fingerprint"):
+            listing["fingerprint"] = make_fingerprint(listing)
+        batch[(listing["source"], str(listing["source_id"]))] = listing
+    if not batch:
+        return 0, 0
+    _sb.table("listings").upsert(list(batch.values()), on_conflict="source,source_id").execute()
+    return len(batch), 0
+
+
 def fetch_latest(limit: int = 10) -> list[dict]:
     resp = (
         _sb.table("listings")
@@ -1,11 +1,13 @@
 # engine/db/supabase_client.py
-import os, json, hashlib
-from typing import Optional, Dict, Any
+import os, json
+from typing import Optional, Dict, Any, Iterable, Set, Tuple
 from contextlib import contextmanager
 from datetime import datetime
 from urllib.parse import urlparse, urlunparse, parse_qsl, urlencode
 import psycopg
 
+from engine.db.dedup import make_fingerprint, normalize_text  # noqa: F401  (re-exported)
+
 DB_URL = os.getenv("SUPABASE_DB_URL")
 
 
@@ -77,78 +79,185 @@ def get_conn():
         masked = _mask_dsn(dsn)
         raise RuntimeError(f"Database connection failed for DSN: {masked}\n{msg}") from None
 
-def _band(n: Optional[int], step: int) -> str:
-    if n is None:
-        return ""
-    lo = (n // step) * step
-    return f"{lo}-{lo+step}"
-
-def normalize_text(s: Optional[str]) -> str:
-    return (s or "").strip().lower()
-
-def make_fingerprint(d: Dict[str, Any]) -> str:
-    parts = [
-        normalize_text(d.get("make")),
-        normalize_text(d.get("model")),
-        str(d.get("year") or ""),
-        _band(d.get("odometer"), 25000),
-        _band(d.get("price"), 2500),
-        normalize_text(d.get("variant")),
-        normalize_text(d.get("suburb") or d.get("postcode")),
-    ]
-    sha = hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()
-    return sha
+_LISTING_COLS = [
+    "source","source_id","source_url","fingerprint",
+    "make","model","variant","year","price","odometer",
+    "body","trans","fuel","engine","drive",
+    "state","postcode","suburb","lat","lng",
+    "media","seller","raw","status"
+]
+_JSON_COLS = ("media", "seller", "raw")
+# Record type for jsonb_to_recordset (must mirror _LISTING_COLS)
+_RECORDSET_TYPES = """
+  source text, source_id text, source_url text, fingerprint text,
+  make text, model text, variant text, year int, price int, odometer int,
+  body text, trans text, fuel text, engine text, drive text,
+  state text, postcode text, suburb text, lat double precision, lng double precision,
+  media jsonb, seller jsonb, raw jsonb, status text
+"""
+_UPDATE_COLS = [
+    "price","odometer","body","trans","fuel","engine","drive",
+    "state","postcode","suburb","lat","lng","media","seller","raw","status"
+]
+# Identity-ish columns a normal ingest never rewrites; re-parse runs may correct them
+_REPARSE_UPDATE_COLS = ["source_url","fingerprint","make","model","variant","year"]
 
-def upsert_listing(listing: Dict[str, Any]) -> None:
-    """Insert/update a normalized listing into Postgres."""
-    # Ensure required keys exist
-    required = ["source", "source_id", "source_url"]
-    for k in required:
-        if not listing.get(k):
-            raise ValueError(f"Missing required field: {k}")
-
-    # Compute fingerprint if absent
-    if not listing.get("fingerprint"):
-        listing["fingerprint"] = make_fingerprint(listing)
-
-    cols = [
-        "source","source_id","source_url","fingerprint",
-        "make","model","variant","year","price","odometer",
-        "body","trans","fuel","engine","drive",
-        "state","postcode","suburb","lat","lng",
-        "media","seller","raw","status"
-    ]
-    vals = [listing.get(c) for c in cols]
-    # JSON fields
-    for i, c in enumerate(cols):
-        if c in ("media","seller","raw") and vals[i] is not None and not isinstance(vals[i], str):
-            vals[i] = json.dumps(vals[i])
-
-    sql = f"""
-    insert into listings ({", ".join(cols)})
-    values ({", ".join(["%s"]*len(cols))})
+
+def _events_enabled() -> bool:
+    return os.getenv("LISTINGS_ENABLE_EVENTS", "").lower() in ("1", "true", "yes")
+
+
+def raw_table_enabled() -> bool:
+    """Store raw payloads in content-addressed listing_raw instead of listings.raw (see RUNBOOK)."""
+    return os.getenv("LISTINGS_ENABLE_RAW_TABLE", "").lower() in ("1", "true", "yes")
+
+
+# Hash of the canonical jsonb text, so the same payload always gets the same key
+_RAW_HASH_SQL = "encode(sha256(convert_to({0}::text, 'UTF8')), 'hex')"
+
+
+def _record_json(listing: Dict[str, Any]) -> str:
+    """One listing as a JSON object; JSON columns already given as text are spliced in as-is."""
+    plain = {c: listing.get(c) for c in _LISTING_COLS if c not in _JSON_COLS}
+    parts = [json.dumps(plain, default=str)[:-1]]
+    for c in _JSON_COLS:
+        v = listing.get(c)
+        if v is None:
+            text = "null"
+        elif isinstance(v, str):
+            text = v
+        else:
+            text = json.dumps(v, default=str)
+        parts.append(f',"{c}":{text}')
+    return "".join(parts) + "}"
+
+
+def _upsert_sql(with_events: bool, raw_table: bool = False, full_update: bool = False, prev_keys: bool = False) -> str:
+    input_cte = f"input as (select * from jsonb_to_recordset(%s::jsonb) as x({_RECORDSET_TYPES}))"
+    if raw_table:
+        # listings keeps only raw_hash (and the title for search); each distinct payload is written once
+        cols = [c for c in _LISTING_COLS if c != "raw"] + ["raw_hash", "title"]
+        updates = [c for c in _UPDATE_COLS if c != "raw"] + ["raw_hash", "title"]
+        input_cte += f""",
+    src as (
+      select i.*, {_RAW_HASH_SQL.format("i.raw")} as raw_hash, i.raw->>'title' as title from input i
+    ),
+    blobs as (
+      insert into listing_raw (hash, raw)
+      select distinct on (raw_hash) raw_hash, raw from src where raw_hash is not null
+      on conflict (hash) do nothing
+    )"""
+        src = "src"
+        clear_raw = "raw = null,\n      "
+    else:
+        cols, updates, src, clear_raw = list(_LISTING_COLS), list(_UPDATE_COLS), "input", ""
+    if full_update:
+        updates += _REPARSE_UPDATE_COLS
+    col_sql = ", ".join(cols)
+    update_sql = ",\n      ".join(f"{c} = excluded.{c}" for c in updates)
+    upsert = f"""
+    insert into listings ({col_sql})
+    select {col_sql} from {src}
     on conflict (source, source_id) do update set
-      price = excluded.price,
-      odometer = excluded.odometer,
-      body = excluded.body,
-      trans = excluded.trans,
-      fuel = excluded.fuel,
-      engine = excluded.engine,
-      drive = excluded.drive,
-      state = excluded.state,
-      postcode = excluded.postcode,
-      suburb = excluded.suburb,
-      lat = excluded.lat,
-      lng = excluded.lng,
-      media = excluded.media,
-      seller = excluded.seller,
-      raw = excluded.raw,
-      status = excluded.status,
-      last_seen = now();
+      {update_sql},
+      {clear_raw}last_seen = now()
+    returning id, source, source_id, price, status
+    """
+    # All CTEs share one snapshot, so `prev` sees the values from before this upsert
+    prev_cols = "l.source, l.source_id, l.price, l.status" + (", l.market_key" if prev_keys else "")
+    prev = f"""prev as (
+      select {prev_cols}
+      from listings l join input i on l.source = i.source and l.source_id = i.source_id
+    )"""
+    # Market segments the rows sat in before this upsert (so segments they left get refreshed too)
+    keys_sql = (
+        ", (select coalesce(array_agg(distinct market_key) filter (where market_key is not null), '{}') from prev) as prev_keys"
+        if prev_keys
+        else ""
+    )
+    if not with_events:
+        ctes = ",\n    ".join([input_cte] + ([prev] if prev_keys else []) + [f"up as ({upsert})"])
+        return f"""
+    with {ctes}
+    select (select count(*) from up) as upserted, 0 as events{keys_sql}
     """
+    return f"""
+    with {input_cte},
+    {prev},
+    up as ({upsert}),
+    ev as (
+      insert into listing_events (listing_id, kind, old_price, new_price, old_status, new_status)
+      select up.id, 'listed', null, up.price, null, up.status
+        from up left join prev p on p.source = up.source and p.source_id = up.source_id
+        where p.source is null
+      union all
+      select up.id, 'price', p.price, up.price, null, null
+        from up join prev p on p.source = up.source and p.source_id = up.source_id
+        where p.price is distinct from up.price
+      union all
+      select up.id, 'status', null, null, p.status, up.status
+        from up join prev p on p.source = up.source and p.source_id = up.source_id
+        where p.status is distinct from up.status
+      returning 1
+    )
+    select (select count(*) from up) as upserted, (select count(*) from ev) as events{keys_sql}
+    """
+
+
+def upsert_many(
+    listings: Iterable[Dict[str, Any]],
+    full_update: bool = False,
+    prev_market_keys: Optional[Set[str]] = None,
+) -> Tuple[int, int]:
+    """
+    Insert/update normalized listings in one set-based statement.
+
+    With LISTINGS_ENABLE_EVENTS=true, price/status changes (and first sightings)
+    are appended to listing_events in the same statement. ``full_update`` also
+    rewrites make/model/variant/year/url/fingerprint (re-parse runs). When
+    ``prev_market_keys`` is given, the market segments the existing rows were
+    in before the update are added to it (needs the market_key column).
+    Returns (upserted, events).
+    """
+    batch: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    for listing in listings:
+        for k in ("source", "source_id", "source_url"):
+            if not listing.get(k):
+                raise ValueError(f"Missing required field: {k}")
+        if not listing.get("fingerprint"):
+            listing["fingerprint"] = make_fingerprint(listing)
+        # ON CONFLICT cannot touch the same row twice in one statement; last one wins
+        batch[(listing["source"], str(listing["source_id"]))] = listing
+    if not batch:
+        return 0, 0
+    payload = "[" + ",".join(_record_json(l) for l in batch.values()) + "]"
     with get_conn() as conn:
         with conn.cursor() as cur:
-            cur.execute(sql, vals)
+            want_keys = prev_market_keys is not None
+            cur.execute(_upsert_sql(_events_enabled(), raw_table_enabled(), full_update, want_keys), (payload,))
+            result = cur.fetchone()
+            upserted, events = result[0], result[1]
+            if want_keys:
+                prev_market_keys.update(result[2] or [])
+    return int(upserted), int(events)
+
+
+def upsert_listing(listing: Dict[str, Any]) -> None:
+    """Insert/update a normalized listing into Postgres."""
+    upsert_many([listing])
+
+
+def fetch_listing_events(listing_id: Any, limit: int = 200) -> list[dict]:
+    sql = """
+      select kind, old_price, new_price, old_status, new_status, created_at
+      from listing_events
+      where listing_id = %s
+      order by created_at, id
+      limit %s
+    """
+    with get_conn() as conn, conn.cursor(row_factory=psycopg.rows.dict_row) as cur:
+        cur.execute(sql, (listing_id, limit))
+        return cur.fetchall()
 
 def fetch_latest(limit: int = 10) -> list[dict]:
     sql = """
@@ -20,6 +20,8 @@ from typing import Any, Dict, List, Optional, Tuple
 
 import httpx
 
+from engine.scraper import normalize as norm
+from engine.scraper.listing import Listing
 from engine.scraper.pipeline import save_many
 
 
@@ -110,8 +112,8 @@ def search_items(
         return data.get("itemSummaries", [])
 
 
-def normalize(item: Dict[str, Any]) -> Dict[str, Any]:
-    """Map eBay item summary to our canonical listing dict."""
+def normalize(item: Dict[str, Any]) -> Listing:
+    """Map eBay item summary to our canonical listing record."""
     item_id = item.get("itemId")
     url = item.get("itemWebUrl")
     if not item_id or not url:
@@ -157,42 +159,27 @@ def normalize(item: Dict[str, Any]) -> Dict[str, Any]:
             "feedbackScore": item["seller"].get("feedbackScore"),
         }
 
-    return {
-        "source": "ebay",
-        "source_id": item_id,
-        "source_url": url,
-        "make": None,
-        "model": None,
-        "variant": None,
-        "year": year,
-        "price": price_val,
-        "odometer": None,
-        "body": None,
-        "trans": None,
-        "fuel": None,
-        "engine": None,
-        "drive": None,
-        "state": state,
-        "postcode": loc.get("postalCode") if isinstance(loc, dict) else None,
-        "suburb": None,
-        "lat": None,
-        "lng": None,
-        "media": media,
-        "seller": seller,
-        "raw": item,
-        "status": "active",
-    }
+    return Listing(
+        "ebay",
+        item_id,
+        url,
+        raw=item,
+        year=year,
+        price=price_val,
+        state=state,
+        postcode=loc.get("postalCode") if isinstance(loc, dict) else None,
+        media=media,
+        seller=seller,
+    )
+
+
+norm.register_batch_normalizer("ebay_api", norm.make_batch_normalizer(normalize))
 
 
 def ingest(q: Optional[str], limit: int = 20) -> Dict[str, int]:
     """Fetch via API, normalize and save using pipeline. Returns counts."""
     items = search_items(q=q, limit=limit)
-    normalized = []
-    for it in items:
-        try:
-            normalized.append(normalize(it))
-        except Exception:
-            continue
-    saved = save_many(normalized)
-    return {"fetched": len(items), "normalized": len(normalized), "saved": saved}
+    res = norm.normalize_batch("ebay_api", items)
+    saved = save_many(res.rows)
+    return {"fetched": len(items), "normalized": res.ok, "saved": saved}
 
@@ -0,0 +1,155 @@
+"""
+Batched Discord webhook delivery over one shared aiohttp session.
+
+Embeds are queued and packed up to 10 per webhook message (Discord's limit,
+also capped at 6000 embed characters per message). A single sender drains the
+queue in order, waits out ``X-RateLimit-Reset-After`` when the bucket is
+empty, sleeps for ``retry_after`` on 429, and retries 5xx/network failures
+with exponential backoff.
+
+Usage:
+    async with WebhookDispatcher(url) as dispatcher:
+        for vehicle, embed in items:
+            dispatcher.enqueue(embed, item=vehicle)
+    dispatcher.delivered  # items whose embeds went out
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple
+
+import aiohttp
+
+MAX_EMBEDS_PER_MESSAGE = 10
+MAX_EMBED_CHARS_PER_MESSAGE = 6000
+
+
+def _embed_dict(embed: Any) -> Dict[str, Any]:
+    # discord.Embed and plain dict payloads are both accepted
+    return embed.to_dict() if hasattr(embed, "to_dict") else dict(embed)
+
+
+def _embed_chars(embed: Dict[str, Any]) -> int:
+    # Characters Discord counts towards the per-message total
+    n = len(embed.get("title") or "") + len(embed.get("description") or "")
+    n += len((embed.get("author") or {}).get("name") or "") + len((embed.get("footer") or {}).get("text") or "")
+    for field in embed.get("fields") or []:
+        n += len(field.get("name") or "") + len(field.get("value") or "")
+    return n
+
+
+def pack_embeds(embeds: List[Dict[str, Any]]) -> List[List[int]]:
+    """Group embed indices into messages of <=10 embeds and <=6000 characters."""
+    groups: List[List[int]] = []
+    current: List[int] = []
+    chars = 0
+    for i, embed in enumerate(embeds):
+        size = _embed_chars(embed)
+        if current and (len(current) >= MAX_EMBEDS_PER_MESSAGE or chars + size > MAX_EMBED_CHARS_PER_MESSAGE):
+            groups.append(current)
+            current, chars = [], 0
+        current.append(i)
+        chars += size
+    if current:
+        groups.append(current)
+    return groups
+
+
+class WebhookDispatcher:
+    def __init__(
+        self,
+        url: str,
+        username: Optional[str] = "Captain Hook",
+        max_retries: int = 4,
+        backoff: float = 1.0,
+        session: Optional[aiohttp.ClientSession] = None,
+    ) -> None:
+        self.url = url
+        self.username = username
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self._session = session
+        self._own_session = session is None
+        self._queue: List[Tuple[Dict[str, Any], Any]] = []
+        self._blocked_until = 0.0
+        self.delivered: List[Any] = []
+        self.failed: List[Any] = []
+        self.requests = 0
+
+    async def __aenter__(self) -> "WebhookDispatcher":
+        if self._session is None:
+            self._session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=30))
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        try:
+            if exc[0] is None:
+                await self.flush()
+        finally:
+            if self._own_session and self._session is not None:
+                await self._session.close()
+                self._session = None
+
+    def enqueue(self, embed: Any, item: Any = None) -> None:
+        self._queue.append((_embed_dict(embed), item))
+
+    async def flush(self) -> int:
+        """Send everything queued. Returns messages sent."""
+        queued, self._queue = self._queue, []
+        sent = 0
+        for group in pack_embeds([e for e, _ in queued]):
+            items = [queued[i][1] for i in group]
+            payload: Dict[str, Any] = {"embeds": [queued[i][0] for i in group]}
+            if self.username:
+                payload["username"] = self.username
+            if await self._post(payload):
+                self.delivered.extend(items)
+                sent += 1
+            else:
+                self.failed.extend(items)
+        return sent
+
+    async def _wait_for_bucket(self) -> None:
+        delay = self._blocked_until - asyncio.get_running_loop().time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def _note_rate_limit(self, headers: Any) -> None:
+        if headers.get("X-RateLimit-Remaining") == "0":
+            try:
+                reset_after = float(headers.get("X-RateLimit-Reset-After") or 0)
+            except ValueError:
+                reset_after = 0.0
+            self._blocked_until = asyncio.get_running_loop().time() + reset_after
+
+    async def _post(self, payload: Dict[str, Any]) -> bool:
+        assert self._session is not None, "use 'async with WebhookDispatcher(...)'"
+        attempt = 0
+        while attempt <= self.max_retries:
+            await self._wait_for_bucket()
+            self.requests += 1
+            try:
+                async with self._session.post(self.url, params={"wait": "true"}, json=payload) as resp:
+                    self._note_rate_limit(resp.headers)
+                    if resp.status == 429:
+                        # Rate limited: wait as told instead of backing off
+                        try:
+                            body = await resp.json(content_type=None)
+                        except Exception:
+                            body = {}
+                        retry_after = (body or {}).get("retry_after") or resp.headers.get("Retry-After") or 1
+                        self._blocked_until = asyncio.get_running_loop().time() + float(retry_after)
+                        attempt += 1
+                        continue
+                    if resp.status < 300:
+                        return True
+                    if resp.status < 500:
+                        print(f"webhook send rejected status={resp.status} body={(await resp.text())[:200]}")
+                        return False
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                print(f"webhook send error attempt={attempt + 1}: {e}")
+            attempt += 1
+            if attempt <= self.max_retries:
+                await asyncio.sleep(self.backoff * (2 ** (attempt - 1)))
+        return False
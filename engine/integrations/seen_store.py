@@ -0,0 +1,137 @@
+"""
+Keyed seen-set for webhook notifications and alerts (SQLite, rolling TTL).
+
+Each vehicle is keyed by its listing URL (falling back to vendor + id), so
+diffing a search result is one indexed lookup per row instead of comparing
+whole dicts against the previous run. Keys seen again have ``last_seen``
+refreshed; keys not seen for ``ttl_days`` expire and count as new if the
+listing reappears.
+
+Env:
+- WEBHOOK_SEEN_DB: SQLite path (default ``webhook_seen.sqlite3``)
+- WEBHOOK_SEEN_TTL_DAYS: rolling TTL in days (default 14)
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+_DAY = 86400
+# Stay well under SQLite's bound-parameter limit
+_CHUNK = 500
+
+
+def vehicle_key(vehicle: Dict[str, Any]) -> Optional[str]:
+    link = vehicle.get("link") or vehicle.get("url") or vehicle.get("source_url")
+    if link:
+        return str(link).strip()
+    ident = vehicle.get("source_id") or vehicle.get("ad_id") or vehicle.get("item_id")
+    if ident:
+        vendor = vehicle.get("vendor") or vehicle.get("source") or ""
+        return f"{str(vendor).lower()}:{ident}"
+    return None
+
+
+class SeenStore:
+    def __init__(self, path: Optional[str] = None, ttl_days: Optional[float] = None) -> None:
+        self.path = path or os.getenv("WEBHOOK_SEEN_DB", "webhook_seen.sqlite3")
+        if ttl_days is None:
+            ttl_days = float(os.getenv("WEBHOOK_SEEN_TTL_DAYS", "14"))
+        self.ttl = ttl_days * _DAY
+        self._conn = sqlite3.connect(self.path)
+        self._conn.execute("pragma journal_mode=wal")
+        self._conn.execute(
+            "create table if not exists seen (key text primary key, first_seen real not null, last_seen real not null)"
+        )
+        self._conn.execute("create index if not exists seen_last_seen on seen (last_seen)")
+        self._conn.commit()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> "SeenStore":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._conn.execute("select count(*) from seen").fetchone()[0]
+
+    def _live_keys(self, keys: List[str], now: float) -> set:
+        live = set()
+        cutoff = now - self.ttl
+        for i in range(0, len(keys), _CHUNK):
+            chunk = keys[i : i + _CHUNK]
+            marks = ",".join("?" * len(chunk))
+            rows = self._conn.execute(
+                f"select key from seen where last_seen >= ? and key in ({marks})", (cutoff, *chunk)
+            )
+            live.update(r[0] for r in rows)
+        return live
+
+    def new_keys(self, keys: Iterable[str], now: Optional[float] = None) -> List[str]:
+        """Keys not in the store (or expired), first occurrence only, in input order."""
+        now = time.time() if now is None else now
+        keys = list(keys)
+        live = self._live_keys(keys, now)
+        out: List[str] = []
+        for key in keys:
+            if key not in live:
+                live.add(key)
+                out.append(key)
+        return out
+
+    def mark_keys(self, keys: Iterable[str], now: Optional[float] = None) -> int:
+        """Record keys as seen (refreshing last_seen). Returns keys written."""
+        now = time.time() if now is None else now
+        unique = set(keys)
+        self._conn.executemany(
+            "insert into seen (key, first_seen, last_seen) values (?, ?, ?) "
+            "on conflict(key) do update set last_seen = excluded.last_seen",
+            [(k, now, now) for k in unique],
+        )
+        self._conn.commit()
+        return len(unique)
+
+    def filter_new(self, vehicles: Iterable[Dict[str, Any]], now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Vehicles whose key is not in the store (or has expired). Keyless rows count as new."""
+        rows = list(vehicles)
+        keys = [vehicle_key(v) for v in rows]
+        fresh = set(self.new_keys([k for k in keys if k], now))
+        out: List[Dict[str, Any]] = []
+        for vehicle, key in zip(rows, keys):
+            if key is None:
+                out.append(vehicle)
+            elif key in fresh:
+                fresh.discard(key)
+                out.append(vehicle)
+        return out
+
+    def mark(self, vehicles: Iterable[Dict[str, Any]], now: Optional[float] = None) -> int:
+        """Record vehicles as seen (refreshing last_seen). Returns keys written."""
+        return self.mark_keys((k for k in (vehicle_key(v) for v in vehicles) if k), now)
+
+    def prune(self, now: Optional[float] = None) -> int:
+        """Drop expired keys. Returns rows removed."""
+        now = time.time() if now is None else now
+        cur = self._conn.execute("delete from seen where last_seen < ?", (now - self.ttl,))
+        self._conn.commit()
+        return cur.rowcount
+
+    def import_legacy_json(self, path: str) -> int:
+        """Seed an empty store from the old vehicles_data.json so the first run doesn't resend everything."""
+        if len(self) or not os.path.exists(path):
+            return 0
+        try:
+            with open(path, "r") as fh:
+                data = json.load(fh)
+        except (OSError, json.JSONDecodeError):
+            return 0
+        if not isinstance(data, list):
+            return 0
+        return self.mark(v for v in data if isinstance(v, dict))
@@ -1,7 +1,4 @@
 import discord
-from discord import Webhook
-import aiohttp
-import json
 from scraper.src_scraper import search_by, request
 import os
 import asyncio
@@ -9,12 +6,14 @@ from colorama import init, Fore, Style
 import time
 from RideRadar.engine.storage.vendor_storage import manheim, pickles, gumtree
 from utils import *
+from .notify_dispatcher import WebhookDispatcher
+from .seen_store import SeenStore
 init()
 
-# Define the file to save the data
+# Legacy full-dump state file; only read once to seed the seen store
 DATA_FILE = 'vehicles_data.json'
 
-async def retrieve_and_send(url, previous_data, vehicle_make):
+async def retrieve_and_send(url, vehicle_make, store):
     # Retrieve data for vehicles
     if ' ' in vehicle_make:
         # Assume it's a specific search query
@@ -25,20 +24,14 @@ async def retrieve_and_send(url, previous_data, vehicle_make):
         search = search_by.vehicle_brand(vehicle_make)
         current_data = await search.search_by_brand()  # Call the correct method here
 
-    # Save the current data to the file with indentation and separators
-    with open(DATA_FILE, 'w') as file:
-        json.dump(current_data, file, indent=4, separators=(',', ': '))
-
-
-
-    # Compare current data with previous data
-    new_data = [vehicle for vehicle in current_data if vehicle not in previous_data]
+    # Keyed lookup against the seen store (URL / vendor id), not a full-dict list scan
+    new_data = store.filter_new(current_data)
 
     if new_data:
         write.console("green", "\nWebhooking new embeds...")
-        for vehicle in new_data:
-            async with aiohttp.ClientSession() as session:
-                webhook = Webhook.from_url(url, session=session)
+        # One session for the whole burst; embeds go out up to 10 per message
+        async with WebhookDispatcher(url, username="Captain Hook") as dispatcher:
+            for vehicle in new_data:
                 # Try new embed else run old embed
                 if vehicle["vendor"] == "Gumtree":
                     embed = discord.Embed(
@@ -96,10 +89,16 @@ async def retrieve_and_send(url, previous_data, vehicle_make):
                         embed.set_footer(text="If there's no image, I'm bandwidth restricted!")
 
 
-                await webhook.send(embed=embed, username="Captain Hook")
-        write.console("green", "New embeds sent.")
+                dispatcher.enqueue(embed, item=vehicle)
+        # Mark after sending so a failed delivery is retried on the next search
+        undelivered = set(map(id, dispatcher.failed))
+        store.mark(v for v in current_data if id(v) not in undelivered)
+        if dispatcher.failed:
+            write.console("red", f"{len(dispatcher.failed)} embeds failed to send; will retry next search.")
+        write.console("green", f"New embeds sent ({len(dispatcher.delivered)} in {dispatcher.requests} requests).")
         return True
     else:
+        store.mark(current_data)
         write.console("yellow", "No new data found.")
         write.console("yellow", "No embeds sent.")
         return False
@@ -111,19 +110,10 @@ async def run(vehicle_make):
         write.console("red", "DISCORD_WEBHOOK_URL is not set; skipping webhook send.")
         return False
 
-    # Load previous data from the file if available
-    try:
-        with open(DATA_FILE, 'r') as file:
-            try:
-                previous_data = json.load(file)
-            except json.JSONDecodeError:
-                # Handle invalid JSON data or empty file
-                previous_data = []
-    except FileNotFoundError:
-        # If the file doesn't exist, initialize previous data as an empty list
-        previous_data = []
-
-    result = await retrieve_and_send(url, previous_data, vehicle_make)
+    with SeenStore() as store:
+        store.import_legacy_json(DATA_FILE)
+        store.prune()
+        result = await retrieve_and_send(url, vehicle_make, store)
     return result
 
 
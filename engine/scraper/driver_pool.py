@@ -0,0 +1,134 @@
+"""
+Reusable Selenium WebDriver pool for the browser-driven vendors (Manheim, Pickles legacy).
+
+Starting Chrome costs seconds, so drivers are kept between runs in the same
+process. ``with driver() as d:`` borrows an idle driver, or starts one if
+fewer than SELENIUM_POOL_SIZE exist (default 1), and returns it afterwards. A
+driver that stopped responding is replaced. A driver is retired after
+SELENIUM_DRIVER_MAX_USES borrows (default 50) to bound browser memory growth.
+Remaining drivers are quit at exit.
+"""
+
+from __future__ import annotations
+
+import atexit
+import os
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+
+def _default_factory() -> Any:
+    from engine.scraper.common_utils import setup_chrome_driver
+
+    return setup_chrome_driver(headless=os.getenv("SELENIUM_HEADLESS", "true").lower() in ("1", "true", "yes"))
+
+
+def _alive(drv: Any) -> bool:
+    try:
+        drv.current_window_handle
+        return True
+    except Exception:
+        return False
+
+
+def _quit(drv: Any) -> None:
+    try:
+        drv.quit()
+    except Exception:
+        pass
+
+
+class DriverPool:
+    def __init__(
+        self,
+        factory: Optional[Callable[[], Any]] = None,
+        size: Optional[int] = None,
+        max_uses: Optional[int] = None,
+    ) -> None:
+        self.factory = factory or _default_factory
+        self.size = max(1, size if size is not None else int(os.getenv("SELENIUM_POOL_SIZE", "1")))
+        self.max_uses = max(1, max_uses if max_uses is not None else int(os.getenv("SELENIUM_DRIVER_MAX_USES", "50")))
+        self._cond = threading.Condition()
+        self._idle: List[Any] = []
+        self._uses: Dict[int, int] = {}
+        self._count = 0
+
+    def _take(self) -> Any:
+        with self._cond:
+            while not self._idle and self._count >= self.size:
+                self._cond.wait()
+            if self._idle:
+                return self._idle.pop()
+            self._count += 1
+        try:
+            drv = self.factory()
+        except BaseException:
+            with self._cond:
+                self._count -= 1
+                self._cond.notify()
+            raise
+        self._uses[id(drv)] = 0
+        return drv
+
+    def _retire(self, drv: Any) -> None:
+        _quit(drv)
+        with self._cond:
+            self._uses.pop(id(drv), None)
+            self._count -= 1
+            self._cond.notify()
+
+    @contextmanager
+    def driver(self) -> Iterator[Any]:
+        drv = self._take()
+        if not _alive(drv):
+            self._retire(drv)
+            drv = self._take()
+        self._uses[id(drv)] = self._uses.get(id(drv), 0) + 1
+        broken = False
+        try:
+            yield drv
+        except BaseException:
+            broken = not _alive(drv)
+            raise
+        finally:
+            if broken or self._uses.get(id(drv), 0) >= self.max_uses:
+                self._retire(drv)
+            else:
+                with self._cond:
+                    self._idle.append(drv)
+                    self._cond.notify()
+
+    def close(self) -> None:
+        with self._cond:
+            idle, self._idle = self._idle, []
+        for drv in idle:
+            self._retire(drv)
+
+
+_pool: Dict[str, Optional[DriverPool]] = {"pool": None}
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> DriverPool:
+    with _pool_lock:
+        if _pool["pool"] is None:
+            _pool["pool"] = DriverPool()
+        return _pool["pool"]
+
+
+@contextmanager
+def driver() -> Iterator[Any]:
+    """Borrow a Chrome driver from the process-wide pool."""
+    with get_pool().driver() as drv:
+        yield drv
+
+
+def close() -> None:
+    with _pool_lock:
+        pool, _pool["pool"] = _pool["pool"], None
+    if pool is not None:
+        pool.close()
+
+
+atexit.register(close)
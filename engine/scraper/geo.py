@@ -0,0 +1,138 @@
+"""
+Offline postcode/suburb centroids and distance helpers.
+
+Normalization backfills ``lat``/``lng`` from a centroid table when a vendor
+gives a postcode or suburb + state but no coordinates. The bundled
+``engine/res/postcode_centroids.csv`` only covers capitals and large regional
+centres. Point POSTCODE_CENTROIDS_CSV at a full Australian postcode file for
+real coverage. Column names are matched loosely: postcode, suburb/locality,
+state, lat/latitude, lng/long/longitude.
+"""
+
+from __future__ import annotations
+
+import csv
+import math
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, Mapping, Optional, Tuple
+
+_DEFAULT_CSV = Path(__file__).resolve().parents[1] / "res" / "postcode_centroids.csv"
+_EARTH_RADIUS_KM = 6371.0088
+
+LatLng = Tuple[float, float]
+
+_COLUMN_ALIASES = {
+    "postcode": ("postcode", "post_code", "postcodes"),
+    "suburb": ("suburb", "locality", "place_name", "name"),
+    "state": ("state", "state_code"),
+    "lat": ("lat", "latitude"),
+    "lng": ("lng", "long", "lon", "longitude"),
+}
+
+
+class Centroids:
+    """Postcode and (suburb, state) -> mean coordinates."""
+
+    def __init__(self, rows: Iterable[Mapping[str, Any]]) -> None:
+        by_postcode: Dict[str, list] = {}
+        by_suburb: Dict[Tuple[str, str], list] = {}
+        for r in rows:
+            try:
+                lat, lng = float(r["lat"]), float(r["lng"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            if not lat and not lng:
+                continue
+            pc = _postcode_key(r.get("postcode"))
+            if pc:
+                by_postcode.setdefault(pc, []).append((lat, lng))
+            suburb, state = _text_key(r.get("suburb")), _text_key(r.get("state"))
+            if suburb and state:
+                by_suburb.setdefault((suburb, state), []).append((lat, lng))
+        self.by_postcode = {k: _mean(v) for k, v in by_postcode.items()}
+        self.by_suburb = {k: _mean(v) for k, v in by_suburb.items()}
+
+    def __len__(self) -> int:
+        return len(self.by_postcode) + len(self.by_suburb)
+
+    def lookup(
+        self, postcode: Optional[str] = None, suburb: Optional[str] = None, state: Optional[str] = None
+    ) -> Optional[LatLng]:
+        """Suburb + state is tried first (tighter than a postcode), then postcode."""
+        sb, st = _text_key(suburb), _text_key(state)
+        if sb and st:
+            hit = self.by_suburb.get((sb, st))
+            if hit:
+                return hit
+        pc = _postcode_key(postcode)
+        return self.by_postcode.get(pc) if pc else None
+
+
+def _mean(points: list) -> LatLng:
+    return (
+        round(sum(p[0] for p in points) / len(points), 5),
+        round(sum(p[1] for p in points) / len(points), 5),
+    )
+
+
+def _postcode_key(v: Any) -> str:
+    digits = "".join(ch for ch in str(v or "") if ch.isdigit())
+    return digits.zfill(4) if 3 <= len(digits) <= 4 else ""
+
+
+def _text_key(v: Any) -> str:
+    return " ".join(str(v or "").upper().split())
+
+
+def _read_csv(path: Path) -> Iterable[Dict[str, Any]]:
+    with open(path, newline="", encoding="utf-8") as fh:
+        reader = csv.DictReader(fh)
+        header = {h.strip().lower(): h for h in reader.fieldnames or []}
+        cols = {
+            key: next((header[a] for a in aliases if a in header), None) for key, aliases in _COLUMN_ALIASES.items()
+        }
+        for row in reader:
+            yield {key: (row.get(src) if src else None) for key, src in cols.items()}
+
+
+@lru_cache(maxsize=1)
+def centroids() -> Centroids:
+    """Centroid table, loaded once per process."""
+    path = Path(os.getenv("POSTCODE_CENTROIDS_CSV") or _DEFAULT_CSV)
+    try:
+        return Centroids(_read_csv(path))
+    except OSError as e:
+        print(f"geo: centroid table unavailable ({path}): {e}")
+        return Centroids(())
+
+
+def backfill_coords(rows: Iterable[Any]) -> int:
+    """Fill missing lat/lng from postcode/suburb centroids in place. Returns the number filled."""
+    table = centroids()
+    if not len(table):
+        return 0
+    filled = 0
+    for r in rows:
+        if r.get("lat") is not None and r.get("lng") is not None:
+            continue
+        hit = table.lookup(r.get("postcode"), r.get("suburb"), r.get("state"))
+        if hit:
+            r["lat"], r["lng"] = hit
+            filled += 1
+    return filled
+
+
+def haversine_km(a: LatLng, b: LatLng) -> float:
+    lat1, lng1, lat2, lng2 = map(math.radians, (a[0], a[1], b[0], b[1]))
+    h = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    return 2 * _EARTH_RADIUS_KM * math.asin(math.sqrt(h))
+
+
+def bounding_box(center: LatLng, km: float) -> Tuple[float, float, float, float]:
+    """(min_lat, min_lng, max_lat, max_lng) enclosing a radius around center."""
+    lat, lng = center
+    dlat = math.degrees(km / _EARTH_RADIUS_KM)
+    dlng = math.degrees(km / (_EARTH_RADIUS_KM * max(math.cos(math.radians(lat)), 1e-6)))
+    return lat - dlat, lng - dlng, lat + dlat, lng + dlng
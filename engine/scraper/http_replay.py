@@ -0,0 +1,259 @@
+"""
+Record/replay HTTP layer for deterministic offline scraping runs.
+
+Usage:
+  python -m engine.scraper.orchestrator --vendor pickles --limit 20 --record runs/pickles.jsonl.gz
+  python -m engine.scraper.orchestrator --vendor pickles --limit 20 --replay runs/pickles.jsonl.gz
+
+The same can be selected with HTTP_REPLAY_MODE=record|replay and
+HTTP_REPLAY_ARCHIVE=<path>. Vendor modules pass ``transport()`` /
+``async_transport()`` to their httpx clients and call
+``install_playwright_routes(context)`` on Playwright contexts; both are
+no-ops when the layer is off. The same hooks feed the page archive
+(``page_archive``) when PAGE_ARCHIVE_DIR / ``--archive`` is set.
+
+The archive is gzip-compressed JSON lines, one exchange per line, keyed by
+method + URL. Repeated requests to the same key replay in recorded order and
+then keep serving the last response. In replay mode vendor throttling sleeps
+are skipped (see ``is_replay``) so whole sweeps run at full speed.
+"""
+
+from __future__ import annotations
+
+import atexit
+import base64
+import gzip
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+from engine.scraper import page_archive
+
+
+# Hop-by-hop / encoding headers that no longer describe the stored (decoded) body
+_DROP_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection"}
+# Playwright resource types that are never needed to parse listing tiles
+_PW_SKIP_TYPES = {"image", "media", "font"}
+
+_lock = threading.Lock()
+_state: Dict[str, Any] = {
+    "mode": None,  # None | "record" | "replay"
+    "path": None,
+    "recorded": [],
+    "replay": {},
+    "cursor": {},
+    "atexit": False,
+}
+
+
+def _key(method: str, url: str) -> Tuple[str, str]:
+    return method.upper(), str(url)
+
+
+def _load_archive(path: Path) -> Dict[Tuple[str, str], List[Dict[str, Any]]]:
+    entries: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+    with gzip.open(path, "rt", encoding="utf-8") as fh:
+        for line in fh:
+            line = line.strip()
+            if not line:
+                continue
+            rec = json.loads(line)
+            entries.setdefault(_key(rec["m"], rec["u"]), []).append(rec)
+    return entries
+
+
+def configure(mode: Optional[str], path: Optional[str]) -> None:
+    """Select record/replay mode for this process (mode=None turns the layer off)."""
+    mode = (mode or "").strip().lower() or None
+    if mode not in (None, "record", "replay"):
+        raise ValueError(f"unknown http replay mode: {mode}")
+    if mode and not path:
+        raise ValueError("http replay archive path is required")
+    with _lock:
+        _state.update({"mode": mode, "path": path, "recorded": [], "replay": {}, "cursor": {}})
+        if mode == "replay":
+            _state["replay"] = _load_archive(Path(path))
+        if mode == "record" and not _state["atexit"]:
+            atexit.register(flush)
+            _state["atexit"] = True
+
+
+def configure_from_env() -> None:
+    mode = os.getenv("HTTP_REPLAY_MODE")
+    if mode:
+        configure(mode, os.getenv("HTTP_REPLAY_ARCHIVE"))
+
+
+def mode() -> Optional[str]:
+    return _state["mode"]
+
+
+def is_replay() -> bool:
+    return _state["mode"] == "replay"
+
+
+def flush() -> int:
+    """Write recorded exchanges to the archive. Returns the number written."""
+    with _lock:
+        if _state["mode"] != "record" or not _state["recorded"]:
+            return 0
+        path = Path(_state["path"])
+        path.parent.mkdir(parents=True, exist_ok=True)
+        records = list(_state["recorded"])
+        with gzip.open(path, "wt", encoding="utf-8") as fh:
+            for rec in records:
+                fh.write(json.dumps(rec, separators=(",", ":")) + "\n")
+        return len(records)
+
+
+def _record(method: str, url: str, status: int, headers: List[Tuple[str, str]], body: bytes) -> None:
+    rec = {
+        "m": method.upper(),
+        "u": str(url),
+        "s": status,
+        "h": [[k, v] for k, v in headers if k.lower() not in _DROP_HEADERS],
+        "b": base64.b64encode(body).decode("ascii"),
+    }
+    with _lock:
+        _state["recorded"].append(rec)
+
+
+def _lookup(method: str, url: str) -> Optional[Dict[str, Any]]:
+    key = _key(method, url)
+    with _lock:
+        entries = _state["replay"].get(key)
+        if not entries:
+            return None
+        idx = _state["cursor"].get(key, 0)
+        _state["cursor"][key] = idx + 1
+        return entries[min(idx, len(entries) - 1)]
+
+
+def _replay_response(request: httpx.Request) -> httpx.Response:
+    rec = _lookup(request.method, str(request.url))
+    if rec is None:
+        raise httpx.ConnectError(f"replay miss: {request.method} {request.url}", request=request)
+    return httpx.Response(
+        rec["s"],
+        headers=[(k, v) for k, v in rec["h"]],
+        content=base64.b64decode(rec["b"]),
+        request=request,
+    )
+
+
+def _stored_response(request: httpx.Request, response: httpx.Response) -> httpx.Response:
+    headers = [(k, v) for k, v in response.headers.multi_items() if k.lower() not in _DROP_HEADERS]
+    if _state["mode"] == "record":
+        _record(request.method, str(request.url), response.status_code, headers, response.content)
+    page_archive.maybe_store(
+        request.method, str(request.url), response.status_code, response.headers.get("content-type"), response.content
+    )
+    return httpx.Response(response.status_code, headers=headers, content=response.content, request=request)
+
+
+class RecordReplayTransport(httpx.BaseTransport):
+    def __init__(self, inner: Optional[httpx.BaseTransport] = None, **transport_kw: Any) -> None:
+        self._inner = inner
+        self._transport_kw = transport_kw
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        if is_replay():
+            return _replay_response(request)
+        if self._inner is None:
+            self._inner = httpx.HTTPTransport(**self._transport_kw)
+        response = self._inner.handle_request(request)
+        try:
+            response.read()
+        finally:
+            response.close()
+        return _stored_response(request, response)
+
+    def close(self) -> None:
+        if self._inner is not None:
+            self._inner.close()
+
+
+class AsyncRecordReplayTransport(httpx.AsyncBaseTransport):
+    def __init__(self, inner: Optional[httpx.AsyncBaseTransport] = None, **transport_kw: Any) -> None:
+        self._inner = inner
+        self._transport_kw = transport_kw
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if is_replay():
+            return _replay_response(request)
+        if self._inner is None:
+            self._inner = httpx.AsyncHTTPTransport(**self._transport_kw)
+        response = await self._inner.handle_async_request(request)
+        try:
+            await response.aread()
+        finally:
+            await response.aclose()
+        return _stored_response(request, response)
+
+    async def aclose(self) -> None:
+        if self._inner is not None:
+            await self._inner.aclose()
+
+
+def transport(inner: Optional[httpx.BaseTransport] = None, **transport_kw: Any) -> Optional[httpx.BaseTransport]:
+    """
+    Transport for ``httpx.Client(transport=...)``; None leaves httpx defaults in place.
+
+    An explicit transport replaces the client's own pool, so pass the client's
+    ``limits``/``verify``/``http2``/``proxy`` settings here as ``transport_kw``;
+    they configure the real transport behind the record/archive layer.
+    """
+    if _state["mode"] is None and page_archive.active() is None:
+        return inner
+    return RecordReplayTransport(inner, **transport_kw)
+
+
+def async_transport(
+    inner: Optional[httpx.AsyncBaseTransport] = None, **transport_kw: Any
+) -> Optional[httpx.AsyncBaseTransport]:
+    """Async counterpart of ``transport``."""
+    if _state["mode"] is None and page_archive.active() is None:
+        return inner
+    return AsyncRecordReplayTransport(inner, **transport_kw)
+
+
+def install_playwright_routes(context: Any) -> None:
+    """Capture or serve Playwright traffic for a (sync API) browser context."""
+    if not is_replay():
+        page_archive.install_playwright_capture(context)
+    if _state["mode"] is None:
+        return
+
+    def handle(route: Any) -> None:
+        req = route.request
+        if req.resource_type in _PW_SKIP_TYPES:
+            if is_replay():
+                route.abort()
+            else:
+                route.continue_()
+            return
+        if is_replay():
+            rec = _lookup(req.method, req.url)
+            if rec is None:
+                route.abort()
+                return
+            route.fulfill(
+                status=rec["s"],
+                headers={k: v for k, v in rec["h"]},
+                body=base64.b64decode(rec["b"]),
+            )
+            return
+        resp = route.fetch()
+        body = resp.body()
+        headers = [(k, v) for k, v in resp.headers.items() if k.lower() not in _DROP_HEADERS]
+        _record(req.method, req.url, resp.status, headers, body)
+        route.fulfill(response=resp, body=body)
+
+    context.route("**/*", handle)
+
+
+configure_from_env()
@@ -0,0 +1,181 @@
+"""
+Compact in-memory record for normalized listings.
+
+Normalizers return ``Listing`` objects instead of dicts. Canonical columns
+are ``__slots__`` attributes, so a row carries no per-instance ``__dict__``
+and no key hashing. Vendor extras (``seats``, ``cylinders``,
+``sale_method``, ...) go in an ``extra`` dict that is only allocated when
+a vendor sets one. The raw vendor payload
+is held by reference and serialized to JSON only when a writer asks for
+``raw_json``; the result is cached.
+
+``Listing`` also supports dict-style access (``row["price"]``,
+``row.get("state")``, ``"sale_method" in row``) for callers written against
+the old dict rows.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
+
+
+# Canonical column order (matches the listings table)
+FIELDS: Tuple[str, ...] = (
+    "source",
+    "source_id",
+    "source_url",
+    "fingerprint",
+    "make",
+    "model",
+    "variant",
+    "year",
+    "price",
+    "odometer",
+    "body",
+    "trans",
+    "fuel",
+    "engine",
+    "drive",
+    "state",
+    "suburb",
+    "postcode",
+    "lat",
+    "lng",
+    "media",
+    "seller",
+    "raw",
+    "status",
+)
+_FIELD_SET = frozenset(FIELDS)
+# Columns omitted from to_dict() while unset, matching the old dict rows
+_OPTIONAL = frozenset({"fingerprint", "body", "trans", "fuel", "engine", "drive", "lat", "lng"})
+
+
+class Listing:
+    __slots__ = FIELDS + ("extra", "_raw_json")
+
+    def __init__(
+        self,
+        source: str,
+        source_id: str,
+        source_url: str,
+        *,
+        raw: Optional[Dict[str, Any]] = None,
+        status: str = "active",
+        **fields: Any,
+    ) -> None:
+        self.source = source
+        self.source_id = source_id
+        self.source_url = source_url
+        self.fingerprint = None
+        self.make = None
+        self.model = None
+        self.variant = None
+        self.year = None
+        self.price = None
+        self.odometer = None
+        self.body = None
+        self.trans = None
+        self.fuel = None
+        self.engine = None
+        self.drive = None
+        self.state = None
+        self.suburb = None
+        self.postcode = None
+        self.lat = None
+        self.lng = None
+        self.media: List[str] = []
+        self.seller: Dict[str, Any] = {}
+        self.raw = raw
+        self.status = status
+        self.extra: Optional[Dict[str, Any]] = None
+        self._raw_json: Optional[str] = None
+        for key, value in fields.items():
+            self[key] = value
+
+    # -- raw payload -------------------------------------------------------
+    @property
+    def raw_json(self) -> Optional[str]:
+        """JSON text of ``raw``, serialized on first use and cached."""
+        if self.raw is None:
+            return None
+        if self._raw_json is None:
+            self._raw_json = json.dumps(self.raw, separators=(",", ":"), default=str)
+        return self._raw_json
+
+    def set_raw(self, raw: Optional[Dict[str, Any]]) -> None:
+        self.raw = raw
+        self._raw_json = None
+
+    # -- dict compatibility ------------------------------------------------
+    def __getitem__(self, key: str) -> Any:
+        if key in _FIELD_SET:
+            return getattr(self, key)
+        if self.extra is None:
+            raise KeyError(key)
+        return self.extra[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key in _FIELD_SET:
+            if key == "raw":
+                self.set_raw(value)
+            else:
+                setattr(self, key, value)
+        elif self.extra is None:
+            self.extra = {key: value}
+        else:
+            self.extra[key] = value
+
+    def __contains__(self, key: object) -> bool:
+        return key in _FIELD_SET or (self.extra is not None and key in self.extra)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in _FIELD_SET:
+            value = getattr(self, key)
+            return default if value is None and default is not None else value
+        if self.extra is None:
+            return default
+        return self.extra.get(key, default)
+
+    def keys(self) -> Iterator[str]:
+        return iter(self.to_dict())
+
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        return iter(self.to_dict().items())
+
+    # -- conversion --------------------------------------------------------
+    def to_dict(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = {}
+        for key in FIELDS:
+            value = getattr(self, key)
+            if value is None and key in _OPTIONAL:
+                continue
+            out[key] = value
+        if self.extra:
+            out.update(self.extra)
+        return out
+
+    def to_row(self, *, raw_as_json: bool = False) -> Dict[str, Any]:
+        """Flat dict for DB writers; optionally with ``raw`` already JSON-encoded."""
+        out = self.to_dict()
+        if raw_as_json:
+            out["raw"] = self.raw_json
+        return out
+
+    @classmethod
+    def from_mapping(cls, data: Mapping[str, Any]) -> "Listing":
+        fields = dict(data)
+        return cls(fields.pop("source"), fields.pop("source_id"), fields.pop("source_url"), **fields)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Listing):
+            return self.to_dict() == other.to_dict()
+        if isinstance(other, Mapping):
+            return self.to_dict() == dict(other)
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]  # mutable record
+
+    def __repr__(self) -> str:
+        return f"Listing({self.to_dict()!r})"
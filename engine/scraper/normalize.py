@@ -1,10 +1,45 @@
 import os
 import re
-from typing import Any, Dict, Optional
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+try:  # optional: vectorized bounds checks for large batches
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is not a hard dependency
+    np = None
+
+from engine.scraper.geo import backfill_coords
+from engine.scraper.listing import Listing
 
 
 _BAD_GUESS_TOKENS = {"buy", "now", "price", "view", "photos", "more"}
 _PICKLES_BASE = "https://www.pickles.com.au"
+_AU_STATES = frozenset({"ACT", "NSW", "NT", "QLD", "SA", "TAS", "VIC", "WA"})
+_ODOMETER_MAX_KM = 2_000_000
+# Below this batch size building NumPy columns costs more than it saves
+_NUMPY_MIN_ROWS = 512
+
+# Hot-path patterns, compiled once at import
+_STATE_RE = re.compile(r"\b(ACT|NSW|NT|QLD|SA|TAS|VIC|WA)\b")
+_YEAR_RE = re.compile(r"\b(20\d{2}|19\d{2})\b")
+_TRAILING_TOKEN_RE = re.compile(r"([A-Za-z0-9_-]{8,})/?$")
+_PICKLES_DETAIL_RE = re.compile(r"/used/details/cars/[^/]+/[0-9A-Za-z-]+$")
+_PICKLES_ITEM_RE = re.compile(r"/cars/item/[^/?#]+/?$")
+_AUTOTRADER_ID_RE = re.compile(r"/car/(\d+)/")
+_NUMBER_RE = re.compile(r"(\d[\d,\.]*)")
+_GUESS_SPLIT_RE = re.compile(r"[-_/]")
+
+
+class _DigitsOnly(dict):
+    """str.translate table that keeps ASCII 0-9 and deletes everything else."""
+
+    def __missing__(self, key: int) -> None:
+        return None
+
+
+# Latin-1 is prefilled so common characters resolve without __missing__
+_DIGITS_ONLY = _DigitsOnly({cp: (cp if 48 <= cp <= 57 else None) for cp in range(256)})
 
 
 def _to_int(text: Any) -> Optional[int]:
@@ -16,17 +51,26 @@ def _to_int(text: Any) -> Optional[int]:
         except Exception:
             return None
     s = str(text)
-    digits = re.sub(r"[^0-9]", "", s)
+    if s.isascii() and s.isdigit():
+        return int(s)
+    digits = s.translate(_DIGITS_ONLY)
     return int(digits) if digits else None
 
 
 def _extract_trailing_token(url: str, fallback: str) -> str:
-    m = re.search(r"([A-Za-z0-9_-]{8,})/?$", url or "")
+    m = _TRAILING_TOKEN_RE.search(url or "")
     if m:
         return m.group(1)
     return fallback or "unknown"
 
 
+@lru_cache(maxsize=4096)
+def _state_in_text(text: str) -> Optional[str]:
+    """First AU state code in already-uppercased text (locations repeat a lot)."""
+    m = _STATE_RE.search(text)
+    return m.group(1) if m else None
+
+
 def _upper_state(s: Optional[str]) -> Optional[str]:
     if not s:
         return None
@@ -37,37 +81,31 @@ def _upper_state(s: Optional[str]) -> Optional[str]:
     return None
 
 
-def _canon_base(source: str, source_id: str, source_url: str, raw: Dict[str, Any]) -> Dict[str, Any]:
-    return {
-        "source": source,
-        "source_id": source_id,
-        "source_url": source_url,
-        "make": None,
-        "model": None,
-        "variant": None,
-        "year": None,
-        "price": None,
-        "odometer": None,
-        "state": None,
-        "suburb": None,
-        "postcode": None,
-        "media": [],
-        "seller": {},
-        "raw": raw,
-        "status": "active",
-    }
+def _canon_base(source: str, source_id: str, source_url: str, raw: Dict[str, Any]) -> Listing:
+    return Listing(source, source_id, source_url, raw=raw)
 
 
-def _format_guess(value: Optional[str]) -> Optional[str]:
-    if not value or not isinstance(value, str):
-        return None
-    parts = re.split(r"[-_/]", value.strip())
+@lru_cache(maxsize=4096)
+def _format_guess_cached(value: str) -> Optional[str]:
+    parts = _GUESS_SPLIT_RE.split(value.strip())
     cleaned = [p for p in parts if p and p.strip().lower() not in _BAD_GUESS_TOKENS]
     if not cleaned:
         return None
     return " ".join(w.capitalize() for w in cleaned)
 
 
+def _format_guess(value: Optional[str]) -> Optional[str]:
+    if not value or not isinstance(value, str):
+        return None
+    return _format_guess_cached(value)
+
+
+@lru_cache(maxsize=4096)
+def _title_slug(slug: str) -> str:
+    # "land-cruiser" -> "Land Cruiser"; make/model slugs are low-cardinality
+    return " ".join(w.capitalize() for w in slug.replace("-", " ").split())
+
+
 def _absolutize_url(url: Optional[str]) -> Optional[str]:
     if not url or not isinstance(url, str):
         return None
@@ -94,15 +132,16 @@ def _absolutize_media(media: Optional[list]) -> list:
     return absolutized
 
 
-def normalize_pickles(item: Dict[str, Any]) -> Dict[str, Any]:
+def _sale_method_column_enabled() -> bool:
+    return os.getenv("LISTINGS_ENABLE_SALE_METHOD_COLUMN", "").lower() in ("1", "true", "yes")
+
+
+def _pickles_fields(item: Dict[str, Any]) -> Listing:
     url = (item.get("url") or item.get("link") or "").strip()
     if not url:
         raise ValueError("missing source_url")
     # Hard guard: allow only real detail pages
-    if not (
-        re.search(r"/used/details/cars/[^/]+/[0-9A-Za-z-]+$", url)
-        or re.search(r"/cars/item/[^/?#]+/?$", url)
-    ):
+    if not (_PICKLES_DETAIL_RE.search(url) or _PICKLES_ITEM_RE.search(url)):
         raise ValueError("non-listing url")
     source = "pickles"
     source_id = item.get("source_id_guess") or _extract_trailing_token(url, (item.get("title") or ""))
@@ -112,7 +151,7 @@ def normalize_pickles(item: Dict[str, Any]) -> Dict[str, Any]:
     out = _canon_base(source, source_id, url, item)
     # Sale method passthrough (canonicalized)
     smap = {"buy_now": "buy_now", "auction": "auction", "proposed": "proposed", "tender": "tender"}
-    enable_sale_method = os.getenv("LISTINGS_ENABLE_SALE_METHOD_COLUMN", "").lower() in ("1", "true", "yes")
+    enable_sale_method = _sale_method_column_enabled()
     sm = item.get("sale_method")
     if isinstance(sm, str):
         sm_l = sm.strip().lower().replace(" ", "_")
@@ -130,12 +169,12 @@ def normalize_pickles(item: Dict[str, Any]) -> Dict[str, Any]:
     if item.get("year_guess"):
         try:
             yg = int(str(item["year_guess"]))
-            out["year"] = yg
+            out.year = yg
         except Exception:
             pass
-    m = re.search(r"\b(20\d{2}|19\d{2})\b", title)
+    m = _YEAR_RE.search(title)
     if m:
-        out["year"] = _to_int(m.group(1))
+        out.year = int(m.group(1))
 
     # Image/media (prefer list of images if present, else thumb)
     media_urls = []
@@ -143,68 +182,65 @@ def normalize_pickles(item: Dict[str, Any]) -> Dict[str, Any]:
         media_urls.extend(item["images"][:3])
     elif item.get("thumb"):
         media_urls.append(item["thumb"])
-    out["media"] = _absolutize_media(media_urls)
+    out.media = _absolutize_media(media_urls)
 
     odo_source = item.get("odometer_km")
     if odo_source is None:
         odo_source = item.get("odometer")
     if odo_source is not None:
-        out["odometer"] = _to_int(odo_source)
+        out.odometer = _to_int(odo_source)
 
     # Price if present (prefer explicit int)
     if item.get("price") is not None:
         try:
-            out["price"] = int(item["price"])  # already an int from hydrator
+            out.price = int(item["price"])  # already an int from hydrator
         except Exception:
             pass
-    if out.get("price") is None and item.get("price_str"):
-        out["price"] = _to_int(item["price_str"])
-    if out.get("price") is not None and not (500 <= out["price"] <= 500_000):
-        out["price"] = None
+    if out.price is None and item.get("price_str"):
+        out.price = _to_int(item["price_str"])
 
     # State/suburb from detail if provided; else from location token
     state_field = item.get("state")
     st_norm = _upper_state(state_field) if isinstance(state_field, str) else None
     if st_norm:
-        out["state"] = st_norm
-    loc_tok = (item.get("location") or "").upper()
-    sm_loc = re.search(r"\b(ACT|NSW|NT|QLD|SA|TAS|VIC|WA)\b", loc_tok)
-    if sm_loc:
-        out["state"] = sm_loc.group(1)
+        out.state = st_norm
+    loc_state = _state_in_text((item.get("location") or "").upper())
+    if loc_state:
+        out.state = loc_state
     # Fallback: sometimes in the title
-    if not out.get("state"):
-        sm = re.search(r"\b(ACT|NSW|NT|QLD|SA|TAS|VIC|WA)\b", title.upper())
-        if sm:
-            out["state"] = sm.group(1)
+    if not out.state:
+        m = _STATE_RE.search(title.upper())
+        if m:
+            out.state = m.group(1)
 
     # Suburb best effort
     sb = item.get("suburb") or None
     if isinstance(sb, str) and sb.strip():
-        out["suburb"] = sb.strip()
+        out.suburb = sb.strip()
 
     # Hydrated detail fields
     body_val = item.get("body_type") or item.get("body")
     if body_val:
-        out["body"] = str(body_val).strip()
+        out.body = str(body_val).strip()
     trans_val = item.get("transmission") or item.get("trans")
     if trans_val:
-        out["trans"] = str(trans_val).strip()
+        out.trans = str(trans_val).strip()
     fuel_val = item.get("fuel_type") or item.get("fuel")
     if fuel_val:
-        out["fuel"] = str(fuel_val).strip()
+        out.fuel = str(fuel_val).strip()
     engine_val = item.get("engine_size_l")
     if engine_val is None:
         engine_val = item.get("engine")
     if engine_val is not None:
         if isinstance(engine_val, (int, float)):
-            out["engine"] = f"{engine_val:g}L"
+            out.engine = f"{engine_val:g}L"
         else:
-            out["engine"] = str(engine_val).strip()
+            out.engine = str(engine_val).strip()
     drive_val = item.get("drivetrain") or item.get("drive")
     if drive_val:
-        out["drive"] = str(drive_val).strip()
+        out.drive = str(drive_val).strip()
     if item.get("variant"):
-        out["variant"] = str(item["variant"]).strip()
+        out.variant = str(item["variant"]).strip()
     if item.get("seats") is not None:
         out["seats"] = _to_int(item["seats"])
     if item.get("cylinders") is not None:
@@ -213,20 +249,22 @@ def normalize_pickles(item: Dict[str, Any]) -> Dict[str, Any]:
     # Make/model guesses
     mk_guess = _format_guess(item.get("make_guess"))
     if mk_guess:
-        out["make"] = mk_guess
+        out.make = mk_guess
     md_guess = _format_guess(item.get("model_guess"))
     if md_guess:
-        out["model"] = md_guess
+        out.model = md_guess
+    return out
+
 
-    if item.get("sale_method") is None and out.get("price") is not None:
+def _pickles_finalize(item: Dict[str, Any], out: Listing) -> None:
+    # Runs after bounds checks: only an in-range price implies Buy Now
+    if item.get("sale_method") is None and out.price is not None:
         item["sale_method"] = "buy_now"
-        if enable_sale_method and not out.get("sale_method"):
+        if _sale_method_column_enabled() and not out.get("sale_method"):
             out["sale_method"] = "buy_now"
 
-    return out
-
 
-def normalize_manheim(item: Dict[str, Any]) -> Dict[str, Any]:
+def _manheim_fields(item: Dict[str, Any]) -> Listing:
     url = (item.get("link") or item.get("url") or "").strip()
     if not url:
         raise ValueError("missing source_url")
@@ -236,19 +274,19 @@ def normalize_manheim(item: Dict[str, Any]) -> Dict[str, Any]:
         raise ValueError("missing source_id")
     out = _canon_base(source, source_id, url, item)
     title = item.get("title") or ""
-    m = re.search(r"\b(20\d{2}|19\d{2})\b", title)
+    m = _YEAR_RE.search(title)
     if m:
-        out["year"] = _to_int(m.group(1))
+        out.year = int(m.group(1))
     if item.get("img"):
-        out["media"] = [item["img"]]
+        out.media = [item["img"]]
     if item.get("odometer"):
-        out["odometer"] = _to_int(item["odometer"])
-    sm = re.search(r"\b(ACT|NSW|NT|QLD|SA|TAS|VIC|WA)\b", title.upper())
-    if sm:
-        out["state"] = sm.group(1)
+        out.odometer = _to_int(item["odometer"])
+    m = _STATE_RE.search(title.upper())
+    if m:
+        out.state = m.group(1)
     return out
 
-def normalize_autotrader(item: Dict[str, Any]) -> Dict[str, Any]:
+def _autotrader_fields(item: Dict[str, Any]) -> Listing:
     url = (item.get("url") or item.get("link") or "").strip()
     if not url:
         raise ValueError("missing source_url")
@@ -256,7 +294,7 @@ def normalize_autotrader(item: Dict[str, Any]) -> Dict[str, Any]:
     # Prefer ad_id field derived from URL path if available
     source_id = item.get("ad_id")
     if not source_id:
-        m = re.search(r"/car/(\d+)/", url)
+        m = _AUTOTRADER_ID_RE.search(url)
         source_id = m.group(1) if m else None
     if not source_id:
         raise ValueError("missing source_id")
@@ -266,44 +304,38 @@ def normalize_autotrader(item: Dict[str, Any]) -> Dict[str, Any]:
     # Year (plausible window)
     y = item.get("year_guess")
     if not y:
-        my = re.search(r"\b(19\d{2}|20\d{2})\b", title)
+        my = _YEAR_RE.search(title)
         y = my.group(1) if my else None
-    yr = _to_int(y) if y else None
-    if yr is not None:
-        from datetime import datetime
-        current = datetime.utcnow().year
-        if yr < 1980 or yr > current + 1:
-            yr = None
-    out["year"] = yr
+    out.year = _to_int(y) if y else None
     price_str = item.get("price_str")
     if price_str:
-        mprice = re.search(r"(\d[\d,\.]*)", price_str)
+        mprice = _NUMBER_RE.search(price_str)
         if mprice:
-            out["price"] = _to_int(mprice.group(1))
+            out.price = _to_int(mprice.group(1))
     if item.get("thumb"):
-        out["media"] = [item["thumb"]]
+        out.media = [item["thumb"]]
     mk = item.get("make_guess")
     md = item.get("model_guess")
     if isinstance(mk, str):
-        out["make"] = " ".join(w.capitalize() for w in mk.replace("-", " ").split())
+        out.make = _title_slug(mk)
     if isinstance(md, str):
-        out["model"] = " ".join(w.capitalize() for w in md.replace("-", " ").split())
+        out.model = _title_slug(md)
     # State from state_guess or location
     st = item.get("state_guess")
-    if isinstance(st, str) and re.match(r"^(ACT|NSW|NT|QLD|SA|TAS|VIC|WA)$", st.upper()):
-        out["state"] = st.upper()
+    st_up = st.upper() if isinstance(st, str) else None
+    if st_up in _AU_STATES:
+        out.state = st_up
     else:
-        loc = (item.get("location") or "").upper()
-        ms = re.search(r"\b(ACT|NSW|NT|QLD|SA|TAS|VIC|WA)\b", loc)
-        if ms:
-            out["state"] = ms.group(1)
+        loc_state = _state_in_text((item.get("location") or "").upper())
+        if loc_state:
+            out.state = loc_state
     # Require at least one useful field besides id/url
-    if not out.get("make") and not out.get("model") and out.get("price") is None:
+    if not out.make and not out.model and out.price is None:
         raise ValueError("insufficient fields")
     return out
 
 
-def normalize_gumtree(item: Dict[str, Any]) -> Dict[str, Any]:
+def _gumtree_fields(item: Dict[str, Any]) -> Listing:
     url = (item.get("link") or item.get("url") or "").strip()
     if not url:
         raise ValueError("missing source_url")
@@ -313,23 +345,22 @@ def normalize_gumtree(item: Dict[str, Any]) -> Dict[str, Any]:
         raise ValueError("missing source_id")
     out = _canon_base(source, source_id, url, item)
     title = item.get("title") or ""
-    m = re.search(r"\b(20\d{2}|19\d{2})\b", title)
+    m = _YEAR_RE.search(title)
     if m:
-        out["year"] = _to_int(m.group(1))
+        out.year = int(m.group(1))
     thumb = item.get("thumb") or item.get("img")
     if thumb:
-        out["media"] = [thumb]
+        out.media = [thumb]
     price_str = item.get("price_str") or item.get("price")
     if price_str:
-        out["price"] = _to_int(price_str)
-    loc = (item.get("location") or "").upper()
-    sm = re.search(r"\b(ACT|NSW|NT|QLD|SA|TAS|VIC|WA)\b", loc)
-    if sm:
-        out["state"] = sm.group(1)
+        out.price = _to_int(price_str)
+    loc_state = _state_in_text((item.get("location") or "").upper())
+    if loc_state:
+        out.state = loc_state
     return out
 
 
-def normalize_ebay(item: Dict[str, Any]) -> Dict[str, Any]:
+def _ebay_fields(item: Dict[str, Any]) -> Listing:
     url = (item.get("link") or item.get("url") or "").strip()
     if not url:
         raise ValueError("missing source_url")
@@ -340,16 +371,158 @@ def normalize_ebay(item: Dict[str, Any]) -> Dict[str, Any]:
         raise ValueError("missing source_id")
     out = _canon_base(source, source_id, url, item)
     title = item.get("title") or ""
-    m = re.search(r"\b(20\d{2}|19\d{2})\b", title)
+    m = _YEAR_RE.search(title)
     if m:
-        out["year"] = _to_int(m.group(1))
+        out.year = int(m.group(1))
     if item.get("img"):
-        out["media"] = [item["img"]]
+        out.media = [item["img"]]
     if item.get("price"):
-        out["price"] = _to_int(item["price"])
+        out.price = _to_int(item["price"])
     # try capture AU state from location string if present
-    loc = (item.get("location") or "").upper()
-    sm = re.search(r"\b(ACT|NSW|NT|QLD|SA|TAS|VIC|WA)\b", loc)
-    if sm:
-        out["state"] = sm.group(1)
+    loc_state = _state_in_text((item.get("location") or "").upper())
+    if loc_state:
+        out.state = loc_state
     return out
+
+
+_Bounds = Dict[str, Tuple[int, int]]
+
+
+class BatchResult(NamedTuple):
+    rows: List[Listing]
+    ok: int
+    err: int
+    errors: List[Tuple[Dict[str, Any], Exception]]
+
+
+def apply_bounds(rows: Sequence[Union[Listing, Dict[str, Any]]], bounds: _Bounds) -> Dict[str, int]:
+    """Null out numeric fields outside [lo, hi], column by column. Returns nulled counts per field."""
+    nulled: Dict[str, int] = {}
+    for field, (lo, hi) in bounds.items():
+        column = [r.get(field) for r in rows]
+        bad: Iterable[int]
+        if np is not None and len(rows) >= _NUMPY_MIN_ROWS:
+            try:
+                arr = np.array([np.nan if v is None else v for v in column], dtype=np.float64)
+            except (TypeError, ValueError, OverflowError):
+                arr = None
+            if arr is not None:
+                with np.errstate(invalid="ignore"):
+                    bad = np.flatnonzero((arr < lo) | (arr > hi)).tolist()
+            else:
+                bad = [i for i, v in enumerate(column) if v is not None and not (lo <= v <= hi)]
+        else:
+            bad = [i for i, v in enumerate(column) if v is not None and not (lo <= v <= hi)]
+        count = 0
+        for i in bad:
+            rows[i][field] = None
+            count += 1
+        if count:
+            nulled[field] = count
+    return nulled
+
+
+BatchNormalizer = Callable[[Sequence[Dict[str, Any]]], BatchResult]
+
+
+def make_batch_normalizer(
+    extract: Callable[[Dict[str, Any]], Listing],
+    bounds: Union[_Bounds, Callable[[], _Bounds], None] = None,
+    finalize: Optional[Callable[[Dict[str, Any], Listing], None]] = None,
+) -> BatchNormalizer:
+    """Build a batch normalizer: per-row extraction, column-wise bounds, lat/lng backfill, optional per-row finalize."""
+
+    def batch(rows: Sequence[Dict[str, Any]]) -> BatchResult:
+        raws: List[Dict[str, Any]] = []
+        out: List[Listing] = []
+        errors: List[Tuple[Dict[str, Any], Exception]] = []
+        for raw in rows:
+            try:
+                out.append(extract(raw))
+                raws.append(raw)
+            except Exception as exc:
+                errors.append((raw, exc))
+        if bounds and out:
+            apply_bounds(out, bounds() if callable(bounds) else bounds)
+        if out:
+            backfill_coords(out)
+        if finalize is not None:
+            for raw, row in zip(raws, out):
+                finalize(raw, row)
+        return BatchResult(out, len(out), len(errors), errors)
+
+    return batch
+
+
+_BATCH_NORMALIZERS: Dict[str, BatchNormalizer] = {}
+
+
+def register_batch_normalizer(vendor: str, fn: BatchNormalizer) -> BatchNormalizer:
+    _BATCH_NORMALIZERS[vendor.lower().strip()] = fn
+    return fn
+
+
+def get_batch_normalizer(vendor: str) -> Optional[BatchNormalizer]:
+    return _BATCH_NORMALIZERS.get((vendor or "").lower().strip())
+
+
+def normalize_batch(vendor: str, rows: Sequence[Dict[str, Any]]) -> BatchResult:
+    fn = get_batch_normalizer(vendor)
+    if fn is None:
+        raise ValueError(f"no normalizer for vendor: {vendor}")
+    return fn(rows)
+
+
+def normalize_many(vendor: str, rows: Iterable[Dict[str, Any]]) -> Tuple[List[Listing], int]:
+    """Normalize a batch of raw rows for one vendor. Returns (normalized, error_count)."""
+    res = normalize_batch(vendor, list(rows))
+    return res.rows, res.err
+
+
+def _autotrader_bounds() -> _Bounds:
+    return {"year": (1980, datetime.utcnow().year + 1)}
+
+
+_normalize_pickles_batch = register_batch_normalizer(
+    "pickles",
+    make_batch_normalizer(
+        _pickles_fields,
+        bounds={"price": (500, 500_000), "odometer": (0, _ODOMETER_MAX_KM)},
+        finalize=_pickles_finalize,
+    ),
+)
+_normalize_manheim_batch = register_batch_normalizer(
+    "manheim", make_batch_normalizer(_manheim_fields, bounds={"odometer": (0, _ODOMETER_MAX_KM)})
+)
+_normalize_autotrader_batch = register_batch_normalizer(
+    "autotrader", make_batch_normalizer(_autotrader_fields, bounds=_autotrader_bounds)
+)
+_normalize_gumtree_batch = register_batch_normalizer("gumtree", make_batch_normalizer(_gumtree_fields))
+_normalize_ebay_batch = register_batch_normalizer("ebay", make_batch_normalizer(_ebay_fields))
+
+
+def _single(batch: BatchNormalizer, item: Dict[str, Any]) -> Listing:
+    res = batch([item])
+    if res.errors:
+        raise res.errors[0][1]
+    return res.rows[0]
+
+
+def normalize_pickles(item: Dict[str, Any]) -> Listing:
+    return _single(_normalize_pickles_batch, item)
+
+
+def normalize_manheim(item: Dict[str, Any]) -> Listing:
+    return _single(_normalize_manheim_batch, item)
+
+
+def normalize_autotrader(item: Dict[str, Any]) -> Listing:
+    return _single(_normalize_autotrader_batch, item)
+
+
+def normalize_gumtree(item: Dict[str, Any]) -> Listing:
+    return _single(_normalize_gumtree_batch, item)
+
+
+def normalize_ebay(item: Dict[str, Any]) -> Listing:
+    return _single(_normalize_ebay_batch, item)
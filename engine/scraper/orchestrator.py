@@ -3,6 +3,7 @@ Minimal ingest orchestrator for a single vendor.
 
 Usage:
   python -m engine.scraper.orchestrator --vendor pickles --limit 10 [--dry-run]
+  python -m engine.scraper.orchestrator reparse --vendor pickles [--archive DIR] [--dry-run]   (see reparse.py)
 
 Default is commit mode (persists via pipeline.save_normalized according to DB_BACKEND).
 """
@@ -15,12 +16,14 @@ import re
 import sys
 import time
 from collections import Counter
-from typing import Callable, Dict, List, Optional, Tuple
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from pathlib import Path
 
 from engine.runtime.vendor_status import mark_success, mark_error
+from engine.scraper import http_replay, page_archive, parse_pool
 from engine.scraper import normalize as norm
-from engine.scraper.pipeline import save_normalized, save_many
+from engine.scraper.pipeline import on_batch_saved, save_normalized, save_many
 
 
 def _pickles_compute_buy_method(
@@ -92,15 +95,66 @@ def _load_scraper(vendor: str) -> Tuple[Callable, Dict]:
     raise ValueError(f"Unknown vendor: {vendor}")
 
 
-_NORMALIZERS = {
-    "pickles": norm.normalize_pickles,
-    "manheim": norm.normalize_manheim,
-    "gumtree": norm.normalize_gumtree,
-    "ebay": norm.normalize_ebay,
-}
+def _streaming_sink(vendor: str, args: argparse.Namespace, totals: Counter) -> Callable[[int, List[Dict[str, Any]]], None]:
+    """``on_page`` callback: normalize (and save) each result page while later pages download."""
+
+    def on_page(page: int, page_rows: List[Dict[str, Any]]) -> None:
+        res = norm.normalize_batch(vendor, page_rows)
+        totals["normalized_ok"] += res.ok
+        totals["normalized_err"] += res.err
+        if not args.dry_run and res.rows:
+            totals["upserted"] += save_many(res.rows)
+        elif args.dry_run:
+            for row in res.rows[: max(0, 3 - totals["printed"])]:
+                print(row.to_row())
+                totals["printed"] += 1
+
+    return on_page
+
+
+def _print_paged_summary(
+    vendor: str,
+    fetched: int,
+    totals: Counter,
+    stats: Dict[str, int],
+    stat_keys: Tuple[str, ...],
+    error: Optional[Exception] = None,
+) -> None:
+    parts = [
+        f"summary vendor={vendor} fetched={fetched}",
+        f"normalized_ok={totals['normalized_ok']} normalized_err={totals['normalized_err']} upserted={totals['upserted']}",
+    ]
+    if error is None:
+        parts.extend(f"{k}={stats.get(k, 0)}" for k in stat_keys)
+    parts.append(f"backend={os.getenv('DB_BACKEND','?')} mode=httpx")
+    if error is not None:
+        parts.append(f"error={error}")
+    print(" ".join(parts))
+
+
+def _run_paged(vendor: str, search: Callable[..., Tuple[List[Dict[str, Any]], Dict[str, int]]], args: argparse.Namespace, stat_keys: Tuple[str, ...]) -> int:
+    """Run a page-streaming HTTPX search (``search(on_page=...)``), record vendor status and print the summary."""
+    totals: Counter = Counter()
+    try:
+        rows_raw, stats = search(on_page=_streaming_sink(vendor, args, totals))
+    except Exception as e:
+        mark_error(vendor, str(e))
+        _print_paged_summary(vendor, 0, Counter(), {}, stat_keys, error=e)
+        return 2
+    if totals["upserted"] > 0:
+        mark_success(vendor)
+    else:
+        mark_error(vendor, "no results")
+    _print_paged_summary(vendor, len(rows_raw), totals, stats, stat_keys)
+    return 0
 
 
 def main(argv: List[str] | None = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == "reparse":
+        from engine.scraper import reparse
+
+        return reparse.main(argv[1:])
     p = argparse.ArgumentParser(description="Vendor ingest orchestrator")
     p.add_argument("--vendor", required=True, help="pickles|manheim|gumtree|ebay")
     p.add_argument("--limit", type=int, default=10, help="Max items to process")
@@ -109,9 +163,13 @@ def main(argv: List[str] | None = None) -> int:
     p.add_argument("--state", type=str, default=None, help="Optional AU state filter (gumtree/pickles)")
     p.add_argument("--debug", action="store_true", help="Vendor debug mode (e.g., save snapshots)")
     p.add_argument("--force-pw", action="store_true", help="Gumtree: force Playwright and skip HTTPX")
-    p.add_argument("--pw-storage", type=str, default=None, help="Gumtree: optional Playwright storage_state path (cookies/session)")
+    p.add_argument("--pw-storage", type=str, default=None, help="Gumtree: Playwright storage_state path for cookies/session (default <PW_PROFILE_DIR>/storage_state.json)")
     p.add_argument("--assist", action="store_true", help="Gumtree: manual assist prompt when using Playwright")
     p.add_argument("--dry-run", action="store_true", help="Print first 3 normalized objects instead of saving")
+    rr = p.add_mutually_exclusive_group()
+    rr.add_argument("--record", type=str, default=None, metavar="ARCHIVE", help="Capture all vendor HTTP traffic into ARCHIVE (.jsonl.gz)")
+    rr.add_argument("--replay", type=str, default=None, metavar="ARCHIVE", help="Serve vendor HTTP traffic from ARCHIVE; no network, no throttling")
+    p.add_argument("--archive", type=str, default=None, metavar="DIR", help="Keep every fetched page compressed in DIR for later re-parsing (PAGE_ARCHIVE_DIR)")
     # Pickles-specific flags
     p.add_argument("--query", type=str, default=None, help="Pickles: free-text search query")
     p.add_argument("--page", type=int, default=1, help="Pickles: page number")
@@ -122,7 +180,8 @@ def main(argv: List[str] | None = None) -> int:
     p.add_argument("--double-encode-filter", action="store_true", help="Pickles: double-encode filter value (rare)")
     p.add_argument("--hydrate-details", dest="hydrate_details", action="store_true", help="Pickles: fetch detail pages to fill title/price if missing")
     p.add_argument("--hydrate-concurrency", type=int, default=4, help="Pickles: max concurrent detail fetches (default 4)")
-    p.add_argument("--pages", "--max-pages", dest="pages", type=int, default=1, help="Pickles: max search result pages to walk (default 1)")
+    p.add_argument("--parse-workers", type=int, default=None, help="Processes parsing fetched pages (PARSE_WORKERS; default CPU count, 0 = inline)")
+    p.add_argument("--pages", "--max-pages", dest="pages", type=int, default=1, help="Pickles/Autotrader/Manheim/Gumtree: max search result pages to walk (default 1; Gumtree walks at least 2)")
     p.add_argument("--buy-method", choices=["any", "buy_now"], default=None, help="Pickles: buy method filter (default: buy_now if require-price else any)")
     p.add_argument("--require-price", dest="require_price", action="store_true", help="Pickles: require numeric price (default)")
     p.add_argument("--no-require-price", dest="require_price", action="store_false", help="Pickles: allow missing price")
@@ -140,6 +199,15 @@ def main(argv: List[str] | None = None) -> int:
     p.add_argument("--max-price", type=int, default=None, help="Pickles: drop vehicles more expensive than this price")
     args = p.parse_args(argv)
 
+    if args.record:
+        http_replay.configure("record", args.record)
+    elif args.replay:
+        http_replay.configure("replay", args.replay)
+    if args.archive:
+        page_archive.configure(args.archive)
+    if args.parse_workers is not None:
+        parse_pool.configure(args.parse_workers)
+
     vendor = args.vendor.lower().strip()
     limit = max(1, int(args.limit))
 
@@ -149,43 +217,17 @@ def main(argv: List[str] | None = None) -> int:
             f"autotrader run make='{args.make}' model='{args.model}' state='{args.state}' limit={limit} debug={args.debug}"
         )
         from engine.scraper.vendors import autotrader_http as at
-        try:
-            url = at.build_search_url(args.make, args.model, args.state, page=1)
-            html = at.fetch_html(url)
-            if args.debug:
-                snap_dir = Path(__file__).resolve().parents[1] / "storage" / "snapshots"
-                snap_dir.mkdir(parents=True, exist_ok=True)
-                (snap_dir / "autotrader_page1.html").write_text(html, encoding="utf-8")
-            rows_raw = at.parse_list(html, limit=limit, debug=args.debug)
-        except Exception as e:
-            mark_error("autotrader", str(e))
-            print(
-                f"summary vendor=autotrader fetched=0 normalized_ok=0 normalized_err=0 upserted=0 backend={os.getenv('DB_BACKEND','?')} mode=httpx error={e}"
-            )
-            return 2
-        # Normalize
-        n_ok = 0
-        n_err = 0
-        normalized: List[dict] = []
-        for r in rows_raw:
-            try:
-                n = norm.normalize_autotrader(r)
-                normalized.append(n)
-                n_ok += 1
-            except Exception:
-                n_err += 1
-        upserted = 0
-        if not args.dry_run:
-            upserted = save_many(normalized)
-        if upserted > 0:
-            mark_success("autotrader")
-        else:
-            mark_error("autotrader", "no results")
-        print(
-            f"summary vendor=autotrader fetched={len(rows_raw)} normalized_ok={n_ok} normalized_err={n_err} "
-            f"upserted={upserted} backend={os.getenv('DB_BACKEND','?')} mode=httpx"
-        )
-        return 0
+
+        search = partial(at.search_autotrader, args.make, args.model, args.state, pages=args.pages, limit=limit, debug=args.debug)
+        return _run_paged("autotrader", search, args, ("pages_walked", "dropped_duplicate"))
+
+    # Manheim branch: HTTPX, SSR (MANHEIM_USE_SELENIUM=true keeps the browser scraper below)
+    if vendor == "manheim" and os.getenv("MANHEIM_USE_SELENIUM", "").lower() not in ("1", "true", "yes"):
+        print(f"manheim run make='{args.make}' limit={limit} debug={args.debug}")
+        from engine.scraper.vendors import manheim_http as mh
+
+        search = partial(mh.search_manheim, args.make, pages=args.pages, limit=limit, debug=args.debug)
+        return _run_paged("manheim", search, args, ("pages_walked", "dropped_duplicate", "stalled_pages"))
 
     # Pickles branch: HTTPX, SSR
     if vendor == "pickles":
@@ -341,25 +383,18 @@ def main(argv: List[str] | None = None) -> int:
         drop_counters["enquire_unpriced"] = sum(
             1 for r in rows_raw if (r.get("sale_method") or "").lower() == "enquire" and not r.get("price")
         )
-        n_ok = 0
-        n_err = 0
-        normalized = []
-        for r in rows_raw:
-            try:
-                n = norm.normalize_pickles(r)
-                normalized.append(n)
-                n_ok += 1
-            except Exception as exc:
-                n_err += 1
-                drop_counters["dropped_normalize_error"] += 1
-                if args.debug:
-                    print(f"DEBUG pickles drop[normalize_error]: url={r.get('url')} error={exc}")
-        n_ok = len(normalized)
+        res = norm.normalize_batch("pickles", rows_raw)
+        normalized = res.rows
+        n_ok, n_err = res.ok, res.err
+        drop_counters["dropped_normalize_error"] += res.err
+        if args.debug:
+            for r, exc in res.errors:
+                print(f"DEBUG pickles drop[normalize_error]: url={r.get('url')} error={exc}")
 
         upserted = 0
         if args.dry_run:
             for n in normalized[:3]:
-                print(n)
+                print(n.to_row())
         else:
             upserted = save_many(normalized)
         if upserted > 0:
@@ -451,22 +486,16 @@ def main(argv: List[str] | None = None) -> int:
                         timeout=20000,
                         debug_html_path=debug_path,
                         assist=args.assist,
+                        storage_state=args.pw_storage,
                     )
                 except Exception as e:
                     mark_error(vendor, f"playwright error: {e}")
                     print(f"summary vendor=gumtree fetched=0 normalized_ok=0 normalized_err=0 upserted=0 backend={os.getenv('DB_BACKEND','postgres')} mode=playwright")
                     return 2
                 fetched = len(rows)
-                n_ok = 0
-                n_err = 0
-                normalized: List[dict] = []
-                for it in rows:
-                    try:
-                        n = norm.normalize_gumtree(it)
-                        normalized.append(n)
-                        n_ok += 1
-                    except Exception:
-                        n_err += 1
+                res = norm.normalize_batch("gumtree", rows)
+                normalized = res.rows
+                n_ok, n_err = res.ok, res.err
                 upserted = save_many(normalized)
                 if upserted > 0:
                     mark_success(vendor)
@@ -484,8 +513,9 @@ def main(argv: List[str] | None = None) -> int:
                 "model": args.model,
                 "state": args.state,
                 "limit": limit,
-                "page_limit": 2,
+                "page_limit": max(2, args.pages),
                 "debug": args.debug,
+                "pw_storage": args.pw_storage,
             })
         if vendor == "ebay" and os.getenv("USE_EBAY_API", "").lower() in ("1", "true", "yes"):
             q = " ".join(x for x in [args.make, args.model] if x)
@@ -510,30 +540,23 @@ def main(argv: List[str] | None = None) -> int:
             mark_error(vendor, "no results (HTTPX)")
         else:
             mark_error(vendor, "no results")
-    norm_ok = 0
-    norm_err = 0
     upserted = 0
 
+    norm_key = vendor
     if vendor == "ebay" and os.getenv("USE_EBAY_API", "").lower() in ("1", "true", "yes"):
-        from engine.integrations.ebay_api import normalize as normalizer  # type: ignore
-    else:
-        normalizer = _NORMALIZERS.get(vendor)
-    if not normalizer:
+        from engine.integrations import ebay_api  # noqa: F401  (registers the "ebay_api" normalizer)
+        norm_key = "ebay_api"
+    if norm.get_batch_normalizer(norm_key) is None:
         print(f"warning: no normalizer for {vendor}; skipping")
         return 0
 
-    normalized: List[dict] = []
-    for it in items:
-        try:
-            n = normalizer(it)
-            normalized.append(n)
-            norm_ok += 1
-        except Exception:
-            norm_err += 1
+    res = norm.normalize_batch(norm_key, items)
+    normalized = res.rows
+    norm_ok, norm_err = res.ok, res.err
 
     if args.dry_run:
         for n in normalized[:3]:
-            print(n)
+            print(n.to_row())
         print(
             f"summary vendor={vendor} fetched={fetched} normalized_ok={norm_ok} normalized_err={norm_err} upserted=0 backend={os.getenv('DB_BACKEND','postgres')}"
         )
@@ -541,13 +564,16 @@ def main(argv: List[str] | None = None) -> int:
 
     # Commit path: save via pipeline
     success = False
+    saved = []
     for n in normalized:
         try:
             save_normalized(n)
+            saved.append(n)
             upserted += 1
             success = True
         except Exception as e:
             print(f"upsert error: {e}")
+    on_batch_saved(saved)
 
     if success and upserted > 0 or fetched > 0:
         mark_success(vendor)
@@ -0,0 +1,312 @@
+"""
+Append-only archive of fetched pages, for re-parsing history without re-fetching.
+
+Opt in with PAGE_ARCHIVE_DIR=<dir> (or ``--archive <dir>`` on the
+orchestrator). Every successful HTML/JSON GET that goes through the shared
+httpx transports (``http_replay.transport()``), plus Playwright document
+responses, is stored as one independently compressed record:
+
+  <dir>/seg-000001.bin   concatenated compressed bodies, rotated at PAGE_ARCHIVE_SEGMENT_MB (default 256)
+  <dir>/index.tsv        one line per page: fetched_at, segment, offset, length, codec, status, content type, url
+
+Bodies use zstd when the ``zstandard`` package is installed, otherwise zlib;
+the codec is recorded per record, so archives stay readable either way.
+Readers memory-map segments and slice records straight out of them.
+
+  python -m engine.scraper.page_archive <dir> --stats
+  python -m engine.scraper.page_archive <dir> --get <url> > page.html
+"""
+
+from __future__ import annotations
+
+import argparse
+import mmap
+import os
+import sys
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+try:  # optional: better ratio and much faster decompression than zlib
+    import zstandard
+except ImportError:  # pragma: no cover - zstandard is optional
+    zstandard = None
+
+_INDEX = "index.tsv"
+_ARCHIVED_TYPES = ("text/html", "application/json", "application/xhtml", "text/plain")
+
+
+class Entry(NamedTuple):
+    fetched_at: float
+    segment: int
+    offset: int
+    length: int
+    codec: str
+    status: int
+    content_type: str
+    url: str
+
+
+def _segment_name(n: int) -> str:
+    return f"seg-{n:06d}.bin"
+
+
+def _compress(body: bytes) -> Tuple[str, bytes]:
+    if zstandard is not None:
+        return "zstd", zstandard.ZstdCompressor(level=6).compress(body)
+    return "zlib", zlib.compress(body, 6)
+
+
+def _decompress(codec: str, data: bytes) -> bytes:
+    if codec == "zlib":
+        return zlib.decompress(data)
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("archive record is zstd-compressed; pip install zstandard to read it")
+        return zstandard.ZstdDecompressor().decompress(data)
+    raise ValueError(f"unknown archive codec: {codec}")
+
+
+class PageArchive:
+    """Writer and reader over one archive directory (thread-safe)."""
+
+    def __init__(self, root: str, segment_bytes: Optional[int] = None) -> None:
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        if segment_bytes is None:
+            segment_bytes = int(float(os.getenv("PAGE_ARCHIVE_SEGMENT_MB", "256")) * 1024 * 1024)
+        self.segment_bytes = segment_bytes
+        self._lock = threading.Lock()
+        self._entries: List[Entry] = []
+        self._by_url: Dict[str, List[int]] = {}
+        self._maps: Dict[int, Tuple[Any, mmap.mmap]] = {}
+        self._index_size = 0
+        self._load_index()
+        self._segment = max((e.segment for e in self._entries), default=1)
+        self._seg_fh: Optional[Any] = None
+        self._index_fh: Optional[Any] = None
+
+    # -- index ---------------------------------------------------------
+    def _load_index(self) -> None:
+        path = self.root / _INDEX
+        if not path.exists():
+            return
+        with open(path, "rb") as fh:
+            fh.seek(self._index_size)
+            data = fh.read()
+        # Ignore a torn last line from a crashed writer
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].decode("utf-8", errors="replace").splitlines():
+            parts = line.split("\t", 7)
+            if len(parts) != 8:
+                continue
+            ts, seg, off, length, codec, status, ctype, url = parts
+            try:
+                e = Entry(float(ts), int(seg), int(off), int(length), codec, int(status), ctype, url)
+            except ValueError:
+                # Torn line left by a crashed writer (terminated on the next append)
+                continue
+            self._by_url.setdefault(e.url, []).append(len(self._entries))
+            self._entries.append(e)
+        self._index_size += end
+
+    def refresh(self) -> None:
+        """Pick up entries appended by other processes."""
+        with self._lock:
+            self._load_index()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # -- writing -------------------------------------------------------
+    def _open_for_append(self) -> None:
+        seg_path = self.root / _segment_name(self._segment)
+        if self._seg_fh is None:
+            self._seg_fh = open(seg_path, "ab")
+        if self._index_fh is None:
+            self._load_index()
+            self._index_fh = open(self.root / _INDEX, "ab")
+            size = self._index_fh.tell()
+            if size > self._index_size:
+                # A crashed writer left a partial last line; end it so our first record starts on its own line
+                self._index_fh.write(b"\n")
+                self._index_fh.flush()
+                self._index_size = size + 1
+
+    def put(
+        self, url: str, body: bytes, status: int = 200, content_type: str = "", fetched_at: Optional[float] = None
+    ) -> Entry:
+        codec, data = _compress(body)
+        ts = time.time() if fetched_at is None else fetched_at
+        ctype = (content_type or "").split(";")[0].strip()
+        safe_url = url.replace("\t", "%09").replace("\n", "%0A")
+        with self._lock:
+            self._open_for_append()
+            offset = self._seg_fh.tell()
+            if offset and offset + len(data) > self.segment_bytes:
+                self._seg_fh.close()
+                self._segment += 1
+                self._seg_fh = open(self.root / _segment_name(self._segment), "ab")
+                offset = 0
+            self._seg_fh.write(data)
+            self._seg_fh.flush()
+            entry = Entry(ts, self._segment, offset, len(data), codec, int(status), ctype, safe_url)
+            line = "\t".join(str(v) for v in entry) + "\n"
+            self._index_fh.write(line.encode("utf-8"))
+            self._index_fh.flush()
+            self._index_size += len(line.encode("utf-8"))
+            self._by_url.setdefault(entry.url, []).append(len(self._entries))
+            self._entries.append(entry)
+        return entry
+
+    # -- reading -------------------------------------------------------
+    def _view(self, segment: int, end: int) -> mmap.mmap:
+        cached = self._maps.get(segment)
+        if cached is not None and len(cached[1]) >= end:
+            return cached[1]
+        if cached is not None:
+            # The segment grew since it was mapped (we are still appending to it)
+            cached[1].close()
+            cached[0].close()
+        fh = open(self.root / _segment_name(segment), "rb")
+        mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        self._maps[segment] = (fh, mm)
+        return mm
+
+    def read(self, entry: Entry) -> bytes:
+        with self._lock:
+            mm = self._view(entry.segment, entry.offset + entry.length)
+            data = mm[entry.offset : entry.offset + entry.length]
+        return _decompress(entry.codec, data)
+
+    def lookup(self, url: str, at: Optional[float] = None) -> Optional[Entry]:
+        """Latest entry for url (or the latest fetched at or before ``at``)."""
+        with self._lock:
+            positions = self._by_url.get(url) or []
+            for pos in reversed(positions):
+                e = self._entries[pos]
+                if at is None or e.fetched_at <= at:
+                    return e
+        return None
+
+    def get(self, url: str, at: Optional[float] = None) -> Optional[bytes]:
+        entry = self.lookup(url, at)
+        return None if entry is None else self.read(entry)
+
+    def entries(self, since: Optional[float] = None, latest_only: bool = False) -> List[Entry]:
+        with self._lock:
+            items = list(self._entries)
+        if since is not None:
+            items = [e for e in items if e.fetched_at >= since]
+        if latest_only:
+            latest: Dict[str, Entry] = {}
+            for e in items:
+                latest[e.url] = e
+            items = list(latest.values())
+        return items
+
+    def iter_pages(self, since: Optional[float] = None, latest_only: bool = True) -> Iterator[Tuple[Entry, bytes]]:
+        for e in self.entries(since, latest_only):
+            yield e, self.read(e)
+
+    def close(self) -> None:
+        with self._lock:
+            for fh in (self._seg_fh, self._index_fh):
+                if fh is not None:
+                    fh.close()
+            self._seg_fh = self._index_fh = None
+            for fh, mm in self._maps.values():
+                mm.close()
+                fh.close()
+            self._maps.clear()
+
+    def __enter__(self) -> "PageArchive":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+_active: Dict[str, Optional[PageArchive]] = {"archive": None}
+_active_lock = threading.Lock()
+
+
+def configure(root: Optional[str]) -> Optional[PageArchive]:
+    """Turn archiving on for this process (root=None turns it off)."""
+    with _active_lock:
+        if _active["archive"] is not None:
+            _active["archive"].close()
+        _active["archive"] = PageArchive(root) if root else None
+        return _active["archive"]
+
+
+def active() -> Optional[PageArchive]:
+    return _active["archive"]
+
+
+def maybe_store(method: str, url: str, status: int, content_type: Optional[str], body: bytes) -> None:
+    """Archive a fetched page if archiving is on and it looks like a page (GET, 200, HTML/JSON)."""
+    archive = _active["archive"]
+    if archive is None or method.upper() != "GET" or status != 200 or not body:
+        return
+    ctype = (content_type or "").lower()
+    if ctype and not ctype.startswith(_ARCHIVED_TYPES):
+        return
+    try:
+        archive.put(str(url), body, status=status, content_type=ctype)
+    except OSError as e:
+        # Archiving must never break a scrape
+        print(f"page_archive: write failed for {url}: {e}")
+
+
+def install_playwright_capture(context: Any) -> None:
+    """Archive document responses seen by a Playwright (sync API) browser context."""
+    if _active["archive"] is None:
+        return
+
+    def on_response(response: Any) -> None:
+        try:
+            if response.request.resource_type not in ("document", "xhr", "fetch"):
+                return
+            maybe_store(
+                response.request.method, response.url, response.status, response.headers.get("content-type"), response.body()
+            )
+        except Exception:
+            # Redirects and aborted requests have no body; skip them
+            pass
+
+    context.on("response", on_response)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    p = argparse.ArgumentParser(description="Inspect a page archive")
+    p.add_argument("root", help="Archive directory")
+    p.add_argument("--stats", action="store_true", help="Print page/segment counts and sizes")
+    p.add_argument("--get", metavar="URL", help="Write the latest body for URL to stdout")
+    args = p.parse_args(argv)
+    with PageArchive(args.root) as archive:
+        if args.get:
+            body = archive.get(args.get)
+            if body is None:
+                print(f"not archived: {args.get}", file=sys.stderr)
+                return 1
+            sys.stdout.buffer.write(body)
+            return 0
+        entries = archive.entries()
+        segments = sorted({e.segment for e in entries})
+        stored = sum(e.length for e in entries)
+        print(
+            f"pages={len(entries)} urls={len({e.url for e in entries})} segments={len(segments)} "
+            f"compressed_bytes={stored}"
+        )
+    return 0
+
+
+if os.getenv("PAGE_ARCHIVE_DIR"):
+    configure(os.getenv("PAGE_ARCHIVE_DIR"))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,76 @@
+"""
+Process pool for CPU-bound page parsing.
+
+Async fetchers hand raw page bytes to ``parse()``. The parse runs in a worker
+process and comes back as a plain dict, so BeautifulSoup/regex work neither
+blocks the event loop nor stays on one core.
+
+PARSE_WORKERS sets the pool size (default: CPU count); 0 parses inline on the
+calling thread (debugging, tiny runs). The pool is created on first use and
+shared by every vendor in the process.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional
+
+_lock = threading.Lock()
+_state: Dict[str, Any] = {"pool": None, "workers": None}
+
+
+def workers() -> int:
+    """Configured worker count (``configure()`` wins over PARSE_WORKERS)."""
+    if _state["workers"] is not None:
+        return _state["workers"]
+    raw = os.getenv("PARSE_WORKERS", "").strip()
+    try:
+        return max(0, int(raw)) if raw else (os.cpu_count() or 1)
+    except ValueError:
+        return os.cpu_count() or 1
+
+
+def configure(n: Optional[int]) -> None:
+    """Set the pool size for this process (None = PARSE_WORKERS / CPU count, 0 = inline)."""
+    shutdown()
+    _state["workers"] = None if n is None else max(0, int(n))
+
+
+def get_pool() -> Optional[ProcessPoolExecutor]:
+    with _lock:
+        n = workers()
+        if n <= 0:
+            return None
+        if _state["pool"] is None:
+            _state["pool"] = ProcessPoolExecutor(max_workers=n)
+        return _state["pool"]
+
+
+def shutdown() -> None:
+    with _lock:
+        pool, _state["pool"] = _state["pool"], None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+atexit.register(shutdown)
+
+
+async def parse(fn: Callable[..., Any], *args: Any) -> Any:
+    """Run ``fn(*args)`` in the parse pool. fn must be a module-level function; args should be bytes/str/plain values."""
+    pool = get_pool()
+    if pool is None:
+        return fn(*args)
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(pool, fn, *args)
+    except BrokenProcessPool:
+        # A worker died (OOM, signal); start a fresh pool next time and parse this page here
+        print("parse_pool: worker pool broke; parsing inline")
+        shutdown()
+        return fn(*args)
@@ -0,0 +1,35 @@
+"""
+Shared HTML parsing helpers.
+
+``make_soup`` uses the lxml tree builder when lxml is installed. It is several
+times faster than html.parser on large result pages. Otherwise it falls back
+to html.parser, so parsers must not depend on builder-specific quirks.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Optional, Union
+
+from bs4 import BeautifulSoup, FeatureNotFound
+
+_FEATURES: dict = {"value": None}
+
+# Card-text patterns shared by the tile extractors (HTTPX and Playwright)
+STATE_RE = re.compile(r"\b(ACT|NSW|NT|QLD|SA|TAS|VIC|WA)\b")
+PRICE_RE = re.compile(r"\$\s*([0-9][0-9,]*)")
+
+
+def soup_features() -> str:
+    """``"lxml"`` when available, else ``"html.parser"`` (probed once per process)."""
+    if _FEATURES["value"] is None:
+        try:
+            BeautifulSoup("<p></p>", "lxml")
+            _FEATURES["value"] = "lxml"
+        except FeatureNotFound:
+            _FEATURES["value"] = "html.parser"
+    return _FEATURES["value"]
+
+
+def make_soup(html: Union[str, bytes], features: Optional[str] = None) -> BeautifulSoup:
+    return BeautifulSoup(html, features or soup_features())
@@ -1,12 +1,26 @@
 import os
-from typing import Dict, Any, Iterable
+from typing import Dict, Any, Iterable, Optional, Set, Union
 
+from engine.scraper.listing import Listing
 
-def save_normalized(listing: Dict[str, Any]) -> None:
+
+ListingLike = Union[Listing, Dict[str, Any]]
+
+
+def _as_row(listing: ListingLike, raw_as_json: bool = False) -> Dict[str, Any]:
+    # Listing records become plain dicts only at the DB boundary
+    if isinstance(listing, Listing):
+        return listing.to_row(raw_as_json=raw_as_json)
+    return listing
+
+
+def save_normalized(listing: ListingLike) -> None:
     """
     Persist a normalized listing based on DB_BACKEND.
     - postgres (default): upsert into Supabase Postgres
     - other values: no-op for now (Mongo path reserved)
+
+    Accepts a Listing record or a plain dict.
     """
     backend = os.getenv("DB_BACKEND", "postgres").lower()
     if backend == "supabase_api":
@@ -15,7 +29,7 @@ def save_normalized(listing: Dict[str, Any]) -> None:
 
         if not listing.get("fingerprint"):
             listing["fingerprint"] = sb.make_fingerprint(listing)
-        sb.upsert_listing(listing)
+        sb.upsert_listing(_as_row(listing))
         return
 
     if backend == "postgres":
@@ -24,17 +38,117 @@ def save_normalized(listing: Dict[str, Any]) -> None:
 
         if not listing.get("fingerprint"):
             listing["fingerprint"] = make_fingerprint(listing)
-        upsert_listing(listing)
+        upsert_listing(_as_row(listing, raw_as_json=True))
         return
 
     # Other backends: no-op for now
     return
 
 
-def save_many(listings: Iterable[Dict[str, Any]]) -> int:
+def dedup_batch(listings: Iterable[ListingLike]) -> None:
+    """Assign cross-vendor duplicate cluster ids for a saved batch (DEDUP_ON_INGEST=true, postgres only)."""
+    if os.getenv("DEDUP_ON_INGEST", "").lower() not in ("1", "true", "yes"):
+        return
+    if os.getenv("DB_BACKEND", "postgres").lower() != "postgres":
+        return
+    from engine.db import dedup
+
+    try:
+        stats = dedup.run_batch(list(listings))
+        print("dedup " + " ".join(f"{k}={v}" for k, v in stats.items()))
+    except Exception as e:
+        # Clustering is best-effort; never fail an ingest over it
+        print(f"dedup error: {e}")
+
+
+def price_stats_enabled() -> bool:
+    return (
+        os.getenv("PRICE_STATS_ON_INGEST", "").lower() in ("1", "true", "yes")
+        and os.getenv("DB_BACKEND", "postgres").lower() == "postgres"
+    )
+
+
+def price_stats_batch(listings: Iterable[ListingLike], prev_keys: Iterable[str] = ()) -> None:
+    """Refresh market price aggregates for the segments a saved batch touched or left (PRICE_STATS_ON_INGEST=true, postgres only)."""
+    if not price_stats_enabled():
+        return
+    from engine.db import market
+
+    try:
+        stats = market.refresh_batch(listings, prev_keys)
+        print("price_stats " + " ".join(f"{k}={v}" for k, v in stats.items()))
+    except Exception as e:
+        # Aggregates are best-effort; never fail an ingest over them
+        print(f"price_stats error: {e}")
+
+
+def facets_batch(listings: Iterable[ListingLike]) -> None:
+    """Bump the ingest generation so API facet caches refresh (FACETS_ON_INGEST=true, postgres only)."""
+    if os.getenv("FACETS_ON_INGEST", "").lower() not in ("1", "true", "yes"):
+        return
+    if os.getenv("DB_BACKEND", "postgres").lower() != "postgres":
+        return
+    from engine.db import facets
+
+    try:
+        facets.bump_generation()
+    except Exception as e:
+        print(f"facets error: {e}")
+
+
+def alert_batch(listings: Iterable[ListingLike]) -> None:
+    """Evaluate saved-search alerts for a saved batch (ALERTS_ON_INGEST=true)."""
+    if os.getenv("ALERTS_ON_INGEST", "").lower() not in ("1", "true", "yes"):
+        return
+    from engine.alerts import evaluator
+
+    try:
+        stats = evaluator.evaluate_batch(listings)
+        print("alerts " + " ".join(f"{k}={v}" for k, v in stats.items()))
+    except Exception as e:
+        # Alerting is best-effort; never fail an ingest over it
+        print(f"alerts error: {e}")
+
+
+def on_batch_saved(listings: Iterable[ListingLike], prev_market_keys: Iterable[str] = ()) -> None:
+    """Post-commit hooks for a saved batch: duplicate clustering, price aggregates, facet invalidation, then alerts."""
+    saved = list(listings)
+    if not saved:
+        return
+    dedup_batch(saved)
+    price_stats_batch(saved, prev_market_keys)
+    facets_batch(saved)
+    alert_batch(saved)
+
+
+# Rows per set-based upsert statement
+UPSERT_CHUNK = 500
+
+
+def save_many(listings: Iterable[ListingLike]) -> int:
     """Save a collection of normalized listings. Returns count saved."""
+    backend = os.getenv("DB_BACKEND", "postgres").lower()
+    items = list(listings)
+    if backend not in ("postgres", "supabase_api"):
+        return len(items)
+    if backend == "supabase_api":
+        from engine.db.supabase_api import make_fingerprint, upsert_many
+    else:
+        from engine.db.supabase_client import make_fingerprint, upsert_many
+
+    # Segments the saved rows sat in before this run, so aggregates they left are refreshed too
+    prev_keys: Optional[Set[str]] = set() if price_stats_enabled() else None
     count = 0
-    for item in listings:
-        save_normalized(item)
-        count += 1
+    for i in range(0, len(items), UPSERT_CHUNK):
+        chunk = items[i : i + UPSERT_CHUNK]
+        for item in chunk:
+            if not item.get("fingerprint"):
+                item["fingerprint"] = make_fingerprint(item)
+        rows = [_as_row(item, raw_as_json=backend == "postgres") for item in chunk]
+        if prev_keys is not None:
+            upserted, _events = upsert_many(rows, prev_market_keys=prev_keys)
+        else:
+            upserted, _events = upsert_many(rows)
+        count += upserted
+    on_batch_saved(items, prev_keys or ())
     return count
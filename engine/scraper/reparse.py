@@ -0,0 +1,350 @@
+"""
+Re-parse stored listings through the current parse/normalize code.
+
+After a fix to a parser or normalizer (e.g. ``pickles_http._normalise_specs``
+or ``normalize_pickles``), existing rows stay wrong until re-scraped. This
+rebuilds them from what we already have:
+
+- stored ``raw`` payloads (``listings.raw`` or ``listing_raw``), re-normalized;
+- with ``--archive DIR``, archived pages as well. Pickles detail pages are
+  re-parsed and merged over the stored payload (as hydration does). Archived
+  Pickles/Autotrader result pages are re-parsed with ``--from-archive``; a
+  Pickles tile whose detail page was not archived is merged over the stored
+  payload instead of replacing it (counted in ``tile_only``).
+
+Parsing and normalization run in a process pool. Output is compared with the
+stored columns, and only rows that changed are bulk-upserted, with
+make/model/variant/year corrections included.
+
+Usage:
+  python -m engine.scraper.orchestrator reparse --vendor pickles [--archive runs/pages] [--workers 4] [--dry-run]
+  python -m engine.scraper.orchestrator reparse --vendor autotrader --from-archive --archive runs/pages
+
+Postgres backend only (reads through a server-side cursor).
+"""
+
+from __future__ import annotations
+
+import argparse
+import copy
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from urllib.parse import urlparse
+
+from engine.db.dedup import make_fingerprint
+
+_VENDORS = ("pickles", "manheim", "autotrader", "gumtree", "ebay")
+# Columns compared to decide whether a re-parsed row changed
+_COMPARE_COLS = (
+    "source_url", "make", "model", "variant", "year", "price", "odometer", "body", "trans", "fuel",
+    "engine", "drive", "state", "postcode", "suburb", "lat", "lng", "media", "seller", "status",
+)
+_LIST_HOSTS = {"pickles": "pickles.com.au", "autotrader": "autotrader.com.au", "manheim": "manheim.com.au"}
+
+Key = Tuple[str, str]
+
+# Per-worker archive handle (opened once per process)
+_worker_archive: Dict[str, Any] = {}
+
+
+def _archive(root: Optional[str]) -> Any:
+    if not root:
+        return None
+    if root not in _worker_archive:
+        from engine.scraper.page_archive import PageArchive
+
+        _worker_archive[root] = PageArchive(root)
+    return _worker_archive[root]
+
+
+def _overlay_detail(vendor: str, raw: Dict[str, Any], archive: Any) -> Dict[str, Any]:
+    """Re-parse the archived detail page for a stored payload (Pickles only)."""
+    if archive is None or vendor != "pickles":
+        return raw
+    url = raw.get("url") or raw.get("link")
+    body = archive.get(url) if url else None
+    if body is None:
+        return raw
+    from engine.scraper.vendors import pickles_http as pk
+
+    detail = pk._parse_detail_html(body.decode("utf-8", errors="replace"))
+    row = copy.deepcopy(raw)
+    pk._merge_detail(row, detail, row.get("tile_chips"), debug=False)
+    return row
+
+
+def _parse_list_page(vendor: str, html: str) -> List[Dict[str, Any]]:
+    if vendor == "pickles":
+        from engine.scraper.vendors import pickles_http as pk
+
+        rows, _stats = pk.parse_list(html, limit=10_000)
+        return rows
+    if vendor == "autotrader":
+        from engine.scraper.vendors import autotrader_http as at
+
+        return at.parse_list(html, limit=10_000)
+    if vendor == "manheim":
+        from engine.scraper.vendors import manheim_http as mh
+
+        return mh.parse_page(html)["rows"]
+    raise ValueError(f"no archived list parser for vendor: {vendor}")
+
+
+def _normalize_rows(vendor: str, raws: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], int]:
+    from engine.scraper import normalize as norm
+
+    res = norm.normalize_batch(vendor, raws)
+    rows = []
+    for listing in res.rows:
+        row = listing.to_row()
+        row["fingerprint"] = make_fingerprint(row)
+        rows.append(row)
+    return rows, res.err
+
+
+def reparse_payloads(vendor: str, raws: List[Dict[str, Any]], archive_root: Optional[str]) -> Tuple[List[Dict[str, Any]], int]:
+    """Worker: stored payloads -> normalized rows."""
+    archive = _archive(archive_root)
+    return _normalize_rows(vendor, [_overlay_detail(vendor, r, archive) for r in raws])
+
+
+def reparse_pages(
+    vendor: str, urls: List[str], archive_root: str
+) -> Tuple[List[Dict[str, Any]], int, List[Dict[str, Any]]]:
+    """
+    Worker: archived result pages -> normalized rows (detail pages merged when
+    archived). Pickles tiles with no archived detail page come back separately
+    as tile-only rows, to be merged over the stored payload.
+    """
+    archive = _archive(archive_root)
+    raws: List[Dict[str, Any]] = []
+    tile_only: List[Dict[str, Any]] = []
+    for url in urls:
+        body = archive.get(url)
+        if body is None:
+            continue
+        for raw in _parse_list_page(vendor, body.decode("utf-8", errors="replace")):
+            full = _overlay_detail(vendor, raw, archive)
+            (tile_only if vendor == "pickles" and full is raw else raws).append(full)
+    rows, err = _normalize_rows(vendor, raws)
+    tile_rows, tile_err = _normalize_rows(vendor, tile_only)
+    return rows, err + tile_err, tile_rows
+
+
+def merge_tiles(vendor: str, tile_rows: List[Dict[str, Any]], stored: Dict[Key, Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], int]:
+    """Worker: tile-only rows re-normalized with the tile merged over the stored (hydrated) payload."""
+    raws = []
+    for r in tile_rows:
+        old = stored.get((r["source"], str(r["source_id"])))
+        raws.append({**old["raw"], **r["raw"]} if old and old.get("raw") else r["raw"])
+    return _normalize_rows(vendor, raws)
+
+
+def _same(a: Any, b: Any) -> bool:
+    # numeric columns come back from Postgres as Decimal/float
+    if isinstance(a, (int, float, Decimal)) and isinstance(b, (int, float, Decimal)) and not isinstance(a, bool):
+        return abs(float(a) - float(b)) < 1e-6
+    return a == b
+
+
+def changed(new: Dict[str, Any], old: Optional[Dict[str, Any]], compare_raw: bool = False) -> bool:
+    """True when a re-parsed row differs from the stored one in any written column."""
+    if old is None:
+        return True
+    cols = _COMPARE_COLS + (("raw",) if compare_raw else ())
+    return any(not _same(new.get(c), old.get(c)) for c in cols)
+
+
+def _stored_sql(where: str) -> str:
+    from engine.db.supabase_client import raw_table_enabled
+
+    cols = ", ".join(f"l.{c}" for c in ("source", "source_id") + _COMPARE_COLS)
+    if raw_table_enabled():
+        raw = "coalesce(l.raw, (select r.raw from listing_raw r where r.hash = l.raw_hash)) as raw"
+    else:
+        raw = "l.raw"
+    return f"select {cols}, {raw} from listings l where {where}"
+
+
+def _iter_stored(vendor: str, itersize: int = 2000) -> Iterator[Dict[str, Any]]:
+    import psycopg
+    from engine.db.supabase_client import get_conn, raw_table_enabled
+
+    has_raw = "(l.raw is not null or l.raw_hash is not null)" if raw_table_enabled() else "l.raw is not null"
+    with get_conn() as conn:
+        with conn.transaction(), conn.cursor(name="reparse_scan", row_factory=psycopg.rows.dict_row) as cur:
+            cur.itersize = itersize
+            cur.execute(_stored_sql(f"l.source = %s and {has_raw}"), (vendor,))
+            for row in cur:
+                if row["raw"] is not None:
+                    yield row
+
+
+def _fetch_stored(keys: List[Key]) -> Dict[Key, Dict[str, Any]]:
+    import psycopg
+    from engine.db.supabase_client import get_conn
+
+    if not keys:
+        return {}
+    sql = _stored_sql("(l.source, l.source_id) in (select * from unnest(%s::text[], %s::text[]))")
+    with get_conn() as conn, conn.cursor(row_factory=psycopg.rows.dict_row) as cur:
+        cur.execute(sql, ([k[0] for k in keys], [k[1] for k in keys]))
+        return {(r["source"], str(r["source_id"])): r for r in cur.fetchall()}
+
+
+def _chunks(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    chunk: List[Any] = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class _Progress:
+    def __init__(self, every: float = 5.0) -> None:
+        self.started = time.monotonic()
+        self.last = self.started
+        self.every = every
+        self.stats: Dict[str, int] = {"scanned": 0, "normalized": 0, "errors": 0, "changed": 0, "upserted": 0, "skipped_rekeyed": 0, "tile_only": 0}
+
+    def tick(self, force: bool = False) -> None:
+        now = time.monotonic()
+        if not force and now - self.last < self.every:
+            return
+        self.last = now
+        rate = self.stats["scanned"] / max(now - self.started, 1e-9)
+        print("reparse " + " ".join(f"{k}={v}" for k, v in self.stats.items()) + f" rate={rate:.0f}/s")
+
+
+def _write(rows: List[Dict[str, Any]], dry_run: bool, progress: _Progress) -> None:
+    if not rows:
+        return
+    progress.stats["changed"] += len(rows)
+    if dry_run:
+        return
+    from engine.db.supabase_client import upsert_many
+    from engine.scraper.pipeline import dedup_batch, facets_batch, price_stats_batch, price_stats_enabled
+
+    # A full update can move rows to another make/model/year segment; refresh the ones they left
+    prev_keys: Optional[Set[str]] = set() if price_stats_enabled() else None
+    for chunk in _chunks(rows, 500):
+        upserted, _events = upsert_many(chunk, full_update=True, prev_market_keys=prev_keys)
+        progress.stats["upserted"] += upserted
+    # Same post-commit hooks as ingest, minus alerts (a re-parse is not a new sighting)
+    dedup_batch(rows)
+    price_stats_batch(rows, prev_keys or ())
+    facets_batch(rows)
+
+
+def run(
+    vendor: str,
+    archive_root: Optional[str] = None,
+    from_archive: bool = False,
+    workers: Optional[int] = None,
+    chunk_size: int = 200,
+    dry_run: bool = False,
+) -> Dict[str, int]:
+    workers = workers or max(1, (os.cpu_count() or 2) - 1)
+    progress = _Progress()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        if from_archive:
+            if not archive_root:
+                raise ValueError("--from-archive needs --archive DIR")
+            from engine.scraper.page_archive import PageArchive
+
+            host = _LIST_HOSTS.get(vendor)
+            if host is None:
+                raise ValueError(f"no archived list parser for vendor: {vendor}")
+            with PageArchive(archive_root) as archive:
+                urls = [
+                    e.url for e in archive.entries(latest_only=True)
+                    if host in (urlparse(e.url).hostname or "") and e.content_type.startswith("text/html")
+                ]
+            jobs = (pool.submit(reparse_pages, vendor, chunk, archive_root) for chunk in _chunks(urls, 20))
+            for fut in _window(jobs, workers * 2):
+                rows, err, tile_rows = fut.result()
+                progress.stats["scanned"] += len(rows) + len(tile_rows) + err
+                progress.stats["normalized"] += len(rows) + len(tile_rows)
+                progress.stats["errors"] += err
+                stored = _fetch_stored([(r["source"], str(r["source_id"])) for r in rows + tile_rows])
+                if tile_rows:
+                    # No archived detail page: keep the hydrated raw/specs and lay the tile over them
+                    progress.stats["tile_only"] += len(tile_rows)
+                    merged, merge_err = pool.submit(merge_tiles, vendor, tile_rows, stored).result()
+                    progress.stats["errors"] += merge_err
+                    rows = rows + merged
+                by_key = {(r["source"], str(r["source_id"])): r for r in rows}
+                _write([r for k, r in by_key.items() if changed(r, stored.get(k), compare_raw=True)], dry_run, progress)
+                progress.tick()
+        else:
+            def submit(chunk: List[Dict[str, Any]]) -> Any:
+                fut = pool.submit(reparse_payloads, vendor, [r["raw"] for r in chunk], archive_root)
+                fut.stored = {(r["source"], str(r["source_id"])): r for r in chunk}  # type: ignore[attr-defined]
+                return fut
+
+            jobs = (submit(chunk) for chunk in _chunks(_iter_stored(vendor), chunk_size))
+            for fut in _window(jobs, workers * 2):
+                rows, err = fut.result()
+                stored = fut.stored  # type: ignore[attr-defined]
+                progress.stats["scanned"] += len(stored)
+                progress.stats["normalized"] += len(rows)
+                progress.stats["errors"] += err
+                out = []
+                for r in rows:
+                    old = stored.get((r["source"], str(r["source_id"])))
+                    if old is None:
+                        # Normalization now yields a different id; leave both rows alone
+                        progress.stats["skipped_rekeyed"] += 1
+                    elif changed(r, old, compare_raw=archive_root is not None):
+                        out.append(r)
+                _write(out, dry_run, progress)
+                progress.tick()
+    progress.tick(force=True)
+    return dict(progress.stats)
+
+
+def _window(jobs: Iterator[Any], size: int) -> Iterator[Any]:
+    """Yield futures in submission order, keeping at most ``size`` in flight."""
+    pending: List[Any] = []
+    for job in jobs:
+        pending.append(job)
+        if len(pending) >= size:
+            yield pending.pop(0)
+    while pending:
+        yield pending.pop(0)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    p = argparse.ArgumentParser(prog="orchestrator reparse", description="Re-parse stored listings with current parsers")
+    p.add_argument("--vendor", required=True, choices=_VENDORS)
+    p.add_argument("--archive", type=str, default=None, metavar="DIR", help="Page archive to re-parse detail/result pages from")
+    p.add_argument("--from-archive", action="store_true", help="Rebuild from archived result pages instead of stored payloads")
+    p.add_argument("--workers", type=int, default=None, help="Parser processes (default: CPUs - 1)")
+    p.add_argument("--chunk-size", type=int, default=200, help="Stored rows per worker task")
+    p.add_argument("--dry-run", action="store_true", help="Count changed rows without writing")
+    args = p.parse_args(argv)
+    if os.getenv("DB_BACKEND", "postgres").lower() != "postgres":
+        print("reparse needs DB_BACKEND=postgres")
+        return 2
+    t0 = time.monotonic()
+    stats = run(
+        args.vendor,
+        archive_root=args.archive,
+        from_archive=args.from_archive,
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        dry_run=args.dry_run,
+    )
+    elapsed = time.monotonic() - t0
+    print(
+        f"summary reparse vendor={args.vendor} "
+        + " ".join(f"{k}={v}" for k, v in stats.items())
+        + f" elapsed={elapsed:.1f}s rate={stats['scanned'] / max(elapsed, 1e-9):.0f}/s dry_run={args.dry_run}"
+    )
+    return 0
@@ -0,0 +1,209 @@
+"""
+Shared robots.txt policy, cached in memory and on disk per host.
+
+Every vendor fetcher calls ``check(url)`` before a request. ``crawl_delay(url)``
+gives the Crawl-delay to respect. Rules are read with ``urllib.robotparser``
+for the ROBOTS_USER_AGENT token (default ``RideRadar``, which falls back to
+``User-agent: *`` groups).
+
+A host's robots.txt is fetched at most once per ROBOTS_TTL seconds (default
+86400). The body is kept under ROBOTS_CACHE_DIR (default
+``engine/storage/robots``), so new processes reuse it and steady-state checks
+make no network calls.
+
+Fetch semantics follow robotparser:
+- 401/403 disallow everything;
+- other 4xx allow everything;
+- network errors and 5xx allow, and are retried after ROBOTS_ERROR_TTL seconds (default 300).
+
+ROBOTS_IGNORE=true (dev only) logs violations instead of raising. Replay runs
+(``--replay``) send nothing to the network and skip checks.
+
+A cold-cache lookup is a blocking fetch. Code running on an event loop uses
+``check_async`` / ``allowed_async`` / ``crawl_delay_async``, which do that
+fetch in a worker thread and answer from memory once the policy is warm.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+from urllib.robotparser import RobotFileParser
+
+import httpx
+
+from engine.scraper import http_replay
+
+_DEFAULT_DIR = Path(__file__).resolve().parents[1] / "storage" / "robots"
+
+_lock = threading.Lock()
+# origin -> (expires_at wall clock, parser)
+_memory: Dict[str, Tuple[float, RobotFileParser]] = {}
+_warned: set = set()
+
+
+class RobotsDisallowed(RuntimeError):
+    def __init__(self, url: str) -> None:
+        super().__init__(f"robots disallow: {url}")
+        self.url = url
+
+
+def user_agent() -> str:
+    return os.getenv("ROBOTS_USER_AGENT", "RideRadar")
+
+
+def _ttl(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+def _cache_path(origin: str) -> Path:
+    root = Path(os.getenv("ROBOTS_CACHE_DIR") or _DEFAULT_DIR)
+    return root / (origin.replace("://", "_").replace(":", "_").replace("/", "_") + ".json")
+
+
+def _build(status: int, body: str) -> RobotFileParser:
+    rp = RobotFileParser()
+    if status in (401, 403):
+        rp.disallow_all = True
+    elif status != 200:
+        rp.allow_all = True
+    else:
+        rp.parse(body.splitlines())
+    rp.modified()
+    return rp
+
+
+def _load_disk(origin: str) -> Optional[Tuple[float, RobotFileParser]]:
+    try:
+        data = json.loads(_cache_path(origin).read_text(encoding="utf-8"))
+        return float(data["expires_at"]), _build(int(data["status"]), data.get("body") or "")
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _save_disk(origin: str, expires_at: float, status: int, body: str) -> None:
+    path = _cache_path(origin)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(
+            json.dumps({"expires_at": expires_at, "fetched_at": time.time(), "status": status, "body": body}),
+            encoding="utf-8",
+        )
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"robots: cache write failed for {origin}: {e}")
+
+
+def _fetch(origin: str) -> Tuple[int, str]:
+    try:
+        with httpx.Client(
+            headers={"User-Agent": user_agent()},
+            timeout=10.0,
+            follow_redirects=True,
+            transport=http_replay.transport(),
+        ) as client:
+            resp = client.get(origin + "/robots.txt")
+        return resp.status_code, resp.text if resp.status_code == 200 else ""
+    except httpx.HTTPError as e:
+        print(f"robots: fetch failed for {origin}: {e}")
+        return 0, ""
+
+
+def _origin(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme or 'https'}://{parts.netloc}"
+
+
+def policy(url: str) -> RobotFileParser:
+    """Parsed robots.txt for the url's host (memory, then disk, then network)."""
+    origin = _origin(url)
+    now = time.time()
+    with _lock:
+        hit = _memory.get(origin)
+        if hit is not None and hit[0] > now:
+            return hit[1]
+        hit = _load_disk(origin)
+        if hit is not None and hit[0] > now:
+            _memory[origin] = hit
+            return hit[1]
+        status, body = _fetch(origin)
+        ok = 200 <= status < 500
+        expires_at = now + (_ttl("ROBOTS_TTL", 86400) if ok else _ttl("ROBOTS_ERROR_TTL", 300))
+        rp = _build(status, body)
+        _memory[origin] = (expires_at, rp)
+        _save_disk(origin, expires_at, status, body)
+        print(f"robots: fetched {origin}/robots.txt status={status} ttl={int(expires_at - now)}s")
+        return rp
+
+
+def allowed(url: str) -> bool:
+    if http_replay.is_replay():
+        return True
+    return policy(url).can_fetch(user_agent(), url)
+
+
+def crawl_delay(url: str) -> float:
+    """Crawl-delay (seconds) for our user agent on the url's host, 0 when none is set."""
+    if http_replay.is_replay():
+        return 0.0
+    rp = policy(url)
+    delay = rp.crawl_delay(user_agent())
+    if delay is None:
+        rate = rp.request_rate(user_agent())
+        if rate is not None and rate.requests:
+            return rate.seconds / rate.requests
+        return 0.0
+    return float(delay)
+
+
+def check(url: str) -> None:
+    """Raise RobotsDisallowed unless robots.txt allows url (ROBOTS_IGNORE=true only logs)."""
+    if allowed(url):
+        return
+    if os.getenv("ROBOTS_IGNORE", "").lower() in ("1", "true", "yes"):
+        host = urlsplit(url).netloc
+        if host not in _warned:
+            _warned.add(host)
+            print(f"robots: ignored (dev) disallow for {url}")
+        return
+    raise RobotsDisallowed(url)
+
+
+async def _warm(url: str) -> None:
+    if http_replay.is_replay():
+        return
+    hit = _memory.get(_origin(url))
+    if hit is None or hit[0] <= time.time():
+        await asyncio.to_thread(policy, url)
+
+
+async def allowed_async(url: str) -> bool:
+    await _warm(url)
+    return allowed(url)
+
+
+async def crawl_delay_async(url: str) -> float:
+    await _warm(url)
+    return crawl_delay(url)
+
+
+async def check_async(url: str) -> None:
+    await _warm(url)
+    check(url)
+
+
+def clear() -> None:
+    """Drop the in-memory cache (disk entries are kept)."""
+    with _lock:
+        _memory.clear()
+        _warned.clear()
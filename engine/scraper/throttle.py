@@ -0,0 +1,53 @@
+"""
+Request pacing shared by the async HTTPX fetchers.
+
+One ``RateLimiter`` per host and run spaces request *starts* across every
+task that fetches from that host, so a concurrency of N still makes at most
+one request per interval. The interval is a jittered delay read from the
+vendor's ``*_MIN_MS``/``*_MAX_MS`` variables and never drops below ``floor``,
+the robots.txt Crawl-delay. Replays run unthrottled.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import random
+import time
+from typing import Tuple
+
+from engine.scraper import http_replay
+
+
+class RateLimiter:
+    """Spaces request starts by ``uniform(lo_s, hi_s)`` seconds across concurrent tasks."""
+
+    def __init__(self, lo_s: float, hi_s: float) -> None:
+        self.lo_s, self.hi_s = lo_s, max(lo_s, hi_s)
+        self._next_at = 0.0
+        self._lock = asyncio.Lock()
+
+    @classmethod
+    def from_env(
+        cls,
+        floor: float = 0.0,
+        min_env: str = "SCRAPE_DELAY_MIN_MS",
+        max_env: str = "SCRAPE_DELAY_MAX_MS",
+        default_ms: Tuple[int, int] = (400, 900),
+    ) -> "RateLimiter":
+        if http_replay.is_replay():
+            return cls(0.0, 0.0)
+        try:
+            lo = int(os.getenv(min_env, str(default_ms[0])))
+            hi = int(os.getenv(max_env, str(default_ms[1])))
+        except ValueError:
+            lo, hi = default_ms
+        return cls(max(lo / 1000.0, floor), max(hi / 1000.0, floor))
+
+    async def wait(self) -> None:
+        async with self._lock:
+            now = time.monotonic()
+            delay = self._next_at - now
+            self._next_at = max(now, self._next_at) + random.uniform(self.lo_s, self.hi_s)
+        if delay > 0:
+            await asyncio.sleep(delay)
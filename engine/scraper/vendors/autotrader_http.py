@@ -1,14 +1,32 @@
 from __future__ import annotations
 
+import asyncio
+import os
+import random
 import re
-from typing import Any, Dict, List, Optional
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from urllib.parse import urljoin
 
 import httpx
 from bs4 import BeautifulSoup
 
+from engine.scraper import http_replay, parse_pool, robots
+from engine.scraper.throttle import RateLimiter
 
 BASE = "https://www.autotrader.com.au"
+_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"
+    ),
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-AU,en;q=0.9",
+    "Referer": BASE,
+}
+# Upper bound on tiles parsed per result page (the caller's limit is applied after cross-page dedupe)
+_PAGE_TILES = 1000
 
 
 def _slug(s: Optional[str]) -> Optional[str]:
@@ -36,22 +54,161 @@ def build_search_url(make: Optional[str], model: Optional[str], state: Optional[
 
 
 def fetch_html(url: str) -> str:
-    headers = {
-        "User-Agent": (
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
-            "(KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"
-        ),
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-        "Accept-Language": "en-AU,en;q=0.9",
-        "Referer": BASE,
-    }
-    with httpx.Client(headers=headers, follow_redirects=True, timeout=30.0) as client:
+    robots.check(url)
+    with httpx.Client(
+        headers=_HEADERS,
+        follow_redirects=True,
+        timeout=15.0,
+        transport=http_replay.transport(),
+    ) as client:
         r = client.get(url)
         if r.status_code != 200:
             raise RuntimeError(f"http {r.status_code}")
         return r.text
 
 
+def _save_snapshot(page: int, html: str) -> None:
+    try:
+        snap_dir = Path(__file__).resolve().parents[2] / "storage" / "snapshots"
+        snap_dir.mkdir(parents=True, exist_ok=True)
+        (snap_dir / f"autotrader_page{page}.html").write_text(html, encoding="utf-8")
+    except OSError:
+        pass
+
+
+async def _fetch_page(client: httpx.AsyncClient, url: str, sem: asyncio.Semaphore, limiter: RateLimiter, debug: bool) -> Optional[str]:
+    """Result page HTML; None past the last page (404)."""
+    last_err = ""
+    for attempt in range(2):
+        async with sem:
+            await limiter.wait()
+            try:
+                r = await client.get(url)
+            except httpx.HTTPError as e:
+                last_err = str(e) or type(e).__name__
+                r = None
+        if r is not None:
+            if debug:
+                print(f"DEBUG autotrader status={r.status_code} len={len(r.content)} url={url}")
+            if r.status_code == 200:
+                return r.text
+            if r.status_code == 404:
+                return None
+            last_err = f"http {r.status_code}"
+            if r.status_code not in (429, 500, 502, 503, 504):
+                break
+        if attempt == 0:
+            await asyncio.sleep(1.0 + random.uniform(0.0, 0.5))
+    raise RuntimeError(last_err or "fetch failed")
+
+
+async def search_async(
+    make: Optional[str],
+    model: Optional[str],
+    state: Optional[str],
+    pages: int = 1,
+    limit: Optional[int] = None,
+    concurrency: Optional[int] = None,
+    debug: bool = False,
+    on_page: Optional[Callable[[int, List[Dict[str, Any]]], Any]] = None,
+) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+    """
+    Walk result pages 1..pages concurrently over one pooled client.
+
+    Pages are consumed in order as they arrive. Tiles already seen on an
+    earlier page are dropped, and the walk stops at ``limit``, at a page with
+    no new tiles, or past the last page. ``on_page(page, new_rows)`` runs in a
+    worker thread for each page, so rows can be normalized/saved while later
+    pages are still downloading. Returns (rows, counters).
+    """
+    pages = max(1, int(pages or 1))
+    if concurrency is None:
+        concurrency = int(os.getenv("AUTOTRADER_PAGE_CONCURRENCY", "3"))
+    concurrency = max(1, concurrency)
+    remaining = limit if limit and limit > 0 else None
+    counters: Counter = Counter()
+    rows: List[Dict[str, Any]] = []
+    seen: set[str] = set()
+    sem = asyncio.Semaphore(concurrency)
+    # Spaces request starts across all page tasks (never closer than the robots Crawl-delay)
+    limiter = RateLimiter.from_env(
+        await robots.crawl_delay_async(BASE + "/"), "AUTOTRADER_PAGE_DELAY_MIN_MS", "AUTOTRADER_PAGE_DELAY_MAX_MS", (300, 700)
+    )
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(
+        headers=_HEADERS,
+        follow_redirects=True,
+        timeout=httpx.Timeout(15.0, connect=10.0),
+        limits=limits,
+        transport=http_replay.async_transport(limits=limits),
+    ) as client:
+        urls = [build_search_url(make, model, state, page=n) for n in range(1, pages + 1)]
+        for url in urls:
+            await robots.check_async(url)
+        tasks = [asyncio.create_task(_fetch_page(client, url, sem, limiter, debug)) for url in urls]
+        try:
+            for n, task in enumerate(tasks, start=1):
+                try:
+                    html = await task
+                except RuntimeError as e:
+                    if n == 1:
+                        raise
+                    counters["page_errors"] += 1
+                    print(f"autotrader page {n} failed: {e}")
+                    break
+                if html is None:
+                    break
+                counters["pages_walked"] += 1
+                if debug:
+                    _save_snapshot(n, html)
+                try:
+                    page_rows = await parse_pool.parse(parse_list, html, _PAGE_TILES, False)
+                except RuntimeError:
+                    if n == 1:
+                        raise
+                    break
+                counters["tiles"] += len(page_rows)
+                new_rows = []
+                for row in page_rows:
+                    if row["url"] in seen:
+                        counters["dropped_duplicate"] += 1
+                        continue
+                    seen.add(row["url"])
+                    new_rows.append(row)
+                    if remaining is not None and len(rows) + len(new_rows) >= remaining:
+                        break
+                if debug:
+                    print(f"DEBUG autotrader page {n} tiles={len(page_rows)} new_rows={len(new_rows)}")
+                if not new_rows:
+                    break
+                rows.extend(new_rows)
+                if on_page is not None:
+                    await asyncio.to_thread(on_page, n, new_rows)
+                if remaining is not None and len(rows) >= remaining:
+                    break
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+    counters["kept"] = len(rows)
+    return rows, dict(counters)
+
+
+def search_autotrader(
+    make: Optional[str],
+    model: Optional[str],
+    state: Optional[str],
+    pages: int = 1,
+    limit: Optional[int] = None,
+    concurrency: Optional[int] = None,
+    debug: bool = False,
+    on_page: Optional[Callable[[int, List[Dict[str, Any]]], Any]] = None,
+) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+    """Blocking wrapper around ``search_async``."""
+    return asyncio.run(search_async(make, model, state, pages, limit, concurrency, debug, on_page))
+
+
 def _abs_url(href: str) -> str:
     return urljoin(BASE, href)
 
@@ -81,10 +238,8 @@ def parse_list(html: str, limit: int, debug: bool = False) -> List[Dict[str, Any
         # Title
         title = (a.get_text(" ", strip=True) or "").strip()
         if not title:
-            # Compose from slugs as a fallback
+            # Compose from slugs as a fallback (the URL carries no year)
             comp = []
-            if yguess:
-                comp.append(yguess)
             if make_slug:
                 comp.append(make_slug.replace("-", " "))
             if model_slug:
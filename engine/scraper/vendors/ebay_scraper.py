@@ -7,6 +7,7 @@ from typing import Any, Dict, List, Optional
 import httpx
 from bs4 import BeautifulSoup
 
+from engine.scraper import http_replay, robots
 
 BASE = "https://www.ebay.com.au/sch/i.html"
 CARS_CAT = "29690"  # AU Motors -> Cars
@@ -38,7 +39,12 @@ def search(
     keywords = " ".join(x for x in [make, model] if x)
     items: List[Dict[str, Any]] = []
 
-    with httpx.Client(headers=HEADERS, timeout=10.0, follow_redirects=True) as client:
+    with httpx.Client(
+        headers=HEADERS,
+        timeout=10.0,
+        follow_redirects=True,
+        transport=http_replay.transport(),
+    ) as client:
         for page in range(1, max(1, page_limit) + 1):
             params = {
                 "_nkw": keywords,
@@ -46,6 +52,7 @@ def search(
                 "_pgn": str(page),
                 "rt": "nc",
             }
+            robots.check(str(httpx.URL(BASE, params=params)))
             resp = client.get(BASE, params=params)
             print(f"GET {resp.request.url} -> {resp.status_code} len={len(resp.text)}")
             if resp.status_code != 200:
@@ -1,16 +1,217 @@
+"""
+Playwright fallback for Gumtree result pages.
+
+One Chromium process and PW_POOL_SIZE warm contexts (default 2) are kept for
+the life of the process. Calls take turns across the contexts, and each one
+reuses its page until PW_PAGE_RECYCLE navigations (default 25), then opens a
+fresh page. Images, media and fonts are blocked (PW_BLOCK_TYPES). All tiles
+come back from one in-page ``evaluate`` call.
+
+Sessions: contexts load Playwright storage state (cookies/localStorage) from
+``--pw-storage`` / PW_STORAGE_STATE, default ``<PW_PROFILE_DIR>/storage_state.json``.
+The first context writes it back on shutdown, so cookies from a manual assist
+run carry over.
+"""
+
 from __future__ import annotations
 
+import atexit
 import os
 import re
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Dict, List
-from urllib.parse import urljoin
-
-from playwright.sync_api import sync_playwright
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
+from engine.scraper import http_replay
+from engine.scraper.parsing import PRICE_RE, STATE_RE
 
 BASE = "https://www.gumtree.com.au"
 
+# Runs in the page: every listing anchor, its card's text, thumb and ad id, plus a challenge check
+_EXTRACT_JS = """
+(limit) => {
+  const html = document.documentElement.innerHTML.toLowerCase();
+  const challenge = ["captcha", "pardon our interruption", "/splashui/challenge"].some((m) => html.includes(m));
+  const tiles = [];
+  const byUrl = new Map();
+  for (const a of document.querySelectorAll("a[href*='/s-ad/']")) {
+    const url = new URL(a.getAttribute("href"), document.baseURI).href;
+    const title = (a.innerText || "").trim();
+    const known = byUrl.get(url);
+    if (known) {
+      if (title && !known.title) known.title = title;
+      continue;
+    }
+    if (tiles.length >= limit) break;
+    let card = a.closest("article, li, [data-ad-id], [class*='user-ad']");
+    if (!card) card = (a.parentElement && a.parentElement.parentElement) || a.parentElement || a;
+    const img = card.querySelector("img");
+    const thumb = img ? (img.getAttribute("src") || (img.getAttribute("srcset") || "").split(" ")[0] || null) : null;
+    const tile = { url, title, card_text: (card.innerText || "").trim(), thumb, data_ad_id: card.getAttribute("data-ad-id") };
+    byUrl.set(url, tile);
+    tiles.push(tile);
+  }
+  return { challenge, tiles };
+}
+"""
+
+
+def _truthy(name: str, default: str = "false") -> bool:
+    return os.getenv(name, default).lower() in ("1", "true", "yes")
+
+
+def default_storage_path() -> Path:
+    explicit = os.getenv("PW_STORAGE_STATE")
+    if explicit:
+        return Path(explicit).expanduser()
+    return Path(os.getenv("PW_PROFILE_DIR", "~/.rideradar/pw-gumtree")).expanduser() / "storage_state.json"
+
+
+def _launch_chromium(headless: bool) -> Tuple[Any, Any]:
+    """Start Playwright and Chromium; returns (playwright, browser)."""
+    from playwright.sync_api import sync_playwright
+
+    pw = sync_playwright().start()
+    browser = pw.chromium.launch(
+        headless=headless,
+        args=["--disable-blink-features=AutomationControlled"],
+    )
+    return pw, browser
+
+
+class BrowserPool:
+    """Long-lived browser with warm contexts (sync API: use from the thread that created it)."""
+
+    def __init__(
+        self,
+        size: Optional[int] = None,
+        headless: Optional[bool] = None,
+        storage_state: Optional[str] = None,
+        recycle_after: Optional[int] = None,
+        block_types: Optional[List[str]] = None,
+        launcher: Optional[Callable[[bool], Tuple[Any, Any]]] = None,
+    ) -> None:
+        self.launcher = launcher or _launch_chromium
+        self.size = max(1, size if size is not None else int(os.getenv("PW_POOL_SIZE", "2")))
+        self.headless = headless if headless is not None else _truthy("PW_HEADLESS")
+        self.storage_path = Path(storage_state).expanduser() if storage_state else default_storage_path()
+        self.recycle_after = max(1, recycle_after if recycle_after is not None else int(os.getenv("PW_PAGE_RECYCLE", "25")))
+        if block_types is None:
+            block_types = [t.strip() for t in os.getenv("PW_BLOCK_TYPES", "image,media,font").split(",") if t.strip()]
+        self.block_types = set(block_types)
+        self._pw: Any = None
+        self._browser: Any = None
+        self._slots: List[Dict[str, Any]] = []
+        self._next = 0
+
+    def start(self) -> "BrowserPool":
+        if self._browser is not None:
+            return self
+        self._pw, self._browser = self.launcher(self.headless)
+        self._slots = [{"context": self._new_context(), "page": None, "uses": 0} for _ in range(self.size)]
+        return self
+
+    def _new_context(self) -> Any:
+        ctx = self._browser.new_context(
+            viewport={"width": 1280, "height": 800},
+            locale="en-AU",
+            timezone_id="Australia/Brisbane",
+            storage_state=str(self.storage_path) if self.storage_path.exists() else None,
+        )
+        http_replay.install_playwright_routes(ctx)
+        if self.block_types:
+            blocked = self.block_types
+
+            # Registered after the replay/archive routes, so it runs first and hands everything else on
+            def block(route: Any) -> None:
+                if route.request.resource_type in blocked:
+                    route.abort()
+                else:
+                    route.fallback()
+
+            ctx.route("**/*", block)
+        return ctx
+
+    @contextmanager
+    def page(self) -> Iterator[Any]:
+        """A warm page from the next context; it is recycled after ``recycle_after`` uses or on error."""
+        self.start()
+        slot = self._slots[self._next % len(self._slots)]
+        self._next += 1
+        if slot["page"] is None or slot["uses"] >= self.recycle_after:
+            if slot["page"] is not None:
+                slot["page"].close()
+            slot["page"], slot["uses"] = slot["context"].new_page(), 0
+        slot["uses"] += 1
+        try:
+            yield slot["page"]
+        except BaseException:
+            try:
+                slot["page"].close()
+            finally:
+                slot["page"] = None
+            raise
+
+    def save_storage(self) -> None:
+        if not self._slots:
+            return
+        try:
+            self.storage_path.parent.mkdir(parents=True, exist_ok=True)
+            self._slots[0]["context"].storage_state(path=str(self.storage_path))
+        except Exception as e:
+            print(f"playwright: storage save failed ({self.storage_path}): {e}")
+
+    def close(self) -> None:
+        if self._browser is None:
+            return
+        self.save_storage()
+        for slot in self._slots:
+            try:
+                slot["context"].close()
+            except Exception:
+                pass
+        self._browser.close()
+        if self._pw is not None:
+            self._pw.stop()
+        self._browser = self._pw = None
+        self._slots = []
+
+
+_pools: Dict[str, BrowserPool] = {}
+
+
+def get_pool(storage_state: Optional[str] = None) -> BrowserPool:
+    """Process-wide pool per storage state file."""
+    key = str(Path(storage_state).expanduser() if storage_state else default_storage_path())
+    if key not in _pools:
+        _pools[key] = BrowserPool(storage_state=key)
+    return _pools[key]
+
+
+def close_pools() -> None:
+    for pool in list(_pools.values()):
+        pool.close()
+    _pools.clear()
+
+
+atexit.register(close_pools)
+
+
+def _tile_row(tile: Dict[str, Any]) -> Dict[str, Any]:
+    card_text = tile.get("card_text") or ""
+    mprice = PRICE_RE.search(card_text)
+    mstate = STATE_RE.search(card_text)
+    mid = re.search(r"/(\d+)(?:\?.*)?$", tile["url"])
+    return {
+        "url": tile["url"],
+        "title": tile.get("title") or "",
+        "price_str": mprice.group(0) if mprice else None,
+        "location": mstate.group(1) if mstate else None,
+        "thumb": tile.get("thumb"),
+        "ad_id": mid.group(1) if mid else tile.get("data_ad_id"),
+        "vendor": "Gumtree",
+    }
+
 
 def fetch_page(
     url: str,
@@ -18,82 +219,26 @@ def fetch_page(
     timeout: int = 20000,
     debug_html_path: str | None = None,
     assist: bool = False,
+    storage_state: Optional[str] = None,
 ) -> List[Dict[str, Any]]:
-    profile_dir = Path(os.getenv("PW_PROFILE_DIR", "~/.rideradar/pw-gumtree")).expanduser()
-    headless = os.getenv("PW_HEADLESS", "false").lower() == "true"
-    rows: List[Dict[str, Any]] = []
-    with sync_playwright() as pw:
-        ctx = pw.chromium.launch_persistent_context(
-            user_data_dir=str(profile_dir),
-            headless=headless,
-            viewport={"width": 1280, "height": 800},
-            locale="en-AU",
-            timezone_id="Australia/Brisbane",
-            args=["--disable-blink-features=AutomationControlled"],
-            slow_mo=50,
-        )
-        try:
-            page = ctx.new_page()
-            page.goto(url, wait_until="domcontentloaded", timeout=timeout)
-            if assist:
-                print(
-                    "Manual assist: ensure listings are visible (dismiss banners/challenges), then press ENTER here…",
-                    flush=True,
-                )
-                try:
-                    input()
-                except EOFError:
-                    pass
-            content = page.content()
-            if debug_html_path:
-                Path(debug_html_path).parent.mkdir(parents=True, exist_ok=True)
-                Path(debug_html_path).write_text(content, encoding="utf-8")
-            lower = content.lower()
-            if (
-                "captcha" in lower
-                or "pardon our interruption" in lower
-                or "/splashui/challenge" in lower
-            ):
-                raise RuntimeError("challenge (PW)")
-
-            anchors = page.locator("a[href*='/s-ad/']").all()
-            for a in anchors:
-                href = a.get_attribute("href")
-                if not href:
-                    continue
-                abs_url = urljoin(BASE, href)
-                title = (a.inner_text() or "").strip()
-                # Walk up two levels to get a card's text content
-                card = a.element_handle()
-                for _ in range(2):
-                    if card and card.evaluate("el => el.parentElement"):
-                        card = card.evaluate_handle("el => el.parentElement").as_element()
-                card_text = (card.inner_text().strip() if card else "")
-                mprice = re.search(r"\$\s*([0-9][0-9,]*)", card_text)
-                price_text = mprice.group(0) if mprice else None
-                mstate = re.search(r"\b(ACT|NSW|NT|QLD|SA|TAS|VIC|WA)\b", card_text)
-                location = mstate.group(1) if mstate else None
-                img_el = card.query_selector("img") if card else None
-                thumb = img_el.get_attribute("src") if img_el else None
-                if not thumb and img_el:
-                    srcset = img_el.get_attribute("srcset") or ""
-                    thumb = srcset.split(" ")[0] if srcset else None
-                mid = re.search(r"/(\d+)(?:\?.*)?$", abs_url)
-                ad_id = mid.group(1) if mid else None
-
-                rows.append(
-                    {
-                        "url": abs_url,
-                        "title": title,
-                        "price_str": price_text,
-                        "location": location,
-                        "thumb": thumb,
-                        "ad_id": ad_id,
-                        "vendor": "Gumtree",
-                    }
-                )
-                if len(rows) >= limit:
-                    break
-        finally:
-            ctx.close()
-    return rows[:limit]
+    pool = get_pool(storage_state)
+    with pool.page() as page:
+        page.goto(url, wait_until="domcontentloaded", timeout=timeout)
+        if assist:
+            print(
+                "Manual assist: ensure listings are visible (dismiss banners/challenges), then press ENTER here…",
+                flush=True,
+            )
+            try:
+                input()
+            except EOFError:
+                pass
+            # Keep cookies earned during assist even if the run is interrupted later
+            pool.save_storage()
+        if debug_html_path:
+            Path(debug_html_path).parent.mkdir(parents=True, exist_ok=True)
+            Path(debug_html_path).write_text(page.content(), encoding="utf-8")
+        result = page.evaluate(_EXTRACT_JS, limit)
+    if result["challenge"]:
+        raise RuntimeError("challenge (PW)")
+    return [_tile_row(t) for t in result["tiles"]][:limit]
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
+import asyncio
+import math
 import os
-import random
 import re
 import time
 from pathlib import Path
@@ -9,26 +10,36 @@ from typing import Any, Dict, List, Optional
 from urllib.parse import urljoin, urlencode
 
 import httpx
-from bs4 import BeautifulSoup
 
+from engine.scraper import http_replay, parse_pool, robots
+from engine.scraper.parsing import PRICE_RE, STATE_RE, make_soup
+from engine.scraper.throttle import RateLimiter
 
 BASE = "https://www.gumtree.com.au"
+_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"
+    ),
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-AU,en;q=0.8",
+    "Referer": f"{BASE}/",
+    "Upgrade-Insecure-Requests": "1",
+    "Cache-Control": "no-cache",
+    "Pragma": "no-cache",
+}
+_CHALLENGE_MARKERS = ("pardon our interruption", "/splashui/challenge", "captcha")
 
+# Per-process session state shared by every search: cookies from the warmup
+_session: Dict[str, Any] = {"cookies": httpx.Cookies(), "warmed_at": 0.0}
 
-def _client() -> httpx.Client:
-    headers = {
-        "User-Agent": (
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
-            "(KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"
-        ),
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-        "Accept-Language": "en-AU,en;q=0.8",
-        "Referer": f"{BASE}/",
-        "Upgrade-Insecure-Requests": "1",
-        "Cache-Control": "no-cache",
-        "Pragma": "no-cache",
-    }
-    return httpx.Client(headers=headers, timeout=10.0, follow_redirects=True)
+
+class Challenge(RuntimeError):
+    """Gumtree served a 403 or bot challenge for ``url``."""
+
+    def __init__(self, url: str) -> None:
+        super().__init__("challenge/403 (HTTPX)")
+        self.url = url
 
 
 def build_search_url(keywords: Optional[str], state: Optional[str], page: int) -> str:
@@ -46,6 +57,242 @@ def build_search_url(keywords: Optional[str], state: Optional[str], page: int) -
     return f"{BASE}/s-all-items/k0?{urlencode(params)}"
 
 
+def _card_for(a: Any) -> Any:
+    """Tile container for a listing anchor: the nearest article/data-ad-id/user-ad ancestor, else two levels up."""
+    node = a
+    for _ in range(6):
+        parent = node.parent
+        if parent is None or parent.name in ("body", "html", "[document]"):
+            break
+        node = parent
+        classes = " ".join(node.get("class") or [])
+        if node.name in ("article", "li") or node.has_attr("data-ad-id") or "user-ad" in classes:
+            return node
+    card = a
+    for _ in range(2):
+        if card.parent:
+            card = card.parent
+    return card
+
+
+def parse_tiles(html: str, limit: int) -> List[Dict[str, Any]]:
+    """One pass over listing anchors; each card's text is read once and tiles are deduped by URL."""
+    soup = make_soup(html)
+    items: List[Dict[str, Any]] = []
+    by_url: Dict[str, Dict[str, Any]] = {}
+    for a in soup.select('a[href*="/s-ad/"]'):
+        abs_url = urljoin(BASE, a["href"])
+        title = a.get_text(" ", strip=True)
+        known = by_url.get(abs_url)
+        if known is not None:
+            # Image and title links of the same tile: keep the first non-empty title
+            if title and not known["title"]:
+                known["title"] = title
+            continue
+        if len(items) >= limit:
+            break
+
+        card = _card_for(a)
+        text_block = card.get_text(" ", strip=True)
+        mprice = PRICE_RE.search(text_block)
+        mstate = STATE_RE.search(text_block)
+        thumb = None
+        img = card.find("img")
+        if img:
+            thumb = img.get("src") or (img.get("srcset") or "").split(" ")[0]
+        ad_id = None
+        mid = re.search(r"/(\d+)(?:\?.*)?$", abs_url)
+        if mid:
+            ad_id = mid.group(1)
+        if not ad_id and card.has_attr("data-ad-id"):
+            ad_id = card.get("data-ad-id")
+
+        item = {
+            "url": abs_url,
+            "title": title,
+            "price_str": mprice.group(0) if mprice else None,
+            "location": mstate.group(1) if mstate else None,
+            "thumb": thumb,
+            "ad_id": ad_id,
+            "vendor": "Gumtree",
+        }
+        by_url[abs_url] = item
+        items.append(item)
+    return items
+
+
+def _ttl(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+async def _warmup(client: httpx.AsyncClient) -> None:
+    """Homepage visit for cookies, at most once per GUMTREE_SESSION_TTL seconds (default 1800)."""
+    if time.monotonic() - _session["warmed_at"] < _ttl("GUMTREE_SESSION_TTL", 1800):
+        return
+    try:
+        warm = await client.get(BASE + "/")
+        print(f"WARMUP {warm.request.url} -> {warm.status_code} len={len(warm.content)}")
+        _session["warmed_at"] = time.monotonic()
+    except httpx.HTTPError:
+        pass
+
+
+def _is_challenge(resp: httpx.Response) -> bool:
+    if resp.status_code == 403:
+        return True
+    lower = resp.text.lower()
+    return any(marker in lower for marker in _CHALLENGE_MARKERS)
+
+
+def _save_snapshot(name: str, html: str) -> None:
+    snap_dir = Path(__file__).resolve().parents[1] / "storage" / "snapshots"
+    snap_dir.mkdir(parents=True, exist_ok=True)
+    (snap_dir / name).write_text(html, encoding="utf-8")
+
+
+class GumtreeSession:
+    """
+    Pooled async client for one or more searches.
+
+    Warmup cookies live at module level, so later sessions in the same
+    process skip the homepage visit while they are fresh. robots.txt comes
+    from the shared ``robots`` cache.
+    """
+
+    def __init__(self, concurrency: Optional[int] = None) -> None:
+        if concurrency is None:
+            concurrency = int(os.getenv("GUMTREE_PAGE_CONCURRENCY", "2"))
+        self.concurrency = max(1, concurrency)
+        self._sem = asyncio.Semaphore(self.concurrency)
+        self._limiter = RateLimiter.from_env()
+        self.client: Optional[httpx.AsyncClient] = None
+
+    async def __aenter__(self) -> "GumtreeSession":
+        self._limiter = RateLimiter.from_env(await robots.crawl_delay_async(BASE + "/"))
+        limits = httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency)
+        self.client = httpx.AsyncClient(
+            headers=_HEADERS,
+            timeout=10.0,
+            follow_redirects=True,
+            cookies=_session["cookies"],
+            limits=limits,
+            transport=http_replay.async_transport(limits=limits),
+        )
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        if self.client is not None:
+            _session["cookies"] = self.client.cookies
+            await self.client.aclose()
+            self.client = None
+
+    async def _fetch(self, url: str) -> httpx.Response:
+        async with self._sem:
+            await self._limiter.wait()
+            resp = await self.client.get(url)
+        print(f"GET {resp.request.url} -> {resp.status_code} len={len(resp.content)}")
+        return resp
+
+    async def search(
+        self,
+        make: Optional[str] = None,
+        model: Optional[str] = None,
+        state: Optional[str] = None,
+        limit: int = 10,
+        page_limit: int = 2,
+        debug: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch page 1, then only as many later pages as ``limit`` still needs
+        (by page 1's tile count), concurrently under the rate limiter.
+        Pages are consumed in page order.
+        """
+        keywords = " ".join(x for x in [make, model] if x)
+        urls = [build_search_url(keywords, state, 1)]
+        await robots.check_async(urls[0])
+        await _warmup(self.client)
+        tasks = [asyncio.create_task(self._fetch(urls[0]))]
+        items: List[Dict[str, Any]] = []
+        seen: set[str] = set()
+        try:
+            page = 0
+            # Later pages are appended to urls/tasks once page 1 is in
+            while page < len(tasks):
+                url, task = urls[page], tasks[page]
+                page += 1
+                try:
+                    resp = await task
+                except httpx.HTTPError as e:
+                    if page == 1:
+                        raise
+                    print(f"gumtree page {page} failed: {e}")
+                    break
+                if _is_challenge(resp):
+                    if page == 1:
+                        raise Challenge(url)
+                    # Keep what earlier pages gave us
+                    print(f"gumtree page {page}: challenge; stopping")
+                    break
+                if resp.status_code != 200:
+                    continue
+                if debug and page == 1:
+                    _save_snapshot("gumtree_page1.html", resp.text)
+                tiles = await parse_pool.parse(parse_tiles, resp.text, limit)
+                fresh = [t for t in tiles if t["url"] not in seen]
+                seen.update(t["url"] for t in fresh)
+                items.extend(fresh)
+                print(f"gumtree tiles: {len(fresh)}")
+                if len(items) >= limit or not fresh:
+                    break
+                if page == 1:
+                    needed = math.ceil((limit - len(items)) / len(tiles))
+                    for n in range(2, min(max(1, page_limit), 1 + needed) + 1):
+                        url = build_search_url(keywords, state, n)
+                        await robots.check_async(url)
+                        urls.append(url)
+                        tasks.append(asyncio.create_task(self._fetch(url)))
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        return items[:limit]
+
+
+async def search_async(
+    make: Optional[str] = None,
+    model: Optional[str] = None,
+    state: Optional[str] = None,
+    limit: int = 10,
+    page_limit: int = 2,
+    debug: bool = False,
+) -> List[Dict[str, Any]]:
+    async with GumtreeSession() as session:
+        return await session.search(make, model, state, limit, page_limit, debug)
+
+
+def _playwright_fallback(url: str, limit: int, debug: bool, pw_storage: Optional[str] = None) -> List[Dict[str, Any]]:
+    from engine.scraper.vendors.gumtree_playwright import fetch_page
+
+    debug_path = None
+    if debug:
+        snap_dir = Path(__file__).resolve().parents[1] / "storage" / "snapshots"
+        snap_dir.mkdir(parents=True, exist_ok=True)
+        debug_path = str(snap_dir / "gumtree_pw_page1.html")
+    rows = fetch_page(
+        url,
+        limit=limit,
+        timeout=20000,
+        debug_html_path=debug_path,
+        assist=(os.getenv("PW_ASSIST", "false").lower() in ("1", "true", "yes")),
+        storage_state=pw_storage,
+    )
+    print(f"fallback: playwright rows={len(rows)}")
+    return rows[:limit]
+
+
 def search(
     make: Optional[str] = None,
     model: Optional[str] = None,
@@ -53,169 +300,18 @@ def search(
     limit: int = 10,
     page_limit: int = 2,
     debug: bool = False,
+    pw_storage: Optional[str] = None,
 ) -> List[Dict[str, Any]]:
-    # Polite throttle config (milliseconds)
     try:
-        delay_lo_ms = int(os.getenv("SCRAPE_DELAY_MIN_MS", "400"))
-        delay_hi_ms = int(os.getenv("SCRAPE_DELAY_MAX_MS", "900"))
-    except ValueError:
-        delay_lo_ms, delay_hi_ms = 400, 900
-    if delay_hi_ms < delay_lo_ms:
-        delay_hi_ms = delay_lo_ms
-
-    keywords = " ".join(x for x in [make, model] if x)
-    items: List[Dict[str, Any]] = []
-    with _client() as client:
-        # Optional robots check
-        ignore_robots = os.getenv("GUMTREE_IGNORE_ROBOTS", "false").lower() in ("1", "true", "yes")
-        try:
-            rbt = client.get(urljoin(BASE, "/robots.txt"))
-            if rbt.status_code == 200:
-                txt = rbt.text
-                disallows = [ln.split(":", 1)[1].strip() for ln in txt.splitlines() if ln.lower().startswith("disallow:")]
-                blocks = any(seg for seg in disallows if "/s-" in seg or "all-items" in seg)
-                if ignore_robots:
-                    print(f"robots: ignored (dev); disallows={len(disallows)} blocks_listing_paths={blocks}")
-                else:
-                    print(f"robots: disallows={len(disallows)} blocks_listing_paths={blocks}")
-                    if blocks:
-                        raise RuntimeError("robots disallow listing paths")
-        except Exception as _e:
-            # do not hard fail for robots read errors unless explicitly blocked
-            if str(_e).startswith("robots disallow"):
-                raise
-            pass
-
-        # Warmup cookies
-        try:
-            warm = client.get(BASE + "/")
-            print(f"WARMUP {warm.request.url} -> {warm.status_code} len={len(warm.text)}")
-        except Exception:
-            pass
-        for page in range(1, max(1, page_limit) + 1):
-            url = build_search_url(keywords, state, page)
-            resp = client.get(url)
-            print(f"GET {resp.request.url} -> {resp.status_code} len={len(resp.text)}")
-            # Detect challenge/captcha/403 pages politely
-            if resp.status_code == 403:
-                # Optional Playwright fallback
-                if os.getenv("USE_PLAYWRIGHT", "false").lower() in ("1", "true", "yes"):
-                    try:
-                        from engine.scraper.vendors.gumtree_playwright import fetch_page
-                        debug_path = None
-                        if debug:
-                            snap_dir = Path(__file__).resolve().parents[1] / "storage" / "snapshots"
-                            snap_dir.mkdir(parents=True, exist_ok=True)
-                            debug_path = str(snap_dir / "gumtree_pw_page1.html")
-                        rows = fetch_page(
-                            url,
-                            limit=limit,
-                            timeout=20000,
-                            debug_html_path=debug_path,
-                            assist=(os.getenv("PW_ASSIST", "false").lower() in ("1", "true", "yes")),
-                        )
-                        print(f"fallback: playwright rows={len(rows)}")
-                        return rows[:limit]
-                    except Exception as _e:
-                        raise RuntimeError("challenge/403 (HTTPX)") from _e
-                raise RuntimeError("challenge/403 (HTTPX)")
-            lower = resp.text.lower()
-            if (
-                "pardon our interruption" in lower
-                or "/splashui/challenge" in lower
-                or "captcha" in lower
-            ):
-                if os.getenv("USE_PLAYWRIGHT", "false").lower() in ("1", "true", "yes"):
-                    try:
-                        from engine.scraper.vendors.gumtree_playwright import fetch_page
-                        debug_path = None
-                        if debug:
-                            snap_dir = Path(__file__).resolve().parents[1] / "storage" / "snapshots"
-                            snap_dir.mkdir(parents=True, exist_ok=True)
-                            debug_path = str(snap_dir / "gumtree_pw_page1.html")
-                        rows = fetch_page(
-                            url,
-                            limit=limit,
-                            timeout=20000,
-                            debug_html_path=debug_path,
-                            assist=(os.getenv("PW_ASSIST", "false").lower() in ("1", "true", "yes")),
-                        )
-                        print(f"fallback: playwright rows={len(rows)}")
-                        return rows[:limit]
-                    except Exception as _e:
-                        raise RuntimeError("challenge/403 (HTTPX)") from _e
-                raise RuntimeError("challenge/403 (HTTPX)")
-            if resp.status_code != 200:
-                continue
-            if debug and page == 1:
-                snap_dir = Path(__file__).resolve().parents[1] / "storage" / "snapshots"
-                snap_dir.mkdir(parents=True, exist_ok=True)
-                (snap_dir / "gumtree_page1.html").write_text(resp.text, encoding="utf-8")
-
-            soup = BeautifulSoup(resp.text, "html.parser")
-            count_before = len(items)
-
-            # Tolerant: any anchor to a listing page containing /s-ad/
-            for a in soup.find_all("a", href=True):
-                href = a["href"]
-                if "/s-ad/" not in href:
-                    continue
-                abs_url = urljoin(BASE, href)
-                title = (a.get_text(" ", strip=True) or "").strip()
-                # Find a container card by walking up a couple of levels
-                card = a
-                for _ in range(2):
-                    if card.parent:
-                        card = card.parent
-
-                # Price text within the card vicinity
-                price_text = None
-                text_block = card.get_text(" ", strip=True)
-                mprice = re.search(r"\$\s*([0-9][0-9,]*)", text_block)
-                if mprice:
-                    price_text = mprice.group(0)
-
-                # Location/state similarly
-                location = None
-                mstate = re.search(r"\b(ACT|NSW|NT|QLD|SA|TAS|VIC|WA)\b", text_block)
-                if mstate:
-                    location = mstate.group(1)
-
-                # Image thumb near the anchor
-                thumb = None
-                img = card.find("img")
-                if img:
-                    thumb = img.get("src") or (img.get("srcset") or "").split(" ")[0]
-
-                # Ad id from url
-                ad_id = None
-                mid = re.search(r"/(\d+)(?:\?.*)?$", abs_url)
-                if mid:
-                    ad_id = mid.group(1)
-                if not ad_id and card and card.has_attr("data-ad-id"):
-                    ad_id = card.get("data-ad-id")
-
-                items.append(
-                    {
-                        "url": abs_url,
-                        "title": title,
-                        "price_str": price_text,
-                        "location": location,
-                        "thumb": thumb,
-                        "ad_id": ad_id,
-                        "vendor": "Gumtree",
-                    }
-                )
-                if len(items) >= limit:
-                    print(f"gumtree tiles: {len(items) - count_before}")
-                    return items[:limit]
-
-            print(f"gumtree tiles: {len(items) - count_before}")
-            # Throttle between pages
-            if page < page_limit and len(items) < limit:
-                delay = random.uniform(delay_lo_ms / 1000.0, delay_hi_ms / 1000.0)
-                time.sleep(delay)
-    return items[:limit]
+        return asyncio.run(search_async(make, model, state, limit, page_limit, debug))
+    except Challenge as e:
+        # Optional Playwright fallback (sync API, so it runs outside the event loop)
+        if os.getenv("USE_PLAYWRIGHT", "false").lower() in ("1", "true", "yes"):
+            try:
+                return _playwright_fallback(e.url, limit, debug, pw_storage)
+            except Exception as _e:
+                raise RuntimeError("challenge/403 (HTTPX)") from _e
+        raise RuntimeError("challenge/403 (HTTPX)") from None
 
 
 def scrape_gumtree(max_pages: int = 2):
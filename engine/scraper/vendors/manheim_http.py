@@ -0,0 +1,291 @@
+"""
+Manheim search results over plain HTTP (no browser).
+
+The damaged-vehicles search page is server-rendered with the same markup
+the Selenium scraper reads (``#result-Container > section > ul > li``).
+Page 1 gives the result total and the pager's link to page 2. The query
+parameter that link sets to 2 is the page number, so the remaining page
+URLs are built from it and fetched concurrently over one pooled client.
+Pages are consumed in order. When the link carries no such parameter, the
+walk follows each page's next link in turn instead. Rows have
+the same shape as ``manheim_scraper.scrape_manheim`` output, so the
+existing "manheim" normalizer applies unchanged.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import os
+import random
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlencode, urljoin
+
+import httpx
+
+from engine.scraper import http_replay, parse_pool, robots
+from engine.scraper.parsing import make_soup
+from engine.scraper.throttle import RateLimiter
+
+BASE = "https://manheim.com.au"
+SEARCH_PATH = "/damaged-vehicles/search"
+PAGE_SIZE = 120
+_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"
+    ),
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-AU,en;q=0.9",
+    "Referer": BASE + "/",
+}
+# Spec rows under each card (div[k]/div[2] of the spec block), by row number
+SPEC_ROWS = {
+    "odometer": 1,
+    "colour": 2,
+    "transmission": 3,
+    "engine": 4,
+    "body": 5,
+    "fuel": 6,
+    "wovr": 7,
+    "seller_type": 9,
+}
+_SPEC_BLOCK = ":scope > div:nth-of-type(2) > div:nth-of-type(2) > div:nth-of-type(3) > div"
+# Pager "next" link (the anchor the Selenium scraper clicks)
+_NEXT_LINK = ":scope > nav:nth-of-type(1) > div > div:nth-of-type(2) > div:nth-of-type(2) > ul > li:last-child > a[href]"
+
+
+def build_search_url(make: Optional[str] = None) -> str:
+    """First result page; later pages come from the pager links."""
+    if make:
+        params = {"refineName": "ManufacturerCode", "ManufacturerCode": make.upper()}
+    else:
+        params = {"CategoryCodeDescription": "Cars & Light Commercial"}
+    params["RecordsPerPage"] = str(PAGE_SIZE)
+    return f"{BASE}{SEARCH_PATH}?{urlencode(params)}"
+
+
+def page_urls(page2_url: str, last_page: int) -> List[str]:
+    """
+    URLs for pages 2..last_page, built from the pager's link to page 2. Only
+    that link is returned when no single query parameter in it is "2".
+    """
+    url = httpx.URL(page2_url)
+    names = [k for k, v in url.params.multi_items() if v == "2"]
+    if len(names) != 1:
+        return [page2_url]
+    return [page2_url] + [str(url.copy_set_param(names[0], str(n))) for n in range(3, last_page + 1)]
+
+
+def _int(text: Optional[str]) -> Optional[int]:
+    digits = re.sub(r"[^0-9]", "", text or "")
+    return int(digits) if digits else None
+
+
+def _text(node: Any) -> Optional[str]:
+    return node.get_text(" ", strip=True) if node is not None else None
+
+
+def parse_page(html: str) -> Dict[str, Any]:
+    """Cards, the result total and the pager's next link: {"rows": [...], "total": int|None, "next_url": str|None}."""
+    soup = make_soup(html)
+    rows: List[Dict[str, Any]] = []
+    container = soup.select_one("#result-Container")
+    if container is None:
+        return {"rows": rows, "total": None, "next_url": None}
+    for li in container.select(":scope > section > ul > li"):
+        h2 = li.select_one("a h2")
+        a = li.select_one("a[href]")
+        img = li.select_one("img")
+        if h2 is None or a is None or img is None:
+            continue
+        row: Dict[str, Any] = {
+            "title": _text(h2),
+            "link": urljoin(BASE, a["href"]),
+            "img": img.get("src") or img.get("data-src"),
+            "vendor": "Manheim",
+        }
+        block = li.select(_SPEC_BLOCK)
+        for field, n in SPEC_ROWS.items():
+            value = None
+            for b in block:
+                cell = b.select_one(f":scope > div:nth-of-type({n}) > div:nth-of-type(2)")
+                if cell is not None:
+                    value = _text(cell)
+                    break
+            row[field] = value
+        rows.append(row)
+    counter = container.select_one(":scope > nav > div > div:nth-of-type(1) > span")
+    spans = counter.select(":scope > span") if counter is not None else []
+    nxt = container.select_one(_NEXT_LINK)
+    href = (nxt.get("href") or "").strip() if nxt is not None else ""
+    return {
+        "rows": rows,
+        "total": _int(_text(spans[1])) if len(spans) > 1 else None,
+        "next_url": urljoin(BASE, href) if href and not href.startswith(("#", "javascript:")) else None,
+    }
+
+
+def _save_snapshot(page: int, html: str) -> None:
+    try:
+        snap_dir = Path(__file__).resolve().parents[2] / "storage" / "snapshots"
+        snap_dir.mkdir(parents=True, exist_ok=True)
+        (snap_dir / f"manheim_page{page}.html").write_text(html, encoding="utf-8")
+    except OSError:
+        pass
+
+
+async def _fetch_page(client: httpx.AsyncClient, url: str, sem: asyncio.Semaphore, limiter: RateLimiter, debug: bool) -> str:
+    await robots.check_async(url)
+    last_err = ""
+    for attempt in range(2):
+        async with sem:
+            await limiter.wait()
+            try:
+                r = await client.get(url)
+            except httpx.HTTPError as e:
+                last_err = str(e) or type(e).__name__
+                r = None
+        if r is not None:
+            if debug:
+                print(f"DEBUG manheim status={r.status_code} len={len(r.content)} url={url}")
+            if r.status_code == 200:
+                return r.text
+            last_err = f"http {r.status_code}"
+            if r.status_code not in (429, 500, 502, 503, 504):
+                break
+        if attempt == 0:
+            await asyncio.sleep(1.0 + random.uniform(0.0, 0.5))
+    raise RuntimeError(last_err or "fetch failed")
+
+
+async def search_async(
+    make: Optional[str] = None,
+    pages: Optional[int] = None,
+    limit: Optional[int] = None,
+    concurrency: Optional[int] = None,
+    debug: bool = False,
+    on_page: Optional[Callable[[int, List[Dict[str, Any]]], Any]] = None,
+) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+    """
+    Fetch page 1, then every remaining page (capped by ``pages`` and ``limit``)
+    concurrently. Pages are consumed in order and cards are deduped by link.
+    A later page with no new cards stops the walk and is counted in
+    ``stalled_pages``. ``on_page(page, new_rows)`` runs in a worker thread
+    per page. Returns (rows, counters).
+    """
+    if concurrency is None:
+        concurrency = int(os.getenv("MANHEIM_PAGE_CONCURRENCY", "3"))
+    concurrency = max(1, concurrency)
+    remaining = limit if limit and limit > 0 else None
+    counters: Counter = Counter()
+    rows: List[Dict[str, Any]] = []
+    seen: set[str] = set()
+    sem = asyncio.Semaphore(concurrency)
+    # Spaces request starts across all page tasks (never closer than the robots Crawl-delay)
+    limiter = RateLimiter.from_env(
+        await robots.crawl_delay_async(BASE + "/"), "MANHEIM_PAGE_DELAY_MIN_MS", "MANHEIM_PAGE_DELAY_MAX_MS", (400, 900)
+    )
+
+    async def consume(n: int, html: str, parsed: Dict[str, Any]) -> bool:
+        """Add a page's new rows; False when the walk should stop."""
+        counters["pages_walked"] += 1
+        if debug:
+            _save_snapshot(n, html)
+        counters["tiles"] += len(parsed["rows"])
+        new_rows = []
+        for row in parsed["rows"]:
+            if row["link"] in seen:
+                counters["dropped_duplicate"] += 1
+                continue
+            seen.add(row["link"])
+            new_rows.append(row)
+            if remaining is not None and len(rows) + len(new_rows) >= remaining:
+                break
+        if debug:
+            print(f"DEBUG manheim page {n} tiles={len(parsed['rows'])} new_rows={len(new_rows)}")
+        if not new_rows:
+            if n > 1:
+                # Expected more pages: the pager link served an earlier page again, or an empty one
+                counters["stalled_pages"] += 1
+                print(
+                    f"manheim: page {n} had no new cards (tiles={len(parsed['rows'])}); "
+                    f"stopping at {len(rows)} of {counters['total']} results"
+                )
+            return False
+        rows.extend(new_rows)
+        if on_page is not None:
+            await asyncio.to_thread(on_page, n, new_rows)
+        return remaining is None or len(rows) < remaining
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(
+        headers=_HEADERS,
+        follow_redirects=True,
+        timeout=httpx.Timeout(20.0, connect=10.0),
+        limits=limits,
+        transport=http_replay.async_transport(limits=limits),
+    ) as client:
+        html = await _fetch_page(client, build_search_url(make), sem, limiter, debug)
+        first = await parse_pool.parse(parse_page, html)
+        if not first["rows"]:
+            raise RuntimeError("no tiles (manheim)")
+        total = first["total"] or len(first["rows"])
+        counters["total"] = total
+        last_page = max(1, math.ceil(total / PAGE_SIZE))
+        if pages:
+            last_page = min(last_page, max(1, pages))
+        if remaining is not None:
+            last_page = min(last_page, max(1, math.ceil(remaining / PAGE_SIZE)))
+        if not await consume(1, html, first):
+            last_page = 1
+
+        urls: List[str] = []
+        if last_page > 1:
+            if first["next_url"]:
+                urls = page_urls(first["next_url"], last_page)
+            else:
+                counters["stalled_pages"] += 1
+                print(f"manheim: no pager link on page 1; stopping at {len(rows)} of {total} results")
+        tasks = [asyncio.create_task(_fetch_page(client, url, sem, limiter, debug)) for url in urls]
+        try:
+            n = 1
+            while n < len(tasks) + 1:
+                n += 1
+                try:
+                    html = await tasks[n - 2]
+                except RuntimeError as e:
+                    counters["page_errors"] += 1
+                    print(f"manheim page {n} failed: {e}")
+                    break
+                parsed = await parse_pool.parse(parse_page, html)
+                if not await consume(n, html, parsed):
+                    break
+                if n == len(tasks) + 1 and n < last_page:
+                    # No page-number parameter to build URLs from: follow this page's next link
+                    if not parsed["next_url"]:
+                        counters["stalled_pages"] += 1
+                        print(f"manheim: no pager link on page {n}; stopping at {len(rows)} of {total} results")
+                        break
+                    tasks.append(asyncio.create_task(_fetch_page(client, parsed["next_url"], sem, limiter, debug)))
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+    counters["kept"] = len(rows)
+    return rows, dict(counters)
+
+
+def search_manheim(
+    make: Optional[str] = None,
+    pages: Optional[int] = None,
+    limit: Optional[int] = None,
+    concurrency: Optional[int] = None,
+    debug: bool = False,
+    on_page: Optional[Callable[[int, List[Dict[str, Any]]], Any]] = None,
+) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+    """Blocking wrapper around ``search_async``."""
+    return asyncio.run(search_async(make, pages, limit, concurrency, debug, on_page))
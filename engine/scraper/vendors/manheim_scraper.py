@@ -1,12 +1,46 @@
-from ..common_utils import setup_chrome_driver, random_delay
+from .. import driver_pool
+from ..common_utils import random_delay
+from .manheim_http import SPEC_ROWS
 from selenium.webdriver.common.by import By
 from selenium.common.exceptions import NoSuchElementException
-import time
+
+
+# One round trip per page: every card's fields plus the result counters
+EXTRACT_JS = """
+const specRows = arguments[0];
+const one = (ctx, path) =>
+  document.evaluate(path, ctx, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+const text = (node) => (node ? (node.innerText || "").trim() : null);
+const cards = [];
+const items = document.evaluate('//*[@id="result-Container"]/section/ul/li', document, null,
+  XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+for (let i = 0; i < items.snapshotLength; i++) {
+  const li = items.snapshotItem(i);
+  const h2 = one(li, ".//a/h2");
+  const a = one(li, ".//a");
+  const img = one(li, ".//img");
+  if (!h2 || !a || !img) continue;
+  const card = { title: text(h2), link: a.href || a.getAttribute("href"), img: img.src || img.getAttribute("src") };
+  for (const [field, row] of Object.entries(specRows)) {
+    card[field] = text(one(li, `./div[2]/div[2]/div[3]/div/div[${row}]/div[2]`));
+  }
+  cards.push(card);
+}
+return {
+  cards: cards,
+  range: text(one(document, '//*[@id="result-Container"]/nav[1]/div/div[1]/span/span[1]')),
+  total: text(one(document, '//*[@id="result-Container"]/nav[1]/div/div[1]/span/span[2]')),
+};
+"""
+
+
+def _to_int(text):
+    return int(text.replace(",", "")) if text else None
+
 
 def scrape_manheim(make=None):
-    driver = setup_chrome_driver(headless=True)
     listings = []
-    try:
+    with driver_pool.driver() as driver:
         if make:
             url = f"https://manheim.com.au/damaged-vehicles/search?refineName=ManufacturerCode&ManufacturerCode={make.upper()}&RecordsPerPage=120"
         else:
@@ -15,88 +49,23 @@ def scrape_manheim(make=None):
         driver.get(url)
         random_delay()
 
-        total_text = driver.find_element(By.XPATH, '//*[@id="result-Container"]/nav[1]/div/div[1]/span/span[2]').text
-        total_listings = int(total_text.replace(",", ""))
-        
         page = 1
+        total_listings = None
 
         while True:
             print(f"Scraping page {page}...")
 
-            vehicle_cards = driver.find_elements(By.XPATH, '//*[@id="result-Container"]/section/ul/li')
-
-            for i, card in enumerate(vehicle_cards):
-                try:
-                    title = card.find_element(By.XPATH, './/a/h2').text
-                    link = card.find_element(By.XPATH, './/a').get_attribute("href")
-                    img = card.find_element(By.XPATH, './/img').get_attribute("src")
-
-                    # Dynamically build XPath based on position
-                    base_xpath = f'//*[@id="result-Container"]/section/ul/li[{i+1}]/div[2]/div[2]/div[3]/div'
-
-                    try:
-                        odometer = driver.find_element(By.XPATH, base_xpath + '/div[1]/div[2]').text
-                    except:
-                        odometer = None
-
-                    try:
-                        colour = driver.find_element(By.XPATH, base_xpath + '/div[2]/div[2]').text
-                    except:
-                        colour = None
-
-                    try:
-                        transmission = driver.find_element(By.XPATH, base_xpath + '/div[3]/div[2]').text
-                    except:
-                        transmission = None
-
-                    try:
-                        engine = driver.find_element(By.XPATH, base_xpath + '/div[4]/div[2]').text
-                    except:
-                        engine = None
-
-                    try:
-                        body = driver.find_element(By.XPATH, base_xpath + '/div[5]/div[2]').text
-                    except:
-                        body = None
-
-                    try:
-                        fuel = driver.find_element(By.XPATH, base_xpath + '/div[6]/div[2]').text
-                    except:
-                        fuel = None
-
-                    try:
-                        wovr = driver.find_element(By.XPATH, base_xpath + '/div[7]/div[2]').text
-                    except:
-                        wovr = None
-
-                    try:
-                        seller_type = driver.find_element(By.XPATH, base_xpath + '/div[9]/div[2]').text
-                    except:
-                        seller_type = None
-
-                    listings.append({
-                        "title": title,
-                        "link": link,
-                        "img": img,
-                        "vendor": "Manheim",
-                        "odometer": odometer,
-                        "colour": colour,
-                        "transmission": transmission,
-                        "engine": engine,
-                        "body": body,
-                        "fuel": fuel,
-                        "wovr": wovr,
-                        "seller_type": seller_type
-                    })
-
-                except:
-                    continue
+            data = driver.execute_script(EXTRACT_JS, SPEC_ROWS)
+            if total_listings is None:
+                total_listings = _to_int(data["total"])
+                if total_listings is None:
+                    raise NoSuchElementException("manheim result total not found")
+            for card in data["cards"]:
+                listings.append({**card, "vendor": "Manheim"})
 
             # Pagination check
-            count_text = driver.find_element(By.XPATH, '//*[@id="result-Container"]/nav[1]/div/div[1]/span/span[1]').text
-            current_total = int(count_text.split("-")[1].replace(",", ""))
-
-            if current_total >= total_listings:
+            current_total = _to_int((data["range"] or "").split("-")[-1])
+            if current_total is None or current_total >= total_listings:
                 print("Reached last page. Ending scrape.")
                 break
 
@@ -109,6 +78,4 @@ def scrape_manheim(make=None):
                 print("No next page button found. Ending scrape.")
                 break
 
-    finally:
-        driver.quit()
-    return listings
\ No newline at end of file
+    return listings
@@ -13,6 +13,8 @@ from urllib.parse import urlencode, urljoin, quote
 import httpx
 from bs4 import BeautifulSoup
 
+from engine.scraper import http_replay, parse_pool, robots
+from engine.scraper.throttle import RateLimiter
 
 BASE = "https://www.pickles.com.au"
 _AU_STATES = {"nsw", "qld", "vic", "sa", "wa", "tas", "act", "nt"}
@@ -199,11 +201,17 @@ def _has_anti_bot(html: str) -> bool:
 
 
 def fetch_html(url: str, debug: bool = False) -> str:
+    robots.check(url)
     last_err: Optional[str] = None
     for i, ua in enumerate(_UA_ROTATE[:2]):  # single retry with a different UA
         headers = _client_headers(ua)
         try:
-            with httpx.Client(headers=headers, follow_redirects=True, timeout=15.0) as client:
+            with httpx.Client(
+                headers=headers,
+                follow_redirects=True,
+                timeout=15.0,
+                transport=http_replay.transport(),
+            ) as client:
                 # Warmup to set cookies
                 try:
                     client.get(BASE, headers=headers)
@@ -251,6 +259,8 @@ def _abs(href: str) -> str:
 
 
 def _page_delay_seconds() -> float:
+    if http_replay.is_replay():
+        return 0.0
     try:
         min_ms = int(os.getenv("PICKLES_PAGE_DELAY_MIN_MS", "400"))
         max_ms = int(os.getenv("PICKLES_PAGE_DELAY_MAX_MS", "800"))
@@ -258,7 +268,7 @@ def _page_delay_seconds() -> float:
         min_ms, max_ms = 400, 800
     if max_ms < min_ms:
         max_ms = min_ms
-    return random.uniform(min_ms, max_ms) / 1000.0
+    return max(random.uniform(min_ms, max_ms) / 1000.0, robots.crawl_delay(BASE + "/"))
 
 
 def _price_from_text(text: Optional[str]) -> Optional[int]:
@@ -1416,32 +1426,59 @@ def _hydrate_detail(url: str, debug: bool = False) -> Dict[str, Any]:
     return _parse_detail_html(html, debug=debug)
 
 
+def _parse_detail_bytes(body: bytes, encoding: Optional[str], debug: bool = False) -> Dict[str, Any]:
+    """Parse-pool entry point: raw response bytes in, plain detail dict out."""
+    return _parse_detail_html(body.decode(encoding or "utf-8", errors="replace"), debug=debug)
+
+
 async def _async_hydrate_many(urls: List[str], concurrency: int, debug: bool = False) -> Dict[str, Dict[str, Any]]:
+    """Fetch detail pages concurrently; parsing runs in the shared parse pool (PARSE_WORKERS)."""
     if concurrency <= 0:
         concurrency = 1
     results: Dict[str, Dict[str, Any]] = {}
     headers = _client_headers(_UA_ROTATE[0])
     timeout = httpx.Timeout(15.0)
     sem = asyncio.Semaphore(concurrency)
+    # Spaces request starts across all detail tasks (never closer than the robots Crawl-delay)
+    limiter = RateLimiter.from_env(
+        await robots.crawl_delay_async(BASE + "/"), "PICKLES_HYDRATE_DELAY_MIN_MS", "PICKLES_HYDRATE_DELAY_MAX_MS", (300, 600)
+    )
 
     async def fetch_one(client: httpx.AsyncClient, url: str) -> Dict[str, Any]:
+        if not await robots.allowed_async(url):
+            if debug:
+                print(f"DEBUG pickles hydrate skip (robots): url={url}")
+            return {}
+        resp: Optional[httpx.Response] = None
         for attempt in range(2):
             try:
                 async with sem:
-                    await asyncio.sleep(random.uniform(0.3, 0.6))
+                    await limiter.wait()
                     resp = await client.get(url)
                 resp.raise_for_status()
-                return _parse_detail_html(resp.text, debug=debug)
+                break
             except Exception as exc:
+                resp = None
                 if debug:
                     print(f"DEBUG pickles hydrate error: url={url} attempt={attempt + 1} err={exc}")
                 if attempt == 0:
                     await asyncio.sleep(0.6 + random.uniform(0.2, 0.4))
-                    continue
-                return {}
-        return {}
-
-    async with httpx.AsyncClient(headers=headers, follow_redirects=True, timeout=timeout) as client:
+        if resp is None:
+            return {}
+        # The fetch slot is already released; other pages download while this one parses
+        try:
+            return await parse_pool.parse(_parse_detail_bytes, resp.content, resp.encoding, debug)
+        except Exception as exc:
+            if debug:
+                print(f"DEBUG pickles hydrate parse error: url={url} err={exc}")
+            return {}
+
+    async with httpx.AsyncClient(
+        headers=headers,
+        follow_redirects=True,
+        timeout=timeout,
+        transport=http_replay.async_transport(),
+    ) as client:
         tasks = {url: asyncio.create_task(fetch_one(client, url)) for url in urls}
         for url, task in tasks.items():
             try:
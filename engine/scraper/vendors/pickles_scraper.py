@@ -1,21 +1,74 @@
-from ..common_utils import setup_chrome_driver, random_delay
+from .. import driver_pool
+from ..common_utils import random_delay
 from selenium.webdriver.common.by import By
 from selenium.common.exceptions import NoSuchElementException
-import time
 
-def scrape_pickles(make=None):
-    driver = setup_chrome_driver(headless=True)
-    listings = []
+ICON_MAP = {
+    "pds-icon-feat-cyl-engine": "engine",
+    "pds-icon-feat-transmission": "transmission",
+    "pds-icon-feat-wovr": "wovr",
+    "pds-icon-feat-odo": "odometer",
+    "pds-icon-feat-built": "year_model",
+}
 
-    ICON_MAP = {
-        "pds-icon-feat-cyl-engine": "engine",
-        "pds-icon-feat-transmission": "transmission",
-        "pds-icon-feat-wovr": "wovr",
-        "pds-icon-feat-odo": "odometer",
-        "pds-icon-feat-built": "year_model",
+# One round trip per page: title/link/img and key features (icon class + value) for every card
+EXTRACT_JS = """
+const one = (ctx, path) =>
+  document.evaluate(path, ctx, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+const all = (ctx, path) => {
+  const snap = document.evaluate(path, ctx, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+  const out = [];
+  for (let i = 0; i < snap.snapshotLength; i++) out.push(snap.snapshotItem(i));
+  return out;
+};
+const cards = [];
+for (const card of all(document, '//*[@id="product-search-id"]/div/div')) {
+  const title = one(card, './/*[starts-with(@id, "ps-ct-title-wrapper-")]/header/h2[1]/span');
+  const link = one(card, './/*[starts-with(@id, "ps-ccg-product-card-link-")]');
+  const img = one(card, './/*[starts-with(@id, "ps-ci-img-wrapper-")]/div/div[1]/div/div[1]/img');
+  if (!title || !link || !img) continue;
+  const features = [];
+  for (const feature of all(card, './/*[starts-with(@id, "ps-ckf-key-features-")]/div')) {
+    const icon = one(feature, './/span[contains(@class, "pds-icon-feat-")]');
+    const spans = all(feature, ".//span");
+    if (icon && spans.length > 1) {
+      features.push([icon.getAttribute("class") || "", (spans[1].innerText || "").trim()]);
     }
+  }
+  cards.push({
+    title: (title.innerText || "").trim(),
+    link: link.href || link.getAttribute("href"),
+    img: img.src || img.getAttribute("src"),
+    features: features,
+  });
+}
+return cards;
+"""
+
+
+def _vehicle_data(card):
+    vehicle_data = {
+        "title": card["title"],
+        "link": card["link"],
+        "img": card["img"],
+        "vendor": "Pickles",
+        "engine": None,
+        "transmission": None,
+        "wovr": None,
+        "odometer": None,
+        "year_model": None,
+    }
+    for icon_class, value in card["features"]:
+        for icon_key, data_key in ICON_MAP.items():
+            if icon_key in icon_class:
+                vehicle_data[data_key] = value
+                break
+    return vehicle_data
+
 
-    try:
+def scrape_pickles(make=None):
+    listings = []
+    with driver_pool.driver() as driver:
         if make:
             url = f"https://www.pickles.com.au/used/search/lob/salvage/items/{make}?page=1&limit=120"
         else:
@@ -29,44 +82,8 @@ def scrape_pickles(make=None):
         while True:
             print(f"Scraping page {page}...")
 
-            vehicle_cards = driver.find_elements(By.XPATH, '//*[@id="product-search-id"]/div/div')
-            for card in vehicle_cards:
-                try:
-                    title = card.find_element(By.XPATH, './/*[starts-with(@id, "ps-ct-title-wrapper-")]/header/h2[1]/span').text
-                    link = card.find_element(By.XPATH, './/*[starts-with(@id, "ps-ccg-product-card-link-")]').get_attribute("href")
-                    img = card.find_element(By.XPATH, './/*[starts-with(@id, "ps-ci-img-wrapper-")]/div/div[1]/div/div[1]/img').get_attribute("src")
-                    
-                    vehicle_data = {
-                        "title": title,
-                        "link": link,
-                        "img": img,
-                        "vendor": "Pickles",
-                        "engine": None,
-                        "transmission": None,
-                        "wovr": None,
-                        "odometer": None,
-                        "year_model": None
-                    }
-
-                    # Find ALL potential key feature containers
-                    key_feature_containers = card.find_elements(By.XPATH, './/*[starts-with(@id, "ps-ckf-key-features-")]/div')
-
-                    for feature in key_feature_containers:
-                        try:
-                            icon_span = feature.find_element(By.XPATH, './/span[contains(@class, "pds-icon-feat-")]')
-                            content_span = feature.find_elements(By.XPATH, './/span')[1]  # The second span holds the value
-                            
-                            for icon_key, data_key in ICON_MAP.items():
-                                if icon_key in icon_span.get_attribute("class"):
-                                    vehicle_data[data_key] = content_span.text.strip()
-                                    break
-                        except:
-                            continue
-
-                    listings.append(vehicle_data)
-
-                except:
-                    continue
+            for card in driver.execute_script(EXTRACT_JS):
+                listings.append(_vehicle_data(card))
 
             try:
                 next_button = driver.find_element(By.XPATH, '//*[@id="ps-ch-right-btn"]')
@@ -81,6 +98,4 @@ def scrape_pickles(make=None):
             except (NoSuchElementException, IndexError):
                 break
 
-    finally:
-        driver.quit()
-    return listings
\ No newline at end of file
+    return listings
@@ -0,0 +1,154 @@
+"""
+Normalizer throughput benchmark on synthetic vendor rows (no network, no DB).
+
+Usage:
+  python -m engine.scripts.bench_normalize --rows 100000
+  python -m engine.scripts.bench_normalize --rows 100000 --vendors pickles,gumtree --repeat 3
+
+Prints rows/sec per vendor for the per-row normalizer loop and, when
+available, the batch ``normalize_many`` API.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from typing import Any, Callable, Dict, List
+
+from engine.scraper import normalize as norm
+
+
+_MAKES = [
+    ("toyota", ["corolla", "hilux", "camry", "rav4", "landcruiser"]),
+    ("mazda", ["cx-5", "mazda3", "bt-50"]),
+    ("ford", ["ranger", "falcon", "everest"]),
+    ("hyundai", ["i30", "tucson"]),
+    ("mercedes-benz", ["c-class", "gle"]),
+]
+_STATES = ["ACT", "NSW", "NT", "QLD", "SA", "TAS", "VIC", "WA"]
+_SUBURBS = ["Woolloongabba", "Parramatta", "Dandenong", "Salisbury", "Osborne Park", "Winnellie"]
+
+
+def _pickles_row(rng: random.Random, i: int) -> Dict[str, Any]:
+    make, models = rng.choice(_MAKES)
+    model = rng.choice(models)
+    year = rng.randint(1998, 2025)
+    state = rng.choice(_STATES)
+    sid = f"{rng.randint(10**7, 10**8 - 1)}{i}"
+    return {
+        "url": f"https://www.pickles.com.au/used/details/cars/{year}-{make}-{model}/{sid}",
+        "source_id_guess": sid,
+        "title": f"{year} {make.title()} {model.title()} Ascent Sport",
+        "price_str": f"${rng.randint(1, 90)},{rng.randint(0, 999):03d}",
+        "price": None,
+        "thumb": f"//cdn.pickles.com.au/img/{sid}.jpg",
+        "location": f"{rng.choice(_SUBURBS)} {state}",
+        "state": state.lower(),
+        "sale_method": rng.choice(["Buy Now", "auction", None]),
+        "year_guess": str(year),
+        "make_guess": make,
+        "model_guess": model,
+        "odometer_km": f"{rng.randint(1000, 300000):,} km",
+        "transmission": "Automatic",
+        "fuel_type": "petrol",
+        "body_type": "sedan",
+        "engine_size_l": 2.0,
+    }
+
+
+def _autotrader_row(rng: random.Random, i: int) -> Dict[str, Any]:
+    make, models = rng.choice(_MAKES)
+    model = rng.choice(models)
+    year = rng.randint(1975, 2027)
+    state = rng.choice(_STATES)
+    ad_id = str(10**7 + i)
+    return {
+        "url": f"https://www.autotrader.com.au/car/{ad_id}/{make}/{model}/{state.lower()}/",
+        "ad_id": ad_id,
+        "title": f"{year} {make.title()} {model.title()}",
+        "price_str": f"${rng.randint(2, 120)},{rng.randint(0, 999):03d}",
+        "thumb": f"https://img.autotrader.com.au/{ad_id}.jpg",
+        "location": f"{rng.choice(_SUBURBS)}, {state}",
+        "make_guess": make,
+        "model_guess": model,
+        "state_guess": state,
+        "year_guess": None if i % 3 else str(year),
+    }
+
+
+def _gumtree_row(rng: random.Random, i: int) -> Dict[str, Any]:
+    make, models = rng.choice(_MAKES)
+    model = rng.choice(models)
+    year = rng.randint(1990, 2025)
+    ad_id = str(1_300_000_000 + i)
+    return {
+        "url": f"https://www.gumtree.com.au/s-ad/{rng.choice(_SUBURBS).lower()}/cars-vans-utes/{year}-{make}-{model}/{ad_id}",
+        "title": f"{year} {make.title()} {model.title()} low kms",
+        "price_str": f"$ {rng.randint(2, 60)},{rng.randint(0, 999):03d}",
+        "location": f"{rng.choice(_SUBURBS)}, {rng.choice(_STATES)}",
+        "thumb": f"https://i.ebayimg.com/{ad_id}.jpg",
+        "ad_id": ad_id,
+        "vendor": "Gumtree",
+    }
+
+
+_GENERATORS: Dict[str, Callable[[random.Random, int], Dict[str, Any]]] = {
+    "pickles": _pickles_row,
+    "autotrader": _autotrader_row,
+    "gumtree": _gumtree_row,
+}
+
+
+def synthetic_rows(vendor: str, n: int, seed: int = 7) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    gen = _GENERATORS[vendor]
+    return [gen(rng, i) for i in range(n)]
+
+
+def _time_best(fn: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(max(1, repeat)):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main(argv: List[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description="Normalizer throughput benchmark")
+    p.add_argument("--rows", type=int, default=100_000, help="Synthetic rows per vendor (default 100000)")
+    p.add_argument("--vendors", type=str, default="pickles,autotrader,gumtree", help="Comma-separated vendors")
+    p.add_argument("--repeat", type=int, default=3, help="Take the best of N runs (default 3)")
+    args = p.parse_args(argv)
+
+    vendors = [v.strip() for v in args.vendors.split(",") if v.strip()]
+    batch = getattr(norm, "normalize_many", None)
+    for vendor in vendors:
+        if vendor not in _GENERATORS:
+            print(f"error: no synthetic generator for {vendor}")
+            return 2
+        rows = synthetic_rows(vendor, args.rows)
+        row_fn = getattr(norm, f"normalize_{vendor}")
+
+        # Mirrors the orchestrator loop; normalizers only canonicalize rows in place, so reuse is safe
+        def per_row() -> List[Dict[str, Any]]:
+            out: List[Dict[str, Any]] = []
+            for r in rows:
+                try:
+                    out.append(row_fn(r))
+                except ValueError:
+                    pass
+            return out
+
+        dt = _time_best(per_row, args.repeat)
+        print(f"bench vendor={vendor} rows={len(rows)} mode=per_row secs={dt:.3f} rows_per_sec={len(rows) / dt:,.0f}")
+        if batch is not None:
+            dt = _time_best(lambda: batch(vendor, rows), args.repeat)
+            print(f"bench vendor={vendor} rows={len(rows)} mode=normalize_many secs={dt:.3f} rows_per_sec={len(rows) / dt:,.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+"""
+Saved-search matching benchmark: PredicateIndex vs scanning every search.
+
+Usage:
+  python -m engine.scripts.bench_predicate_index --searches 10000 --listings 10000
+
+Listings come from the synthetic vendor rows in bench_normalize, run through the
+real normalizers. The naive scan is timed on a sample (--scan-sample) and its
+results are checked against the index.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from typing import List
+
+from engine.alerts.predicate_index import PredicateIndex
+from engine.alerts.saved_search import SavedSearch
+from engine.scraper import normalize as norm
+from engine.scripts.bench_normalize import _MAKES, _STATES, synthetic_rows
+
+
+def synthetic_searches(n: int, seed: int = 11) -> List[SavedSearch]:
+    rng = random.Random(seed)
+    out: List[SavedSearch] = []
+    for i in range(n):
+        make, models = rng.choice(_MAKES)
+        lo = rng.choice([None, rng.randrange(2000, 60000, 1000)])
+        hi = rng.choice([None, (lo or 0) + rng.randrange(5000, 60000, 1000)])
+        y0 = rng.choice([None, None, rng.randint(2000, 2022)])
+        out.append(
+            SavedSearch(
+                id=f"s{i}",
+                make=make if rng.random() < 0.9 else None,
+                model=rng.choice(models) if rng.random() < 0.6 else None,
+                state=rng.choice(_STATES) if rng.random() < 0.5 else None,
+                price_min=lo,
+                price_max=hi,
+                year_min=y0,
+                year_max=(y0 + rng.randint(0, 8)) if y0 and rng.random() < 0.5 else None,
+            )
+        )
+    return out
+
+
+def main(argv: List[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description="Saved-search predicate index benchmark")
+    p.add_argument("--searches", type=int, default=10_000)
+    p.add_argument("--listings", type=int, default=10_000)
+    p.add_argument("--scan-sample", type=int, default=500, help="Listings to time/verify with the naive scan")
+    args = p.parse_args(argv)
+
+    searches = synthetic_searches(args.searches)
+    per_vendor = max(1, args.listings // 2)
+    listings = norm.normalize_many("pickles", synthetic_rows("pickles", per_vendor))[0]
+    listings += norm.normalize_many("autotrader", synthetic_rows("autotrader", args.listings - per_vendor))[0]
+
+    t0 = time.perf_counter()
+    index = PredicateIndex(searches)
+    build = time.perf_counter() - t0
+
+    lat: List[float] = []
+    total = 0
+    for listing in listings:
+        t = time.perf_counter()
+        total += len(index.match(listing))
+        lat.append(time.perf_counter() - t)
+    lat.sort()
+    q_total = sum(lat)
+    print(
+        f"bench index searches={len(searches)} listings={len(listings)} build_ms={build * 1000:.1f} "
+        f"matches={total} total_s={q_total:.3f} mean_us={q_total / len(lat) * 1e6:.1f} "
+        f"p50_us={lat[len(lat) // 2] * 1e6:.1f} p99_us={lat[int(len(lat) * 0.99)] * 1e6:.1f}"
+    )
+
+    sample = listings[: args.scan_sample]
+    t0 = time.perf_counter()
+    naive = [sorted(s.id for s in searches if s.matches(l)) for l in sample]
+    scan = time.perf_counter() - t0
+    mismatches = sum(1 for l, expect in zip(sample, naive) if sorted(index.match(l)) != expect)
+    print(
+        f"bench naive_scan sample={len(sample)} mean_us={scan / len(sample) * 1e6:.1f} "
+        f"est_total_s={scan / len(sample) * len(listings):.1f} mismatches={mismatches}"
+    )
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from engine.API.models.saved_search import SavedSearchIn
+from engine.API.routes import saved_search_routes as routes
+from engine.alerts import evaluator, store
+from engine.alerts.predicate_index import IntervalTree, PredicateIndex
+from engine.alerts.saved_search import SavedSearch
+from engine.integrations.seen_store import SeenStore
+
+
+def _listing(sid, make="Toyota", model="Hilux", state="QLD", price=35000, year=2018):
+    return {"source": "pickles", "source_id": sid, "source_url": f"https://x/{sid}", "make": make, "model": model, "state": state, "price": price, "year": year}
+
+
+SEARCHES = [
+    SavedSearch("hilux-qld", make="toyota", model="HILUX", state="qld", price_max=40000),
+    SavedSearch("any-toyota", make="Toyota", year_min=2015),
+    SavedSearch("cheap-nsw", state="NSW", price_max=10000),
+    SavedSearch("mazda", make="Mazda"),
+]
+
+
+def test_index_matches_same_as_scanning_every_search():
+    index = PredicateIndex(SEARCHES)
+    listings = [
+        _listing("1"),
+        _listing("2", price=45000),
+        _listing("3", state="NSW", price=9000, year=2010),
+        _listing("4", make="Mazda", model="CX-5", price=None),
+    ]
+    for l in listings:
+        assert sorted(index.match(l)) == sorted(s.id for s in SEARCHES if s.matches(l))
+    assert sorted(index.match(listings[0])) == ["any-toyota", "hilux-qld"]
+
+
+def test_evaluate_batch_alerts_once_per_listing_and_price(tmp_path, capsys):
+    index = PredicateIndex(SEARCHES[:1])
+    with SeenStore(str(tmp_path / "alerts.sqlite3")) as seen:
+        first = evaluator.evaluate_batch([_listing("1"), _listing("2", model="Corolla")], index=index, seen=seen)
+        assert (first["matches"], first["alerts"]) == (1, 1)
+        assert "alert search=hilux-qld" in capsys.readouterr().out
+        assert evaluator.evaluate_batch([_listing("1")], index=index, seen=seen)["alerts"] == 0
+        # Price drop on the same listing alerts again
+        assert evaluator.evaluate_batch([_listing("1", price=33000)], index=index, seen=seen)["alerts"] == 1
+
+
+def test_interval_tree_stab_matches_linear_scan():
+    import random
+
+    rng = random.Random(3)
+    ivs = []
+    for p in range(400):
+        lo = rng.choice([float("-inf"), rng.randint(0, 90000)])
+        hi = rng.choice([float("inf"), (lo if lo != float("-inf") else 0) + rng.randint(0, 40000)])
+        ivs.append((lo, hi, p))
+    tree = IntervalTree(ivs)
+    for x in [0, 500, 12345, 50000, 89999, 150000] + [rng.randint(0, 130000) for _ in range(200)]:
+        assert sorted(tree.stab(x)) == [p for lo, hi, p in ivs if lo <= x <= hi]
+
+
+def test_saved_search_routes_accept_zero_bounds_and_reject_bad_ids(monkeypatch):
+    monkeypatch.setattr(store, "create_search", lambda fields: SavedSearch("s1", price_max=fields["price_max"]))
+    assert asyncio.run(routes.create_saved_search(SavedSearchIn(price_max=0)))["price_max"] == 0
+    with pytest.raises(HTTPException) as err:
+        asyncio.run(routes.create_saved_search(SavedSearchIn(make="  ")))
+    assert err.value.status_code == 422
+    with pytest.raises(HTTPException) as err:
+        asyncio.run(routes.delete_saved_search("not-a-uuid"))
+    assert err.value.status_code == 404
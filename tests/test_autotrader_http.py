@@ -0,0 +1,44 @@
+import httpx
+
+from engine.scraper import parse_pool
+from engine.scraper.vendors import autotrader_http as at
+
+
+def _page(ids):
+    tiles = "".join(
+        f'<div><div><div><a href="/car/{i}/toyota/corolla/qld/ascent?x=1">2019 Toyota Corolla</a>'
+        f"<span>$18,990 QLD</span></div></div></div>"
+        for i in ids
+    )
+    return f"<html><body>{tiles}</body></html>"
+
+
+def test_multi_page_search_dedupes_and_streams(monkeypatch):
+    pages = {1: _page([1, 2, 3]), 2: _page([3, 4]), 3: _page([5])}
+    seen_urls = []
+
+    def handler(request):
+        seen_urls.append(str(request.url))
+        n = int(request.url.params.get("page", "1"))
+        if n not in pages:
+            return httpx.Response(404)
+        return httpx.Response(200, text=pages[n], headers={"content-type": "text/html"})
+
+    monkeypatch.setattr(at.http_replay, "async_transport", lambda inner=None, **kw: httpx.MockTransport(handler))
+    monkeypatch.setattr(at.http_replay, "is_replay", lambda: True)
+    parse_pool.configure(0)
+    streamed = []
+    try:
+        rows, stats = at.search_autotrader("Toyota", "Corolla", "QLD", pages=5, on_page=lambda n, r: streamed.append((n, len(r))))
+        limited, _ = at.search_autotrader("Toyota", "Corolla", "QLD", pages=3, limit=4)
+    finally:
+        parse_pool.configure(None)
+    assert [r["ad_id"] for r in rows] == ["1", "2", "3", "4", "5"]
+    assert streamed == [(1, 3), (2, 1), (3, 1)]
+    assert stats["pages_walked"] == 3 and stats["dropped_duplicate"] == 1
+    assert [r["ad_id"] for r in limited] == ["1", "2", "3", "4"]
+
+
+def test_untitled_tile_does_not_crash():
+    rows = at.parse_list('<a href="/car/7/mazda/cx-5/vic/"></a>', limit=5)
+    assert rows[0]["title"] == "Mazda Cx 5" and rows[0]["year_guess"] is None
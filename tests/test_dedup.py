@@ -0,0 +1,77 @@
+from engine.db import dedup
+
+
+def _row(source, sid, price, odometer, **kw):
+    row = {"source": source, "source_id": sid, "make": "Toyota", "model": "Corolla", "year": 2019, "price": price, "odometer": odometer, "state": "QLD"}
+    row.update(kw)
+    return row
+
+
+def test_band_edge_duplicates_cluster_across_vendors():
+    # 24,990 and 25,100 sit in different price and odometer bands, so fingerprints differ
+    a = _row("pickles", "P1", 24990, 49900)
+    b = _row("autotrader", "A1", 25100, 50300, make="TOYOTA")
+    c = _row("gumtree", "G1", 25000, 50000)
+    assert dedup.make_fingerprint(a) != dedup.make_fingerprint(b)
+
+    index = dedup.DedupIndex()
+    for r in (a, b, c, _row("gumtree", "G2", 25000, 180000, model="Camry")):
+        index.add(r)
+    assert index.link() == 3
+    assert [sorted(m) for m in index.clusters()] == [[0, 1, 2]]
+    ids = index.assign_cluster_ids()
+    assert set(ids) == {("pickles", "P1"), ("autotrader", "A1"), ("gumtree", "G1")}
+    assert len(set(ids.values())) == 1
+
+
+def test_same_vendor_and_distant_rows_do_not_match():
+    assert dedup.score_pair(_row("pickles", "P1", 20000, 60000), _row("pickles", "P2", 20000, 60000)) == 0.0
+    assert dedup.score_pair(_row("pickles", "P1", 20000, 60000), _row("gumtree", "G1", 20000, 95000)) < dedup.MATCH_THRESHOLD
+
+
+def test_incremental_batch_keeps_existing_cluster_id():
+    index = dedup.DedupIndex()
+    index.add(_row("pickles", "P1", 18000, 70000, cluster_id="c_existing"))
+    index.add(_row("autotrader", "A1", 18000, 70500, cluster_id="c_existing"))
+    new = index.add(_row("gumtree", "G1", 18200, 71000))
+    index.link([new])
+    assert index.assign_cluster_ids() == {("gumtree", "G1"): "c_existing"}
+
+
+class _Cur:
+    def __init__(self):
+        self.calls = []
+
+    def executemany(self, sql, params):
+        self.calls.append((" ".join(sql.split()), list(params)))
+
+
+def test_bridging_row_moves_the_losing_cluster_everywhere():
+    index = dedup.DedupIndex()
+    index.add(_row("pickles", "P1", 18000, 70000, cluster_id="c_a"))
+    index.add(_row("autotrader", "A1", 18400, 70000, cluster_id="c_b"))
+    new = index.add(_row("gumtree", "G1", 18200, 70000))
+    index.link([new])
+    assert index.merged_ids() == {"c_a": ["c_b"]}
+
+    cur = _Cur()
+    dedup._write_cluster_ids(cur, index.assign_cluster_ids(), index.merged_ids())
+    assert cur.calls[1] == ("update listings set cluster_id = %s where cluster_id = any(%s)", [("c_a", ["c_b"])])
+
+
+def test_rebuild_clears_ids_on_rows_that_no_longer_match():
+    index = dedup.DedupIndex()
+    index.add(_row("pickles", "P1", 18000, 70000, cluster_id="c_old"))
+    index.add(_row("autotrader", "A1", 30000, 150000, cluster_id="c_old"))
+    index.link()
+    assert index.assign_cluster_ids() == {} and index.merged_ids() == {}
+    assert index.unclustered() == [("pickles", "P1"), ("autotrader", "A1")]
+
+    cur = _Cur()
+    dedup._write_cluster_ids(cur, {}, {}, index.unclustered())
+    assert cur.calls == [
+        (
+            "update listings set cluster_id = null where source = %s and source_id = %s",
+            [("pickles", "P1"), ("autotrader", "A1")],
+        )
+    ]
@@ -0,0 +1,50 @@
+import pytest
+
+from engine.scraper.driver_pool import DriverPool
+
+
+class FakeDriver:
+    def __init__(self, n):
+        self.n = n
+        self.dead = False
+        self.quit_called = False
+
+    @property
+    def current_window_handle(self):
+        if self.dead:
+            raise RuntimeError("session gone")
+        return "w"
+
+    def quit(self):
+        self.quit_called = True
+
+
+def test_reuse_recycle_and_dead_driver_replacement():
+    made = []
+
+    def factory():
+        made.append(FakeDriver(len(made)))
+        return made[-1]
+
+    pool = DriverPool(factory=factory, size=1, max_uses=3)
+    for _ in range(3):
+        with pool.driver() as d:
+            assert d is made[0]
+    # Retired after max_uses borrows
+    assert made[0].quit_called and len(made) == 1
+    with pool.driver() as d:
+        assert d is made[1]
+    made[1].dead = True
+    with pool.driver() as d:
+        assert d is made[2]
+    assert made[1].quit_called
+
+    with pytest.raises(ValueError):
+        with pool.driver() as d:
+            d.dead = True
+            raise ValueError("page blew up")
+    # The crashed driver is not handed out again
+    with pool.driver() as d:
+        assert d is made[3]
+    pool.close()
+    assert made[3].quit_called
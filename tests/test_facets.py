@@ -0,0 +1,35 @@
+from engine.db.facets import price_label, shape, signature
+
+
+def _row(n, grouped, make=None, state=None, body=None, bucket=None):
+    # grouping(col) is 0 for the columns in the row's grouping set
+    row = {"g_make": 1, "g_state": 1, "g_body": 1, "g_price": 1}
+    row.update({g: 0 for g in grouped})
+    row.update(make=make, state=state, body=body, price_bucket=bucket, n=n)
+    return row
+
+
+def test_shape_splits_grouping_sets():
+    rows = [
+        _row(7, ("g_make",), make="Toyota"),
+        _row(9, ("g_make",), make="Mazda"),
+        _row(16, ("g_state",), state="QLD"),
+        _row(4, ("g_price",), bucket=9),
+        _row(2, ("g_price",), bucket=None),
+        _row(10, ("g_price",), bucket=0),
+        _row(16, ()),
+    ]
+    out = shape(rows)
+    assert out["total"] == 16
+    assert [v["value"] for v in out["make"]] == ["Mazda", "Toyota"]
+    assert out["state"] == [{"value": "QLD", "count": 16}]
+    assert out["price"] == [
+        {"value": "0-5000", "count": 10},
+        {"value": "100000+", "count": 4},
+        {"value": None, "count": 2},
+    ]
+    assert price_label(4) == "20000-30000"
+
+
+def test_signature_ignores_unset_filters_and_order():
+    assert signature({"make": "Toyota", "state": None, "km": 50}) == signature({"km": 50, "make": "Toyota"})
@@ -0,0 +1,24 @@
+from engine.scraper.geo import Centroids, bounding_box, haversine_km
+
+
+def test_centroid_lookup_prefers_suburb_and_averages_postcodes():
+    table = Centroids(
+        [
+            {"postcode": "4000", "suburb": "Brisbane City", "state": "QLD", "lat": "-27.47", "lng": "153.02"},
+            {"postcode": "4000", "suburb": "Spring Hill", "state": "QLD", "lat": "-27.45", "lng": "153.02"},
+            {"postcode": "800", "suburb": "Darwin", "state": "NT", "lat": "-12.46", "lng": "130.85"},
+            {"postcode": "9999", "suburb": "Nowhere", "state": "QLD", "lat": "", "lng": ""},
+        ]
+    )
+    assert table.lookup(suburb="spring  hill", state="qld") == (-27.45, 153.02)
+    assert table.lookup(postcode="4000") == (-27.46, 153.02)
+    assert table.lookup(postcode="0800") == table.lookup(postcode=800) == (-12.46, 130.85)
+    assert table.lookup(postcode="9999") is None
+
+
+def test_bounding_box_encloses_radius():
+    brisbane, gold_coast = (-27.4698, 153.0251), (-28.0023, 153.4145)
+    assert 65 < haversine_km(brisbane, gold_coast) < 75
+    min_lat, min_lng, max_lat, max_lng = bounding_box(brisbane, 100)
+    assert min_lat < gold_coast[0] < max_lat and min_lng < gold_coast[1] < max_lng
+    assert round(max_lat - brisbane[0], 2) == 0.9
@@ -0,0 +1,118 @@
+import pytest
+
+from engine.scraper import http_replay
+from engine.scraper.vendors import gumtree_playwright as gp
+
+
+class FakePage:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class FakeContext:
+    def __init__(self):
+        self.routes = []
+        self.pages = []
+
+    def route(self, pattern, handler):
+        self.routes.append(handler)
+
+    def new_page(self):
+        self.pages.append(FakePage())
+        return self.pages[-1]
+
+    def storage_state(self, path):
+        pass
+
+    def close(self):
+        pass
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.contexts = []
+        self.closed = False
+
+    def new_context(self, **kw):
+        self.contexts.append(FakeContext())
+        return self.contexts[-1]
+
+    def close(self):
+        self.closed = True
+
+
+class FakeRoute:
+    def __init__(self, resource_type):
+        self.request = type("Req", (), {"resource_type": resource_type})()
+        self.calls = []
+
+    def abort(self):
+        self.calls.append("abort")
+
+    def fallback(self):
+        self.calls.append("fallback")
+
+
+def _pool(tmp_path, **kw):
+    browser = FakeBrowser()
+    pool = gp.BrowserPool(storage_state=str(tmp_path / "state.json"), launcher=lambda headless: (None, browser), **kw)
+    return pool, browser
+
+
+def test_pool_rotates_contexts_and_recycles_pages(tmp_path):
+    pool, browser = _pool(tmp_path, size=2, recycle_after=2, block_types=[])
+    used = []
+    for _ in range(5):
+        with pool.page() as page:
+            used.append(page)
+    a, b = browser.contexts
+    # Calls alternate contexts; slot 0 serves its page twice, then replaces it
+    assert used[0] is used[2] is a.pages[0] and used[1] is used[3] is b.pages[0]
+    assert used[4] is a.pages[1] and a.pages[0].closed
+
+    with pytest.raises(RuntimeError):
+        with pool.page() as page:
+            raise RuntimeError("navigation failed")
+    assert page.closed and pool._slots[1]["page"] is None
+    pool.close()
+    assert browser.closed
+
+
+def test_block_route_runs_before_replay_routes_and_falls_back(tmp_path):
+    http_replay.configure("record", str(tmp_path / "rec.jsonl.gz"))
+    try:
+        pool, browser = _pool(tmp_path, size=1)
+        pool.start()
+    finally:
+        http_replay.configure(None, None)
+    # Playwright runs the most recently registered route first
+    replay_handler, block = browser.contexts[0].routes
+    image, document = FakeRoute("image"), FakeRoute("document")
+    block(image)
+    block(document)
+    assert image.calls == ["abort"] and document.calls == ["fallback"]
+
+
+def test_tile_row_maps_extracted_tiles():
+    row = gp._tile_row(
+        {
+            "url": "https://www.gumtree.com.au/s-ad/parramatta/cars-vans-utes/2016-ford-ranger/1300000001",
+            "title": "2016 Ford Ranger",
+            "card_text": "2016 Ford Ranger $25,000 Parramatta, NSW",
+            "thumb": "https://img/1.jpg",
+            "data_ad_id": None,
+        }
+    )
+    assert row == {
+        "url": "https://www.gumtree.com.au/s-ad/parramatta/cars-vans-utes/2016-ford-ranger/1300000001",
+        "title": "2016 Ford Ranger",
+        "price_str": "$25,000",
+        "location": "NSW",
+        "thumb": "https://img/1.jpg",
+        "ad_id": "1300000001",
+        "vendor": "Gumtree",
+    }
+    assert gp._tile_row({"url": "https://x/s-ad/no-id", "data_ad_id": "77"})["ad_id"] == "77"
@@ -0,0 +1,51 @@
+import httpx
+
+from engine.scraper import parse_pool
+from engine.scraper.vendors import gumtree_scraper as gt
+
+
+def _tile(ad_id, price, state):
+    return (
+        f'<article class="user-ad-collection-new-design"><a href="/s-ad/sydney/cars/toyota-corolla/{ad_id}">'
+        f'<img src="https://img/{ad_id}.jpg"></a><a href="/s-ad/sydney/cars/toyota-corolla/{ad_id}">2019 Toyota Corolla</a>'
+        f"<span>${price}</span><span>Parramatta, {state}</span></article>"
+    )
+
+
+def test_parse_tiles_is_card_scoped_and_dedupes_links():
+    html = "<html><body>" + _tile(1001, "18,990", "NSW") + _tile(1002, "9,500", "QLD") + "</body></html>"
+    tiles = gt.parse_tiles(html, limit=10)
+    assert [(t["ad_id"], t["title"], t["price_str"], t["location"]) for t in tiles] == [
+        ("1001", "2019 Toyota Corolla", "$18,990", "NSW"),
+        ("1002", "2019 Toyota Corolla", "$9,500", "QLD"),
+    ]
+    assert tiles[0]["thumb"] == "https://img/1001.jpg"
+
+
+def test_search_reuses_warmup_session_across_calls(monkeypatch):
+    hits = []
+
+    def handler(request):
+        hits.append(request.url.path)
+        if request.url.path == "/":
+            return httpx.Response(200, text="home", headers={"set-cookie": "sid=1; Path=/"})
+        page = int(request.url.params["page"])
+        body = _tile(2000 + page, "10,000", "VIC") if page <= 2 else "<html></html>"
+        return httpx.Response(200, text=body, headers={"content-type": "text/html"})
+
+    monkeypatch.setattr(gt.http_replay, "async_transport", lambda inner=None, **kw: httpx.MockTransport(handler))
+    monkeypatch.setattr(gt.http_replay, "is_replay", lambda: True)
+    monkeypatch.setitem(gt._session, "warmed_at", 0.0)
+    monkeypatch.setitem(gt._session, "cookies", httpx.Cookies())
+    parse_pool.configure(0)
+    try:
+        first = gt.search("Toyota", "Corolla", limit=10, page_limit=3)
+        hits.clear()
+        second = gt.search("Toyota", "Corolla", limit=1, page_limit=3)
+    finally:
+        parse_pool.configure(None)
+    assert [t["ad_id"] for t in first] == ["2001", "2002"]
+    assert [t["ad_id"] for t in second] == ["2001"]
+    # Page 1 already covers the limit, so no later page is requested (and the warmup is reused)
+    assert hits == ["/s-all-items/k0"]
+    assert gt._session["cookies"].get("sid") == "1"
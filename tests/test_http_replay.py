@@ -0,0 +1,70 @@
+import httpx
+import pytest
+
+from engine.scraper import http_replay
+
+
+@pytest.fixture(autouse=True)
+def _reset_mode():
+    yield
+    http_replay.configure(None, None)
+
+
+def test_record_then_replay_roundtrip(tmp_path):
+    archive = tmp_path / "run.jsonl.gz"
+    calls = []
+
+    def handler(request):
+        calls.append(str(request.url))
+        n = len(calls)
+        return httpx.Response(200, headers={"content-type": "text/html"}, text=f"<html>page {n}</html>")
+
+    http_replay.configure("record", str(archive))
+    with httpx.Client(transport=http_replay.transport(httpx.MockTransport(handler))) as client:
+        assert client.get("https://example.com/a?page=1").text == "<html>page 1</html>"
+        assert client.get("https://example.com/a?page=1").text == "<html>page 2</html>"
+    assert http_replay.flush() == 2
+
+    http_replay.configure("replay", str(archive))
+    assert http_replay.is_replay()
+    with httpx.Client(transport=http_replay.transport()) as client:
+        first = client.get("https://example.com/a?page=1")
+        second = client.get("https://example.com/a?page=1")
+        third = client.get("https://example.com/a?page=1")
+        assert first.status_code == 200
+        assert first.headers["content-type"] == "text/html"
+        assert [first.text, second.text, third.text] == [
+            "<html>page 1</html>",
+            "<html>page 2</html>",
+            "<html>page 2</html>",
+        ]
+        with pytest.raises(httpx.ConnectError):
+            client.get("https://example.com/unknown")
+    assert len(calls) == 2
+
+
+def test_transport_is_passthrough_when_off():
+    assert http_replay.mode() is None
+    assert http_replay.transport() is None
+    assert http_replay.async_transport() is None
+
+
+def test_inner_transport_keeps_client_settings(tmp_path, monkeypatch):
+    built = []
+    real = httpx.HTTPTransport
+
+    def spy(**kw):
+        built.append(kw)
+        return real(**kw)
+
+    monkeypatch.setattr(httpx, "HTTPTransport", spy)
+    limits = httpx.Limits(max_connections=3, max_keepalive_connections=3)
+    http_replay.configure("record", str(tmp_path / "a.jsonl.gz"))
+    try:
+        t = http_replay.transport(limits=limits, verify=False)
+        with pytest.raises(httpx.HTTPError):
+            t.handle_request(httpx.Request("GET", "http://127.0.0.1:9/"))
+        t.close()
+    finally:
+        http_replay.configure(None, None)
+    assert built == [{"limits": limits, "verify": False}]
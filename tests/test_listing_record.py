@@ -0,0 +1,35 @@
+import json
+
+from engine.scraper import normalize as norm
+from engine.scraper.listing import Listing
+
+
+def test_listing_behaves_like_the_old_dict_rows():
+    row = Listing("gumtree", "123", "https://www.gumtree.com.au/s-ad/x/123", raw={"title": "2015 Mazda 3"})
+    assert not hasattr(row, "__dict__")
+    row["price"] = 9500
+    row["seats"] = 5
+    assert row.price == 9500 and row["seats"] == 5
+    assert "seats" in row and "cylinders" not in row
+    assert row.get("cylinders", 4) == 4
+    d = row.to_dict()
+    assert "body" not in d and d["seats"] == 5 and d["media"] == []
+
+
+def test_raw_json_is_lazy_and_cached():
+    raw = {"title": "2015 Mazda 3", "flags": {"wovr": False}}
+    row = Listing("gumtree", "123", "https://www.gumtree.com.au/s-ad/x/123", raw=raw)
+    assert row._raw_json is None
+    text = row.raw_json
+    assert json.loads(text) == raw and row.raw_json is text
+    assert row.to_row(raw_as_json=True)["raw"] is text
+    row["raw"] = {"title": "changed"}
+    assert json.loads(row.raw_json) == {"title": "changed"}
+
+
+def test_normalizers_return_listing_records():
+    out = norm.normalize_gumtree(
+        {"url": "https://www.gumtree.com.au/s-ad/x/cars/1300000001", "title": "2016 Ford Ranger", "price_str": "$25,000", "location": "Parramatta, NSW"}
+    )
+    assert isinstance(out, Listing)
+    assert (out.year, out.price, out.state) == (2016, 25000, "NSW")
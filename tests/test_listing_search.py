@@ -0,0 +1,58 @@
+import asyncio
+from contextlib import contextmanager
+
+import pytest
+from fastapi import HTTPException
+
+from engine.API.routes import listing_routes as lr
+from engine.db import supabase_client
+
+FILTERS = {k: None for k in ("make", "model", "state", "price_min", "price_max", "year_min", "year_max", "near", "radius_km", "bbox")}
+
+
+def _fake_conn(monkeypatch, executed):
+    class Cur:
+        def execute(self, sql, params):
+            executed.append((sql, params))
+
+        def fetchall(self):
+            return [{"id": 1, "deal_score": 0.1}]
+
+    @contextmanager
+    def conn_cursor(**kw):
+        yield Cur()
+
+    class Conn:
+        cursor = staticmethod(conn_cursor)
+
+    @contextmanager
+    def get_conn():
+        yield Conn()
+
+    monkeypatch.setattr(supabase_client, "get_conn", get_conn)
+    monkeypatch.setattr(lr, "DB_BACKEND", "postgres")
+
+
+def test_search_projects_deal_fields(monkeypatch):
+    executed = []
+    _fake_conn(monkeypatch, executed)
+    monkeypatch.setattr(lr, "DEAL_SCORE", True)
+    monkeypatch.setattr(lr, "_pg_where", lambda f: ([], []))
+    asyncio.run(lr.search_listings("hilux", dict(FILTERS), 20, "id,deal_score"))
+    assert "listing_price_stats s where s.market_key = listings.market_key) as deal_score" in executed[0][0]
+
+    monkeypatch.setattr(lr, "DB_BACKEND", "supabase_api")
+    with pytest.raises(HTTPException) as err:
+        asyncio.run(lr.search_listings("hilux", dict(FILTERS), 20, "id,deal_score"))
+    assert err.value.status_code == 422
+
+
+def test_search_near_selects_distance(monkeypatch):
+    executed = []
+    _fake_conn(monkeypatch, executed)
+    monkeypatch.setattr(lr, "_pg_where", lambda f: (["price <= %s"], [30000]))
+    asyncio.run(lr.search_listings("hilux", {**FILTERS, "near": (-27.47, 153.02)}, 20, "id"))
+    sql, params = executed[0]
+    assert "as distance_km" in sql
+    # Select-list placeholders (distance, then rank) come before the where params
+    assert params == (-27.47, 153.02, "hilux", "hilux", "hilux", "%hilux%", 30000, 20)
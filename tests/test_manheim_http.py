@@ -0,0 +1,82 @@
+import httpx
+
+from engine.scraper import normalize as norm
+from engine.scraper import parse_pool
+from engine.scraper.vendors import manheim_http as mh
+
+
+def _card(i):
+    specs = "".join(f"<div><div>label</div><div>{v}</div></div>" for v in ["45,210 km", "White", "Automatic"])
+    return (
+        f'<li><a href="/damaged-vehicles/{i}/2018-toyota-hilux-sr5-qld-{i}"><h2>2018 Toyota Hilux SR5 QLD</h2></a>'
+        f'<div>x</div><div><div>y</div><div><div>a</div><div>b</div><div><div>{specs}</div></div></div>'
+        f'<img src="https://img.example/{i}.jpg"></div></li>'
+    )
+
+
+def _page(ids, total, next_href=None):
+    pager = f'<div><div></div><div><ul><li><a href="#">1</a></li><li><a href="{next_href}">Next</a></li></ul></div></div>' if next_href else ""
+    return (
+        '<html><body><div id="result-Container">'
+        f'<nav><div><div><span><span>1 - {len(ids)}</span><span>{total:,}</span></span></div>{pager}</div></nav>'
+        f'<section><ul>{"".join(_card(i) for i in ids)}</ul></section></div></body></html>'
+    )
+
+
+def _search(monkeypatch, serve, **kw):
+    requested = []
+
+    def handler(request):
+        requested.append(str(request.url))
+        return httpx.Response(200, text=serve(request.url), headers={"content-type": "text/html"})
+
+    monkeypatch.setattr(mh.http_replay, "async_transport", lambda inner=None, **_: httpx.MockTransport(handler))
+    monkeypatch.setattr(mh.http_replay, "is_replay", lambda: True)
+    parse_pool.configure(0)
+    try:
+        rows, stats = mh.search_manheim("toyota", **kw)
+    finally:
+        parse_pool.configure(None)
+    return [r["link"].rsplit("-", 1)[1] for r in rows], stats, requested
+
+
+def test_parse_page_reads_cards_and_total():
+    parsed = mh.parse_page(_page([11], 1250, "/damaged-vehicles/search?pg=2"))
+    row = parsed["rows"][0]
+    assert parsed["total"] == 1250 and parsed["next_url"] == "https://manheim.com.au/damaged-vehicles/search?pg=2"
+    assert row["link"] == "https://manheim.com.au/damaged-vehicles/11/2018-toyota-hilux-sr5-qld-11"
+    assert (row["odometer"], row["colour"], row["transmission"], row["fuel"]) == ("45,210 km", "White", "Automatic", None)
+    assert norm.normalize_batch("manheim", [row]).ok == 1
+
+
+def test_pages_built_from_pager_link_are_consumed_in_order(monkeypatch):
+    cards = {"1": [1, 2], "2": [2, 3], "3": [4]}
+    next_href = "/damaged-vehicles/search?ManufacturerCode=TOYOTA&RecordsPerPage=120&pg=2"
+    streamed = []
+    links, stats, requested = _search(
+        monkeypatch,
+        lambda url: _page(cards[url.params.get("pg", "1")], 250, next_href),
+        pages=5,
+        on_page=lambda n, r: streamed.append((n, len(r))),
+    )
+    assert links == ["1", "2", "3", "4"]
+    assert streamed == [(1, 2), (2, 1), (3, 1)]
+    assert stats["pages_walked"] == 3 and stats["dropped_duplicate"] == 1 and stats.get("stalled_pages", 0) == 0
+    assert sorted(httpx.URL(u).params.get("pg", "1") for u in requested) == ["1", "2", "3"]
+
+
+def test_page_repeating_page_one_stops_loudly(monkeypatch, capsys):
+    # The pager link is ignored by the server and page 1 comes back again
+    links, stats, _ = _search(monkeypatch, lambda url: _page([1, 2], 250, "/damaged-vehicles/search?pg=2"))
+    assert links == ["1", "2"] and stats["stalled_pages"] == 1
+    assert "page 2 had no new cards" in capsys.readouterr().out
+
+
+def test_next_links_are_followed_without_a_page_parameter(monkeypatch):
+    def serve(url):
+        n = int(url.path.rsplit("/", 1)[1]) if url.path.startswith("/next/") else 1
+        return _page([n], 300, f"/next/{n + 1}")
+
+    links, stats, requested = _search(monkeypatch, serve, pages=3)
+    assert links == ["1", "2", "3"] and stats["pages_walked"] == 3
+    assert [httpx.URL(u).path for u in requested] == ["/damaged-vehicles/search", "/next/2", "/next/3"]
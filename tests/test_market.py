@@ -0,0 +1,37 @@
+from engine.db.market import deal_score, market_key
+
+
+def test_market_key_bands_and_tokens():
+    a = {"make": "Mazda", "model": "CX-5", "year": 2019, "odometer": 60000}
+    b = {"make": "mazda ", "model": "cx5", "year": 2018, "odometer": 74999}
+    assert market_key(a) == market_key(b) == "mazda|cx5|2018|2"
+    # Very high odometers share the top band; unknown year/odometer stay distinct segments
+    assert market_key({"make": "Toyota", "model": "Hilux", "year": 2010, "odometer": 900000}) == "toyota|hilux|2010|12"
+    assert market_key({"make": "Toyota", "model": "Hilux"}) == "toyota|hilux||"
+    assert market_key({"make": "Toyota", "model": None}) is None
+
+
+def test_deal_score_needs_enough_samples():
+    assert deal_score(18000, 20000, n=12) == 0.1
+    assert deal_score(22000, 20000, n=12) == -0.1
+    assert deal_score(18000, 20000, n=2) is None
+    assert deal_score(None, 20000, n=12) is None
+
+
+def test_save_many_refreshes_segments_rows_left(monkeypatch):
+    from engine.db import market, supabase_client
+    from engine.scraper import pipeline
+
+    monkeypatch.setenv("PRICE_STATS_ON_INGEST", "true")
+    monkeypatch.setenv("DB_BACKEND", "postgres")
+
+    def fake_upsert(rows, prev_market_keys=None):
+        prev_market_keys.add("toyota|hilux|2016|4")
+        return len(rows), 0
+
+    refreshed = []
+    monkeypatch.setattr(supabase_client, "upsert_many", fake_upsert)
+    monkeypatch.setattr(market, "refresh_batch", lambda rows, prev: refreshed.append(set(prev)) or {})
+    row = {"source": "pickles", "source_id": "1", "source_url": "https://x/1", "make": "Toyota", "model": "Hilux", "year": 2018}
+    assert pipeline.save_many([row]) == 1
+    assert refreshed == [{"toyota|hilux|2016|4"}]
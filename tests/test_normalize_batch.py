@@ -0,0 +1,57 @@
+import pytest
+
+from engine.scraper import normalize as norm
+
+
+def _pickles_row(sid, price, odometer="50,000 km"):
+    return {
+        "url": f"https://www.pickles.com.au/used/details/cars/2019-toyota-corolla/{sid}",
+        "title": "2019 Toyota Corolla Ascent",
+        "price": price,
+        "odometer_km": odometer,
+        "location": "Eagle Farm QLD",
+        "make_guess": "toyota",
+        "model_guess": "corolla",
+    }
+
+
+def test_pickles_batch_matches_single_row_and_counts_errors():
+    rows = [
+        _pickles_row("A1B2C3D4", 18990),
+        _pickles_row("A1B2C3D5", 99),  # below price floor
+        _pickles_row("A1B2C3D6", 25000, odometer="100,000-150,000 km"),  # garbled odometer
+        {"url": "https://www.pickles.com.au/used/search/cars"},  # not a listing
+    ]
+    res = norm.normalize_batch("pickles", [dict(r) for r in rows])
+    assert (res.ok, res.err) == (3, 1)
+    assert str(res.errors[0][1]) == "non-listing url"
+    assert [r["price"] for r in res.rows] == [18990, None, 25000]
+    assert res.rows[2]["odometer"] is None
+    # Buy Now is only implied by an in-range price
+    assert res.rows[0]["raw"]["sale_method"] == "buy_now"
+    assert res.rows[1]["raw"].get("sale_method") is None
+
+    singles = [norm.normalize_pickles(dict(r)) for r in rows[:3]]
+    assert singles == res.rows
+    with pytest.raises(ValueError):
+        norm.normalize_pickles(dict(rows[3]))
+
+
+def test_apply_bounds_numpy_and_python_paths_agree(monkeypatch):
+    def make_rows():
+        return [{"year": y} for y in ([1975, 1999, None, 2035] * 200)]
+
+    monkeypatch.setattr(norm, "_NUMPY_MIN_ROWS", 1)
+    vec = make_rows()
+    nulled_vec = norm.apply_bounds(vec, {"year": (1980, 2030)})
+    monkeypatch.setattr(norm, "np", None)
+    py = make_rows()
+    nulled_py = norm.apply_bounds(py, {"year": (1980, 2030)})
+    assert vec == py
+    assert nulled_vec == nulled_py == {"year": 400}
+
+
+def test_unknown_vendor_has_no_batch_normalizer():
+    assert norm.get_batch_normalizer("nope") is None
+    with pytest.raises(ValueError):
+        norm.normalize_batch("nope", [])
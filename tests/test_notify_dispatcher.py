@@ -0,0 +1,41 @@
+import asyncio
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from engine.integrations.notify_dispatcher import WebhookDispatcher, pack_embeds
+
+
+def test_pack_embeds_respects_count_and_char_limits():
+    small = [{"title": "x" * 10}] * 23
+    assert [len(g) for g in pack_embeds(small)] == [10, 10, 3]
+    big = [{"description": "y" * 2500}] * 5
+    assert [len(g) for g in pack_embeds(big)] == [2, 2, 1]
+
+
+def test_burst_is_batched_and_rate_limits_are_honoured():
+    hits = []
+
+    async def handler(request):
+        body = await request.json()
+        hits.append(len(body["embeds"]))
+        if len(hits) == 2:
+            return web.json_response({"retry_after": 0.05}, status=429)
+        if len(hits) == 3:
+            return web.Response(status=502)
+        return web.json_response({}, headers={"X-RateLimit-Remaining": "0", "X-RateLimit-Reset-After": "0.01"})
+
+    async def main():
+        app = web.Application()
+        app.router.add_post("/hook", handler)
+        async with TestServer(app) as server:
+            async with WebhookDispatcher(str(server.make_url("/hook")), backoff=0.01) as dispatcher:
+                for i in range(25):
+                    dispatcher.enqueue({"title": f"car {i}"}, item=i)
+        return dispatcher
+
+    dispatcher = asyncio.run(main())
+    assert dispatcher.delivered == list(range(25)) and dispatcher.failed == []
+    # 3 messages + one 429 retry + one 5xx retry
+    assert hits == [10, 10, 10, 10, 5]
+    assert dispatcher.requests == 5
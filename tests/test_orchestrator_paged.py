@@ -0,0 +1,39 @@
+import argparse
+
+from engine.scraper import orchestrator as orch
+
+
+def _row(i):
+    return {
+        "title": "2018 Toyota Hilux SR5 QLD",
+        "link": f"https://manheim.com.au/damaged-vehicles/{i}/2018-toyota-hilux-sr5-qld-{i}",
+        "img": None,
+        "vendor": "Manheim",
+        "odometer": "45,210 km",
+    }
+
+
+def test_run_paged_saves_each_page_and_prints_summary(monkeypatch, capsys):
+    saved, status = [], []
+    monkeypatch.setattr(orch, "save_many", lambda rows: saved.append(len(rows)) or len(rows))
+    monkeypatch.setattr(orch, "mark_success", lambda vendor: status.append(("ok", vendor)))
+    monkeypatch.setattr(orch, "mark_error", lambda vendor, msg: status.append(("error", vendor, msg)))
+
+    def search(on_page):
+        pages = [[_row(1), _row(2)], [_row(3)]]
+        for n, rows in enumerate(pages, 1):
+            on_page(n, rows)
+        return [r for rows in pages for r in rows], {"pages_walked": 2, "stalled_pages": 1}
+
+    args = argparse.Namespace(dry_run=False)
+    assert orch._run_paged("manheim", search, args, ("pages_walked", "stalled_pages")) == 0
+    assert saved == [2, 1] and status == [("ok", "manheim")]
+    out = capsys.readouterr().out
+    assert "summary vendor=manheim fetched=3 normalized_ok=3 normalized_err=0 upserted=3 pages_walked=2 stalled_pages=1" in out
+
+    def broken(on_page):
+        raise RuntimeError("no tiles (manheim)")
+
+    assert orch._run_paged("manheim", broken, args, ("pages_walked",)) == 2
+    assert status[-1] == ("error", "manheim", "no tiles (manheim)")
+    assert "upserted=0 backend=" in capsys.readouterr().out
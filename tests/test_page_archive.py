@@ -0,0 +1,55 @@
+import httpx
+
+from engine.scraper import http_replay, page_archive
+from engine.scraper.page_archive import PageArchive
+
+
+def test_put_get_rotation_and_reopen(tmp_path):
+    with PageArchive(str(tmp_path), segment_bytes=20) as archive:
+        archive.put("https://x/list?page=1", b"<html>v1</html>" * 20, fetched_at=100.0)
+        archive.put("https://x/list?page=1", b"<html>v2</html>" * 20, fetched_at=200.0)
+        archive.put("https://x/item/1", b"{\"id\": 1}", content_type="application/json; charset=utf-8")
+        assert archive.get("https://x/list?page=1") == b"<html>v2</html>" * 20
+        assert archive.get("https://x/list?page=1", at=150.0) == b"<html>v1</html>" * 20
+        assert archive.get("https://x/missing") is None
+
+    # A torn index line from a crashed writer is ignored on reopen
+    with open(tmp_path / "index.tsv", "ab") as fh:
+        fh.write(b"123.0\t9\t0")
+    with PageArchive(str(tmp_path), segment_bytes=20) as archive:
+        assert len(archive) == 3
+        assert len({e.segment for e in archive.entries()}) >= 2
+        assert [e.url for e, _ in archive.iter_pages()] == ["https://x/list?page=1", "https://x/item/1"]
+        assert archive.lookup("https://x/item/1").content_type == "application/json"
+
+
+def test_put_after_torn_line_keeps_archive_readable(tmp_path):
+    with PageArchive(str(tmp_path)) as archive:
+        archive.put("https://x/a", b"<html>a</html>", fetched_at=100.0)
+    with open(tmp_path / "index.tsv", "ab") as fh:
+        fh.write(b"123.0\t9\t0")
+    with PageArchive(str(tmp_path)) as archive:
+        archive.put("https://x/b", b"<html>b</html>", fetched_at=5955.8249543)
+        archive.refresh()
+        assert len(archive) == 2
+    with PageArchive(str(tmp_path)) as archive:
+        assert [e.url for e in archive.entries()] == ["https://x/a", "https://x/b"]
+        assert archive.get("https://x/b") == b"<html>b</html>"
+
+
+def test_transport_archives_html_gets_only(tmp_path):
+    def handler(request):
+        if request.url.path.endswith(".jpg"):
+            return httpx.Response(200, content=b"\xff\xd8", headers={"content-type": "image/jpeg"})
+        return httpx.Response(200, text="<html>ok</html>", headers={"content-type": "text/html"})
+
+    archive = page_archive.configure(str(tmp_path))
+    try:
+        with httpx.Client(transport=http_replay.transport(httpx.MockTransport(handler))) as client:
+            client.get("https://x/list")
+            client.get("https://x/photo.jpg")
+            client.post("https://x/list", content=b"q")
+        assert [e.url for e in archive.entries()] == ["https://x/list"]
+        assert http_replay._state["recorded"] == []
+    finally:
+        page_archive.configure(None)
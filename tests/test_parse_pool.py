@@ -0,0 +1,47 @@
+import asyncio
+
+import httpx
+
+from engine.scraper import parse_pool
+from engine.scraper.vendors import pickles_http as pk
+
+_DETAIL = """<html><head><title>2019 Toyota Corolla Ascent | Pickles</title>
+<script type="application/ld+json">{"@type": "Product", "name": "2019 Toyota Corolla Ascent",
+"offers": {"@type": "Offer", "price": "18990", "priceCurrency": "AUD"}}</script></head>
+<body><h1>2019 Toyota Corolla Ascent</h1></body></html>"""
+
+
+def _hydrate(monkeypatch, workers):
+    def handler(request):
+        if request.url.path.endswith("/missing"):
+            return httpx.Response(404)
+        return httpx.Response(200, text=_DETAIL, headers={"content-type": "text/html; charset=utf-8"})
+
+    monkeypatch.setattr(pk.http_replay, "async_transport", lambda inner=None, **kw: httpx.MockTransport(handler))
+    monkeypatch.setattr(pk.http_replay, "is_replay", lambda: True)
+    parse_pool.configure(workers)
+    try:
+        urls = [f"https://www.pickles.com.au/used/details/cars/x/{i}" for i in range(4)]
+        return asyncio.run(pk._async_hydrate_many(urls + ["https://www.pickles.com.au/missing"], 3))
+    finally:
+        parse_pool.configure(None)
+
+
+def test_hydrate_parses_in_pool_like_inline(monkeypatch):
+    pooled = _hydrate(monkeypatch, 2)
+    inline = _hydrate(monkeypatch, 0)
+    assert pooled == inline
+    assert pooled["https://www.pickles.com.au/missing"] == {}
+    detail = pooled["https://www.pickles.com.au/used/details/cars/x/0"]
+    assert detail == pk._parse_detail_html(_DETAIL)
+    assert detail.get("price") == 18990
+
+
+def test_workers_from_env(monkeypatch):
+    monkeypatch.setenv("PARSE_WORKERS", "0")
+    assert parse_pool.workers() == 0 and parse_pool.get_pool() is None
+    monkeypatch.setenv("PARSE_WORKERS", "3")
+    assert parse_pool.workers() == 3
+    parse_pool.configure(1)
+    assert parse_pool.workers() == 1
+    parse_pool.configure(None)
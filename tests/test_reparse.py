@@ -0,0 +1,52 @@
+from decimal import Decimal
+
+from engine.scraper import reparse
+from engine.scraper.page_archive import PageArchive
+
+
+def _raw(sid):
+    return {
+        "url": f"https://www.pickles.com.au/used/details/cars/2019-toyota-corolla/{sid}",
+        "title": "2019 Toyota Corolla Ascent",
+        "price": 18990,
+        "odometer_km": "50,000 km",
+        "location": "Eagle Farm QLD",
+        "make_guess": "toyota",
+        "model_guess": "corolla",
+    }
+
+
+def test_reparse_payloads_and_change_detection(tmp_path):
+    rows, err = reparse.reparse_payloads("pickles", [_raw("A1B2C3D4"), {"url": "https://www.pickles.com.au/"}], None)
+    assert err == 1 and len(rows) == 1
+    new = rows[0]
+    assert new["fingerprint"] and new["price"] == 18990
+
+    stored = {c: new.get(c) for c in reparse._COMPARE_COLS}
+    stored["price"] = Decimal("18990.00")
+    assert not reparse.changed(new, stored)
+    assert reparse.changed(new, dict(stored, model="corola"))
+    assert reparse.changed(new, None)
+
+    # An archived detail page is merged over the stored payload before normalizing
+    with PageArchive(str(tmp_path)) as archive:
+        archive.put(_raw("A1B2C3D4")["url"], b"<html><h1>2019 Toyota Corolla Ascent</h1></html>", content_type="text/html")
+    rows, err = reparse.reparse_payloads("pickles", [_raw("A1B2C3D4")], str(tmp_path))
+    assert err == 0 and rows[0]["source_id"] == new["source_id"]
+
+
+def test_tiles_without_archived_detail_merge_over_stored_raw(tmp_path, monkeypatch):
+    list_url = "https://www.pickles.com.au/used/search/cars"
+    with PageArchive(str(tmp_path)) as archive:
+        archive.put(list_url, b"<html></html>", content_type="text/html")
+        archive.put(_raw("A1B2C3D4")["url"], b"<html><h1>2019 Toyota Corolla Ascent</h1></html>", content_type="text/html")
+    monkeypatch.setattr(reparse, "_parse_list_page", lambda vendor, html: [_raw("A1B2C3D4"), _raw("E5F6A7B8")])
+    rows, err, tile_rows = reparse.reparse_pages("pickles", [list_url], str(tmp_path))
+    assert err == 0 and len(rows) == 1 and len(tile_rows) == 1
+
+    tile = tile_rows[0]
+    hydrated = dict(_raw("E5F6A7B8"), price=17500, specs={"Transmission": "Automatic"})
+    merged, err = reparse.merge_tiles("pickles", tile_rows, {(tile["source"], str(tile["source_id"])): {"raw": hydrated}})
+    assert err == 0 and merged[0]["source_id"] == tile["source_id"]
+    # Detail-only keys survive; tile fields win where both have them
+    assert merged[0]["raw"]["specs"] == {"Transmission": "Automatic"} and merged[0]["price"] == 18990
@@ -0,0 +1,80 @@
+import pytest
+
+from engine.scraper import robots
+
+_BODY = """User-agent: *
+Disallow: /s-ad/private
+Crawl-delay: 2
+
+User-agent: BadBot
+Disallow: /
+"""
+
+
+@pytest.fixture
+def fetches(monkeypatch, tmp_path):
+    calls = []
+    responses = {"https://www.example.com.au": (200, _BODY), "https://locked.example": (403, "")}
+
+    def fake_fetch(origin):
+        calls.append(origin)
+        return responses[origin]
+
+    monkeypatch.setenv("ROBOTS_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(robots, "_fetch", fake_fetch)
+    robots.clear()
+    yield calls
+    robots.clear()
+
+
+def test_policy_rules_crawl_delay_and_disk_cache(fetches, monkeypatch):
+    assert robots.allowed("https://www.example.com.au/s-ad/sydney/cars/1")
+    assert not robots.allowed("https://www.example.com.au/s-ad/private?x=1")
+    assert robots.crawl_delay("https://www.example.com.au/") == 2.0
+    with pytest.raises(robots.RobotsDisallowed):
+        robots.check("https://www.example.com.au/s-ad/private")
+    assert not robots.allowed("https://locked.example/anything")
+
+    # A new process (empty memory) reads the disk copy instead of the network
+    robots.clear()
+    assert robots.allowed("https://www.example.com.au/s-ad/sydney/cars/1")
+    assert fetches == ["https://www.example.com.au", "https://locked.example"]
+
+    # Expired entries are refetched
+    monkeypatch.setenv("ROBOTS_TTL", "-1")
+    robots.clear()
+    for f in list(robots._cache_path("https://www.example.com.au").parent.glob("*.json")):
+        f.unlink()
+    robots.allowed("https://www.example.com.au/")
+    robots.allowed("https://www.example.com.au/")
+    assert fetches.count("https://www.example.com.au") == 3
+
+    monkeypatch.setenv("ROBOTS_IGNORE", "true")
+    robots.check("https://www.example.com.au/s-ad/private")
+
+
+def test_async_helpers_fetch_off_the_event_loop(monkeypatch, tmp_path):
+    import asyncio
+    import threading
+
+    threads = []
+
+    def fake_fetch(origin):
+        threads.append(threading.current_thread())
+        return 200, _BODY
+
+    monkeypatch.setenv("ROBOTS_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(robots, "_fetch", fake_fetch)
+    robots.clear()
+
+    async def run():
+        assert await robots.crawl_delay_async("https://www.example.com.au/") == 2.0
+        assert not await robots.allowed_async("https://www.example.com.au/s-ad/private")
+        with pytest.raises(robots.RobotsDisallowed):
+            await robots.check_async("https://www.example.com.au/s-ad/private")
+
+    try:
+        asyncio.run(run())
+    finally:
+        robots.clear()
+    assert len(threads) == 1 and threads[0] is not threading.main_thread()
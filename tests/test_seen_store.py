@@ -0,0 +1,32 @@
+from engine.integrations.seen_store import SeenStore, vehicle_key
+
+
+def _v(link, **kw):
+    return {"link": link, "vendor": "Pickles", "title": "2019 BMW 330i", **kw}
+
+
+def test_filter_new_uses_keys_and_rolling_ttl(tmp_path):
+    with SeenStore(str(tmp_path / "seen.sqlite3"), ttl_days=1) as store:
+        first = [_v("https://x/1"), _v("https://x/2")]
+        assert store.filter_new(first, now=0) == first
+        store.mark(first, now=0)
+
+        # Same listing with a changed field is not new; duplicates within a batch collapse
+        current = [_v("https://x/1", price="$10,000"), _v("https://x/3"), _v("https://x/3")]
+        assert [vehicle_key(v) for v in store.filter_new(current, now=3600)] == ["https://x/3"]
+        store.mark(current, now=3600)
+
+        # x/2 was not seen for over a day: expired, so a relist is new again
+        later = 3600 + 86400 + 1
+        assert [vehicle_key(v) for v in store.filter_new([_v("https://x/1"), _v("https://x/2")], now=later)] == ["https://x/1", "https://x/2"]
+        assert store.prune(now=later) == 3
+        assert len(store) == 0
+
+
+def test_legacy_json_seeds_empty_store(tmp_path):
+    legacy = tmp_path / "vehicles_data.json"
+    legacy.write_text('[{"link": "https://x/1"}, {"link": "https://x/2"}]')
+    with SeenStore(str(tmp_path / "seen.sqlite3")) as store:
+        assert store.import_legacy_json(str(legacy)) == 2
+        assert store.import_legacy_json(str(legacy)) == 0
+        assert store.filter_new([_v("https://x/2"), _v("https://x/9")]) == [_v("https://x/9")]
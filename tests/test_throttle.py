@@ -0,0 +1,36 @@
+import asyncio
+import time
+
+import httpx
+
+from engine.scraper import throttle
+from engine.scraper.vendors import autotrader_http as at
+
+
+def test_concurrent_fetches_start_at_least_crawl_delay_apart(monkeypatch):
+    monkeypatch.setenv("AUTOTRADER_PAGE_DELAY_MIN_MS", "0")
+    monkeypatch.setenv("AUTOTRADER_PAGE_DELAY_MAX_MS", "0")
+    monkeypatch.setattr(throttle.http_replay, "is_replay", lambda: False)
+    crawl_delay = 0.15
+    started = []
+
+    def handler(request):
+        started.append(time.monotonic())
+        return httpx.Response(200, text="<html></html>")
+
+    async def run():
+        limiter = throttle.RateLimiter.from_env(crawl_delay, "AUTOTRADER_PAGE_DELAY_MIN_MS", "AUTOTRADER_PAGE_DELAY_MAX_MS")
+        sem = asyncio.Semaphore(4)
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            urls = [f"{at.BASE}/cars?page={n}" for n in range(1, 5)]
+            return await asyncio.gather(*(at._fetch_page(client, url, sem, limiter, False) for url in urls))
+
+    assert asyncio.run(run()) == ["<html></html>"] * 4
+    gaps = [b - a for a, b in zip(started, started[1:])]
+    assert len(gaps) == 3 and min(gaps) >= crawl_delay - 0.01
+
+
+def test_replay_is_not_throttled(monkeypatch):
+    monkeypatch.setattr(throttle.http_replay, "is_replay", lambda: True)
+    limiter = throttle.RateLimiter.from_env(5.0)
+    assert (limiter.lo_s, limiter.hi_s) == (0.0, 0.0)
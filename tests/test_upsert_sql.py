@@ -0,0 +1,28 @@
+import json
+
+from engine.db.supabase_client import _record_json, _upsert_sql
+from engine.scraper.listing import Listing
+
+
+def test_record_json_splices_prebuilt_raw_text():
+    listing = Listing("pickles", "123", "https://x/1", raw={"title": "2019 Mazda CX-5"}, make="Mazda", media=["a.jpg"])
+    record = json.loads(_record_json(listing.to_row(raw_as_json=True)))
+    assert record["raw"] == {"title": "2019 Mazda CX-5"}
+    assert record["media"] == ["a.jpg"] and record["seller"] == {} and record["make"] == "Mazda"
+
+
+def test_raw_table_mode_keeps_payload_out_of_listings():
+    sql = _upsert_sql(with_events=True, raw_table=True)
+    insert_cols = sql.split("insert into listings (", 1)[1].split(")", 1)[0].split(", ")
+    assert "raw" not in insert_cols and "raw_hash" in insert_cols
+    assert "insert into listing_raw" in sql and "on conflict (hash) do nothing" in sql
+    assert "raw = null" in sql and "insert into listing_events" in sql
+    assert "listing_raw" not in _upsert_sql(with_events=False)
+
+
+def test_prev_market_keys_come_from_the_pre_update_snapshot():
+    for with_events in (True, False):
+        sql = _upsert_sql(with_events=with_events, prev_keys=True)
+        assert "l.market_key" in sql.split("up as (", 1)[0]
+        assert sql.rstrip().endswith("as prev_keys")
+    assert "market_key" not in _upsert_sql(with_events=False)